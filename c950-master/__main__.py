@@ -1,8 +1,6 @@
 # Student Name: Tyler Bolyard
 # Student ID: 005128636
 
-from time import sleep
-
 from wgups.utils.application import Application
 from wgups.utils.spinner import Spinner
 
@@ -10,5 +8,4 @@ if __name__ == "__main__":
     # Display a spinner in the console while we load in external data and setup the application
     with Spinner('Preparing WGUPS Package Router ...'):
         application = Application()
-        sleep(2)
     application.start()
@@ -21,6 +21,11 @@ package_df = pd.read_excel(
            'zip', 'deadline', 'kg', 'notes']
 )
 
+# Corrected addresses and the time each correction becomes known, by package identifier
+corrections = {
+    9: ('410 S State St', '10:20'),
+}
+
 
 def create_matrix(df):
     """
@@ -92,6 +97,21 @@ def create_package_data(df):
         package['is_peer'] = True if 'must' in notes else False
         package['is_delayed'] = True if 'delayed' in notes else False
 
+        # Handle the time a delayed or misaddressed package becomes available
+        delay = re.search(r'until (\d+):(\d+)\s*(am|pm)', notes)
+        if delay:
+            hours = int(delay.group(1)) % 12 + (12 if delay.group(3) == 'pm' else 0)
+            package['available_at'] = f'{hours:02}:{delay.group(2)}'
+        else:
+            package['available_at'] = None
+
+        package['corrected_address'] = None
+        if package['id'] in corrections:
+            package['corrected_address'], package['available_at'] = corrections[package['id']]
+
+        # Handle packages that must be delivered together
+        package['peers'] = [int(x) for x in re.findall(r'\d+', notes)] if 'must' in notes else []
+
         # Add package to the package dictionary
         packages[package['id']] = package
 
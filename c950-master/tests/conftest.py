@@ -0,0 +1,45 @@
+from random import Random
+
+import pytest
+
+from wgups.data.data_loader import DataLoader
+from wgups.data.package_table import PackageTable
+from wgups.routing.depot import Depot
+from wgups.routing.route_engine import RouteEngine
+
+
+@pytest.fixture(scope='session')
+def distances():
+    """The distance table of the sample data."""
+    return DataLoader.get_distances()
+
+
+@pytest.fixture(scope='session')
+def packages():
+    """The packages of the sample data, shared between tests that do not deliver them."""
+    return DataLoader.get_packages()
+
+
+@pytest.fixture(scope='session')
+def make_depot(distances):
+    """Builds a depot over a fresh copy of the sample packages and their restrictions."""
+    def make(**options):
+        packages, constraints = DataLoader.load_packages()
+        options.setdefault('constraints', constraints)
+        return Depot(distances, PackageTable(packages), **options)
+
+    return make
+
+
+@pytest.fixture(scope='session')
+def make_engine(distances, packages):
+    """Builds a route engine over one sample package at each of `stops` random stops."""
+    by_node = {}
+    for package in packages.values():
+        by_node.setdefault(package.node, package)
+
+    def make(seed, stops):
+        nodes = Random(seed).sample(sorted(by_node), stops)
+        return RouteEngine(distances, [by_node[node] for node in nodes])
+
+    return make
@@ -0,0 +1,93 @@
+from json import dump
+from os import stat, utime
+
+import pytest
+
+from wgups.data.binary_cache import BinaryCache
+from wgups.data.data_loader import DataLoader
+
+
+def package(identifier, zip_code='84115', peers=()):
+    return {'id': identifier, 'city': 'Salt Lake City', 'state': 'UT', 'zip': zip_code,
+            'kg': 2, 'address': '195 W Oakland Ave', 'deadline': '17:00', 'required_truck': False,
+            'is_peer': bool(peers), 'is_delayed': False, 'available_at': None,
+            'corrected_address': None, 'peers': list(peers)}
+
+
+def write_packages(source, *values):
+    with open(source, 'w') as file:
+        dump({str(value['id']): value for value in values}, file)
+    return str(source)
+
+
+@pytest.fixture(autouse=True)
+def cache_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(BinaryCache, 'directory', str(tmp_path / 'cache'))
+
+
+def load(source):
+    return BinaryCache.load_packages(source, DataLoader.compile_groups)
+
+
+def test_sources_with_one_name_never_share_a_cache(tmp_path):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'b').mkdir()
+    first = BinaryCache.cache_path(str(tmp_path / 'a' / 'package_data.json'), BinaryCache.PACKAGES)
+    second = BinaryCache.cache_path(str(tmp_path / 'b' / 'package_data.json'), BinaryCache.PACKAGES)
+
+    assert first != second
+    assert first != BinaryCache.cache_path(str(tmp_path / 'a' / 'package_data.json'),
+                                           BinaryCache.TRIANGLE)
+
+
+def test_zip_codes_keep_leading_zeros(tmp_path):
+    records, strings = load(write_packages(tmp_path / 'packages.json', package(1, '084119')))
+
+    assert strings[records[0]['zip']] == '084119'
+
+
+def test_one_empty_string_survives_the_string_table(tmp_path):
+    source = write_packages(tmp_path / 'source.json', package(1))
+    cache = BinaryCache.cache_path(source, BinaryCache.PACKAGES)
+
+    BinaryCache.write(source, cache, BinaryCache.PACKAGES, 0, [''], b'')
+    assert BinaryCache.read(cache)[:2] == (0, [''])
+
+    BinaryCache.write(source, cache, BinaryCache.PACKAGES, 0, [], b'')
+    assert BinaryCache.read(cache)[:2] == (0, [])
+
+
+def test_cache_is_rebuilt_only_when_the_source_changes(tmp_path):
+    source = write_packages(tmp_path / 'packages.json', package(1), package(2))
+    cache = BinaryCache.cache_path(source, BinaryCache.PACKAGES)
+    load(source)
+    assert BinaryCache.is_fresh(source, cache, BinaryCache.PACKAGES)
+
+    # Touching the source leaves the cache fresh and records the new modification time
+    modified = stat(source).st_mtime_ns + 10 ** 9
+    utime(source, ns=(modified, modified))
+    assert BinaryCache.is_fresh(source, cache, BinaryCache.PACKAGES)
+    assert BinaryCache.is_fresh(source, cache, BinaryCache.PACKAGES)
+
+    write_packages(tmp_path / 'packages.json', package(1), package(2), package(3))
+    assert not BinaryCache.is_fresh(source, cache, BinaryCache.PACKAGES)
+    assert list(load(source)[0]['id']) == [1, 2, 3]
+
+
+def test_cached_groups_match_the_constraint_index(tmp_path):
+    source = write_packages(tmp_path / 'packages.json', package(1), package(4, peers=(7,)),
+                            package(7, peers=(9,)), package(9), package(3, peers=(2,)),
+                            package(2))
+    records, _ = load(source)
+
+    groups = {record['id']: record['group'] for record in records}
+    assert groups == {1: -1, 4: 4, 7: 4, 9: 4, 3: 2, 2: 2}
+
+
+def test_sample_groups_match_the_loaded_constraints():
+    records, _ = load(DataLoader.data_path('data/package_data.json'))
+    constraints = DataLoader.get_constraints()
+
+    for record in records:
+        group = constraints.group(int(record['id']))
+        assert int(record['group']) == (min(group) if group else -1)
@@ -0,0 +1,102 @@
+from pickle import dumps, loads
+
+import pytest
+
+from wgups.structures.clock import Clock, Span, TimeRange
+
+
+def test_clock_crosses_midnight_without_wrapping():
+    late = Clock(23, 30)
+    next_morning = late.add_hours(10)
+
+    assert next_morning == Clock(9, 30, days=1)
+    assert next_morning.day == 1
+    assert (next_morning.hours, next_morning.minutes) == (9, 30)
+    assert next_morning > late
+    assert next_morning.time_of_day() == Clock(9, 30)
+    assert next_morning.start_of_day() == Clock(days=1)
+    assert repr(next_morning) == 'Day 1 09:30'
+
+
+def test_clock_difference_spans_days():
+    span = Clock(8, days=2) - Clock(17)
+
+    assert span == Span(days=1, hours=15)
+    assert span.total_minutes == (24 + 15) * 60
+    assert Clock(17) + span == Clock(8, days=2)
+    assert Clock(17) - Clock(8, days=2) == -span
+
+
+def test_span_arithmetic():
+    assert Span(hours=1) + Span(minutes=90) == Span(hours=2, minutes=30)
+    assert Span(hours=1) - Span(hours=3) == Span(hours=-2)
+    assert Clock(8) - Span(hours=9) == Clock(23, days=-1)
+    assert Clock(12).on_day(3) == Clock(12, days=3)
+
+
+def test_clocks_are_values():
+    assert Clock(10, 30) is Clock.from_string('10:30')
+    assert hash(Clock(1, days=1)) == hash(Clock(25))
+    with pytest.raises(AttributeError):
+        Clock(8).total_seconds = 0
+    with pytest.raises(ValueError):
+        Clock.from_string('10')
+
+
+def test_range_split_by_day():
+    shift = TimeRange(Clock(22), Clock(2, days=2))
+    days = shift.split_by_day()
+
+    assert [(part.start, part.end) for part in days] == [
+        (Clock(22), Clock(days=1)),
+        (Clock(days=1), Clock(days=2)),
+        (Clock(days=2), Clock(2, days=2)),
+    ]
+    assert sum((part.duration() for part in days), Span()) == shift.duration()
+
+
+def test_range_is_half_open():
+    first_day = TimeRange.for_day(0)
+
+    assert Clock(23, 59) in first_day
+    assert Clock(days=1) not in first_day
+    assert not first_day.overlaps(TimeRange.for_day(1))
+    assert first_day.intersection(TimeRange(Clock(20), Clock(4, days=1))) == \
+        TimeRange(Clock(20), Clock(days=1))
+    with pytest.raises(ValueError):
+        TimeRange(Clock(9), Clock(8))
+
+
+def test_clock_keeps_seconds():
+    clock = Clock.from_string('10:30:15')
+
+    assert (clock.hours, clock.minutes, clock.seconds) == (10, 30, 15)
+    assert clock.total_seconds == 10 * 3600 + 30 * 60 + 15
+    assert clock.total_minutes == 10 * 60 + 30
+    assert repr(clock) == '10:30:15'
+    assert Clock(10, 30).add_seconds(15) == clock
+    assert Clock(10, 30) < clock < Clock(10, 31)
+
+
+def test_arithmetic_returns_new_clocks():
+    start = Clock(8)
+    later = start.add_minutes(90)
+
+    assert later == Clock(9, 30)
+    assert start == Clock(8)
+    assert start.add_hours(1).add_seconds(-3600) is start
+    assert start.clone() is start
+
+
+def test_only_whole_minutes_of_the_first_day_are_shared():
+    assert Clock.from_seconds(600) is Clock(0, 10)
+    assert Clock(0, 10, 5) is not Clock(0, 10, 5)
+    assert Clock(0, 10, days=1) is not Clock(0, 10, days=1)
+    assert Clock(0, 10, 5) == Clock(0, 10, 5)
+
+
+def test_pickled_clocks_stay_shared():
+    assert loads(dumps(Clock(10, 30))) is Clock(10, 30)
+    assert loads(dumps(Clock(10, 30, 1))) == Clock(10, 30, 1)
+    with pytest.raises(AttributeError):
+        del Clock(8).total_seconds
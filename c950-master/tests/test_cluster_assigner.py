@@ -0,0 +1,69 @@
+import pytest
+
+from wgups.routing.cluster_assigner import ClusterAssigner
+from wgups.routing.event_log import EventKind
+from wgups.routing.fleet_config import FleetConfig
+from wgups.routing.route_planner import RoutePlanner
+
+
+def ids(packages):
+    return [package.id for package in packages]
+
+
+def test_top_up_skips_units_that_do_not_fit(distances, packages):
+    candidates = [[packages.get(1)], [packages.get(2), packages.get(3)]]
+
+    load = ClusterAssigner().select(distances, candidates, 2)
+
+    assert load == [packages.get(1)]
+
+
+def test_candidate_units_stay_whole(distances, packages):
+    units = [(1, 7, 29), (4, 40), (8, 30, 11, 12)]
+    grouped = {identifier for unit in units for identifier in unit}
+    candidates = [[packages.get(identifier) for identifier in unit] for unit in units] + \
+        [[packages.get(identifier)] for identifier in range(2, 41) if identifier not in grouped]
+
+    for capacity in (3, 4, 5, 8):
+        load = ids(ClusterAssigner().select(distances, candidates, capacity))
+        assert 0 < len(load) <= capacity
+        assert load[:3] == [1, 7, 29]
+        for unit in units:
+            assert len(set(unit) & set(load)) in (0, len(unit))
+
+
+def test_urgent_units_are_loaded_first(distances, packages):
+    candidates = [[package] for package in packages.values()]
+    urgent = [package.id for package in packages.values() if package.is_high_priority()]
+
+    for capacity in (4, 8, 16):
+        load = ids(ClusterAssigner().select(distances, candidates, capacity))
+        assert len(load) == capacity
+        assert set(load[:min(capacity, len(urgent))]) <= set(urgent)
+
+
+@pytest.mark.parametrize('planner', [None, RoutePlanner(construction=RoutePlanner.INSERTION),
+                                     RoutePlanner(improve=True)])
+@pytest.mark.parametrize('fleet', [None, FleetConfig(3, capacity=7), FleetConfig(40, capacity=6)])
+def test_clustered_loads_keep_every_deadline(make_depot, planner, fleet):
+    depot = make_depot(planner=planner, fleet=fleet, assigner=ClusterAssigner())
+    depot.deliver_packages()
+
+    assert depot.late_packages() == 0
+
+
+@pytest.mark.parametrize('fleet', [None, FleetConfig(3, capacity=7), FleetConfig(40, capacity=6)])
+def test_depot_loads_each_group_onto_one_truck(make_depot, fleet):
+    depot = make_depot(fleet=fleet, assigner=ClusterAssigner())
+    depot.deliver_packages()
+
+    loads = {}
+    for event in depot.events:
+        if event.kind == EventKind.LOAD:
+            loads[event.package_id] = (event.truck_id, event.time)
+
+    assert len(loads) == len(depot.package_table.all())
+    for identifier in loads:
+        assert len({loads[peer] for peer in depot.constraints.group(identifier)}) <= 1
+        if depot.constraints.required_truck(identifier):
+            assert loads[identifier][0] == depot.constraints.required_truck(identifier)
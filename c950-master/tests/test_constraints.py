@@ -0,0 +1,78 @@
+import pytest
+
+from wgups.data.data_loader import DataLoader
+from wgups.routing.constraints import ConstraintIndex
+from wgups.routing.package import Package
+from wgups.structures.clock import Clock
+
+
+def index(**rows):
+    constraints = ConstraintIndex()
+    for identifier, row in rows.items():
+        constraints.add_row(int(identifier.lstrip('p')), row)
+    constraints.finalize()
+    return constraints
+
+
+def test_peers_link_whole_groups():
+    constraints = index(p1={'peers': '2;3'}, p4={'peers': [3]}, p5={'peers': '6, 7'},
+                        p8={})
+
+    assert constraints.group(4) == [1, 2, 3, 4]
+    assert constraints.group(2) is constraints.group(1)
+    assert constraints.group(7) == [5, 6, 7]
+    assert constraints.group(8) == []
+    assert constraints.find(4) == 1
+
+
+@pytest.mark.parametrize('row, reason', [
+    ({'required_truck': 'two'}, 'Invalid required truck'),
+    ({'required_truck': True}, 'Invalid required truck'),
+    ({'available_at': '9am'}, 'Invalid available_at time'),
+    ({'corrected_address': 410}, 'corrected address must be a string'),
+    ({'peers': 3}, 'peers must be a list'),
+    ({'peers': ['a']}, 'Invalid peers'),
+    ({'peers': [1.5]}, 'Invalid peers'),
+])
+def test_invalid_fields_are_rejected(row, reason):
+    with pytest.raises(ValueError, match=reason):
+        ConstraintIndex.parse_row(row)
+
+
+def test_discarded_package_leaves_its_group():
+    constraints = ConstraintIndex()
+    constraints.add(1, required_truck=2, peers=[2])
+    constraints.add(3, peers=[4, 5])
+    constraints.discard(1)
+    constraints.discard(4)
+    constraints.finalize()
+
+    assert constraints.required_truck(1) is None
+    assert constraints.group(2) == []
+    assert constraints.group(3) == [3, 5]
+
+
+def test_apply_copies_restrictions_onto_the_package():
+    constraints = index(p9={'available_at': '10:20', 'corrected_address': '410 S State St'},
+                        p3={'required_truck': '2'})
+    corrected = Package(9, '300 State St', 'Salt Lake City', 'UT', '84103', 2, Clock(17))
+    restricted = Package(3, '233 Canyon Rd', 'Salt Lake City', 'UT', '84103', 2, Clock(17))
+
+    constraints.apply(corrected)
+    constraints.apply(restricted)
+
+    assert corrected.street == '410 S State St'
+    assert corrected.arrival_time == Clock(10, 20)
+    assert not corrected.is_priority
+    assert restricted.is_priority
+    assert constraints.required_truck(3) == 2
+
+
+def test_sample_restrictions_come_from_the_data():
+    constraints = DataLoader.get_constraints()
+
+    assert constraints.group(13) == [13, 14, 15, 16, 19, 20]
+    assert constraints.required_trucks.items() == [(3, 2), (18, 2), (36, 2), (38, 2)]
+    assert {identifier for identifier, time in constraints.available_at.items()
+            if time == Clock(9, 5)} == {6, 25, 28, 32}
+    assert constraints.corrections.items() == [(9, '410 S State St')]
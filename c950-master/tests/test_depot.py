@@ -0,0 +1,71 @@
+import pytest
+
+from wgups.routing.event_log import EventKind
+from wgups.routing.fleet_config import FleetConfig
+from wgups.structures.clock import Clock
+
+
+def test_fleet_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        FleetConfig(0)
+    with pytest.raises(ValueError):
+        FleetConfig(2, capacity=0)
+    with pytest.raises(ValueError):
+        FleetConfig(1, earliest_departures=[Clock(8), Clock(9)])
+
+
+def test_rejects_packages_for_missing_trucks(make_depot):
+    depot = make_depot(fleet=FleetConfig(1))
+
+    with pytest.raises(ValueError, match='by truck 2, but the fleet only has 1 trucks'):
+        depot.deliver_packages()
+
+
+@pytest.mark.parametrize('fleet', [None, FleetConfig(3), FleetConfig(4, capacity=8),
+                                   FleetConfig(40, capacity=6)])
+def test_every_package_is_delivered_on_time(make_depot, fleet):
+    depot = make_depot(fleet=fleet)
+    depot.deliver_packages()
+
+    assert depot.late_packages() == 0
+    assert all(package.delivery_time is not None for package in depot.package_table.all())
+
+
+def test_held_truck_waits_for_its_departure_time(make_depot):
+    depot = make_depot()
+    depot.deliver_packages()
+
+    departures = [event.time for event in depot.events.ordered()
+                  if event.kind == EventKind.DEPART and event.truck_id == 2]
+    assert departures and min(departures) >= Clock(9, 5)
+
+
+@pytest.mark.parametrize('fleet', [None, FleetConfig(3), FleetConfig(40, capacity=6)])
+def test_trucks_only_return_for_more_work(make_depot, fleet):
+    depot = make_depot(fleet=fleet)
+    depot.deliver_packages()
+    events = depot.events.ordered()
+
+    for position, event in enumerate(events):
+        if event.kind != EventKind.DEPART:
+            continue
+        # A trip ends at the depot exactly when a package the truck may deliver was still
+        # waiting to be loaded as it left
+        waiting = any(later.kind == EventKind.LOAD and
+                      depot.constraints.required_truck(later.package_id) in (None, event.truck_id)
+                      for later in events[position + 1:])
+        returns = next((later.kind == EventKind.RETURN for later in events[position + 1:]
+                        if later.truck_id == event.truck_id and
+                        later.kind in (EventKind.DEPART, EventKind.RETURN)), False)
+        assert returns == waiting
+
+
+def test_restricted_packages_ride_their_truck(make_depot):
+    depot = make_depot(fleet=FleetConfig(3))
+    depot.deliver_packages()
+
+    loads = {event.package_id: event.truck_id for event in depot.events
+             if event.kind == EventKind.LOAD}
+    for identifier, truck_id in loads.items():
+        required = depot.constraints.required_truck(identifier)
+        assert required is None or truck_id == required
@@ -0,0 +1,94 @@
+from wgups.routing.dispatch_queue import ANY_TRUCK, DispatchQueue
+from wgups.routing.package import Package
+from wgups.structures.clock import Clock
+
+
+def package(identifier, arrival=Clock(8)):
+    package = Package(identifier, 'street', 'city', 'UT', '84000', 1, Clock(17))
+    package.arrival_time = arrival
+    return package
+
+
+def drain(queue, truck_id, time):
+    order = []
+    while (unit := queue.pop(truck_id, time)) is not None:
+        order.append([package.id for package in unit])
+    return order
+
+
+def test_orders_by_deadline_then_depot_distance():
+    queue = DispatchQueue()
+    queue.push([package(1)], (Clock(17).total_seconds, 2.0))
+    queue.push([package(2)], (Clock(10, 30).total_seconds, 5.0))
+    queue.push([package(3)], (Clock(10, 30).total_seconds, 1.0))
+    queue.push([package(4)], (Clock(9).total_seconds, 9.0))
+
+    assert drain(queue, 1, Clock(8)) == [[4], [3], [2], [1]]
+    assert len(queue) == 0
+
+
+def test_equal_keys_keep_push_order():
+    queue = DispatchQueue()
+    for identifier in (5, 3, 9):
+        queue.push([package(identifier)], (1.0,))
+
+    assert drain(queue, 1, Clock(8)) == [[5], [3], [9]]
+
+
+def test_restricted_units_only_go_to_their_truck():
+    queue = DispatchQueue()
+    queue.push([package(1)], (3.0,), 2)
+    queue.push([package(2)], (2.0,))
+    queue.push([package(3)], (1.0,), 1)
+
+    assert queue.available(1, Clock(8)) == 2
+    assert queue.available(2, Clock(8)) == 2
+    assert drain(queue, 1, Clock(8)) == [[3], [2]]
+    assert drain(queue, 3, Clock(8)) == []
+    assert drain(queue, 2, Clock(8)) == [[1]]
+
+
+def test_pop_entry_returns_the_heap_it_came_from():
+    queue = DispatchQueue()
+    queue.push([package(1)], (1.0,), 2)
+    queue.push([package(2)], (2.0,))
+
+    key, truck, unit = queue.pop_entry(2, Clock(8))
+    assert (key, truck, [package.id for package in unit]) == ((1.0,), 2, [1])
+    assert queue.pop_entry(2, Clock(8))[1] == ANY_TRUCK
+
+
+def test_units_wait_for_their_last_package():
+    queue = DispatchQueue()
+    queue.push([package(1), package(2, Clock(9, 5))], (1.0,))
+    queue.push([package(3)], (2.0,))
+
+    assert queue.available(1, Clock(9)) == 1
+    assert queue.next_arrival(1) == Clock(9, 5)
+    assert drain(queue, 1, Clock(9)) == [[3]]
+    assert queue.peek(1, Clock(9, 4)) is None
+    assert [package.id for package in queue.peek(1, Clock(9, 5))] == [1, 2]
+    assert queue.next_arrival(1) is None
+
+
+def test_released_units_keep_key_order():
+    queue = DispatchQueue()
+    queue.push([package(1, Clock(10))], (1.0,))
+    queue.push([package(2)], (2.0,))
+
+    assert queue.ready_packages(1) == []
+    queue.release(1, Clock(10))
+    assert sorted(package.id for package in queue.ready_packages(1)) == [1, 2]
+    assert drain(queue, 1, Clock(10)) == [[1], [2]]
+
+
+def test_remaining_counts_work_for_one_truck():
+    queue = DispatchQueue()
+    queue.push([package(1), package(2, Clock(10))], (1.0,), 2)
+    queue.push([package(3)], (2.0,))
+
+    assert queue.remaining(1) == 1
+    assert queue.remaining(2) == 3
+    queue.pop(1, Clock(8))
+    assert queue.remaining(1) == 0
+    assert queue.remaining(2) == 2
@@ -0,0 +1,85 @@
+from io import StringIO
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from wgups.data.distance_preprocessor import DistanceError, DistancePreprocessor
+
+ADDRESSES = ['depot', 'a', 'b', 'c']
+EDGES = [('depot', 'a', 2.0), ('a', 'b', 1.5), ('depot', 'b', 9.0), ('b', 'c', 4.0),
+         ('depot', 'b', 5.0)]
+
+
+def shortest(matrix, start, end):
+    """Finds the shortest path by trying every order of intermediate addresses."""
+    others = [index for index in range(len(matrix)) if index not in (start, end)]
+    best = matrix[start, end]
+    for count in range(1, len(others) + 1):
+        for path in permutations(others, count):
+            stops = [start, *path, end]
+            best = min(best, sum(matrix[i, j] for i, j in zip(stops, stops[1:])))
+    return best
+
+
+def test_edges_keep_the_shortest_segment_both_ways():
+    addresses, matrix = DistancePreprocessor.from_edges(EDGES)
+
+    assert addresses == ADDRESSES
+    assert matrix[0, 2] == matrix[2, 0] == 5.0
+    assert np.isinf(matrix[0, 3])
+    assert np.isinf(DistancePreprocessor.from_edges(EDGES, symmetric=False)[1][1, 0])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_closed_distances_are_shortest_paths(seed):
+    rng = np.random.default_rng(seed)
+    matrix = rng.uniform(1, 10, (6, 6))
+    matrix = np.minimum(matrix, matrix.T)
+    np.fill_diagonal(matrix, 0)
+
+    closed = DistancePreprocessor.close(matrix)
+
+    expected = [[shortest(matrix, i, j) for j in range(6)] for i in range(6)]
+    assert np.allclose(closed, expected)
+    assert np.all(closed <= matrix)
+
+
+def test_prepare_closes_an_edge_list():
+    closed = DistancePreprocessor.prepare(*DistancePreprocessor.from_edges(EDGES))
+
+    assert closed[0, 2] == 3.5
+    assert closed[0, 3] == 7.5
+
+
+def test_unreachable_address_is_reported():
+    addresses, matrix = DistancePreprocessor.from_edges(EDGES + [('d', 'e', 1.0)])
+
+    with pytest.raises(DistanceError, match='No path between addresses'):
+        DistancePreprocessor.prepare(addresses, matrix)
+
+
+def test_validate_reports_every_problem():
+    matrix = np.array([[0.0, 1.0, np.nan], [2.0, 1.0, -1.0], [3.0, -1.0, 0.0]])
+
+    reasons = [(error.reason, error.from_address, error.to_address)
+               for error in DistancePreprocessor.validate(['x', 'y', 'x'], matrix)]
+
+    assert reasons == [
+        ('The addresses are not unique', '', ''),
+        ('Missing distance', 'x', 'x'),
+        ('Negative distance', 'y', 'x'),
+        ('Negative distance', 'x', 'y'),
+        ('Nonzero distance from an address to itself', 'y', 'y'),
+        ('Distance differs by direction', 'x', 'y'),
+    ]
+
+
+def test_read_edges_reports_bad_rows():
+    edges = DistancePreprocessor.read_edges(StringIO('from,to,miles\n a , b ,1.5\n'))
+    assert edges == [('a', 'b', 1.5)]
+
+    with pytest.raises(DistanceError, match='missing miles'):
+        DistancePreprocessor.read_edges(StringIO('from,to\na,b\n'))
+    with pytest.raises(DistanceError, match='Invalid distance on line 3'):
+        DistancePreprocessor.read_edges(StringIO('from,to,miles\na,b,1\nb,c,far\n'))
@@ -0,0 +1,59 @@
+from json import load
+
+import numpy as np
+import pytest
+
+from wgups.data.data_loader import DataLoader
+from wgups.data.distance_table import DistanceTable
+
+
+@pytest.fixture(scope='module')
+def raw():
+    with open(DataLoader.data_path('data/distance_data.json')) as file:
+        return load(file)
+
+
+def test_matrix_matches_the_source_data(distances, raw):
+    for from_address, row in raw.items():
+        for to_address, miles in row.items():
+            assert distances.distance(from_address, to_address) == float(miles)
+            assert distances.distance_between(distances.index(from_address),
+                                              distances.index(to_address)) == float(miles)
+
+
+def test_addresses_are_interned_in_matrix_order(distances):
+    assert len(distances) == len(distances.addresses) == distances.matrix.shape[0]
+    for index, address in enumerate(distances.addresses):
+        assert distances.index(address) == index
+        assert distances.address(index) == address
+        assert address in distances
+    assert distances.address(distances.depot_index) == DistanceTable.depot_address
+
+
+def test_rows_are_views_of_the_matrix(distances):
+    address = distances.addresses[3]
+
+    assert np.shares_memory(distances.row(address), distances.matrix)
+    assert np.shares_memory(distances.to_depot_vector(), distances.matrix)
+    assert distances.to_depot(address) == distances.to_depot_vector()[3]
+    assert distances.row(address).tolist() == distances.matrix[3].tolist()
+
+
+def test_submatrix_is_a_writable_copy(distances):
+    nodes = [distances.depot_index, 5, 2]
+    submatrix = distances.submatrix(nodes)
+
+    assert submatrix.tolist() == [[distances.distance_between(i, j) for j in nodes]
+                                  for i in nodes]
+    submatrix[0, 1] = -1
+    assert distances.distance_between(nodes[0], nodes[1]) >= 0
+
+
+def test_unknown_addresses_and_bad_shapes_are_rejected(distances):
+    with pytest.raises(KeyError, match='1 Nowhere St'):
+        distances.index('1 Nowhere St')
+    assert '1 Nowhere St' not in distances
+    with pytest.raises(ValueError, match='Expected a 2x2 matrix'):
+        DistanceTable([DistanceTable.depot_address, 'a'], np.zeros((2, 3)))
+    with pytest.raises(KeyError):
+        DistanceTable(['a', 'b'], np.zeros((2, 2)))
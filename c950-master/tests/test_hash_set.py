@@ -0,0 +1,232 @@
+import pytest
+
+from wgups.structures.hash_set import HashSet
+from wgups.structures.table_stats import ProbeHistogram
+
+
+def test_grows_and_keeps_every_item():
+    table = HashSet(4)
+    for key in range(100):
+        table.set(key, key * 2)
+
+    assert len(table) == 100
+    assert table.resizes > 0
+    assert table.capacity & (table.capacity - 1) == 0
+    assert len(table) < table.capacity * HashSet.MAX_LOAD_FACTOR
+    assert all(table.get(key) == key * 2 for key in range(100))
+
+
+def test_keeps_insertion_order_across_resizes():
+    table = HashSet(2)
+    keys = [f'key-{key}' for key in range(50)]
+    for key in keys:
+        table.set(key, None)
+
+    assert table.keys() == keys
+
+
+def test_insert_reuses_tombstone():
+    table = HashSet(16)
+    table.set(1, 'a')
+    table.delete(1)
+    assert table.tombstones == 1
+
+    table.set(1, 'b')
+    assert table.tombstones == 0
+    assert table.get(1) == 'b'
+
+
+def test_churn_compacts_instead_of_growing():
+    table = HashSet(16)
+    capacity = table.capacity
+    for key in range(1000):
+        table.set(key, key)
+        table.delete(key - 4)
+
+    assert table.capacity == capacity
+    assert table.resizes == 0
+    assert table.compactions > 0
+    assert table.removed <= capacity * HashSet.MAX_TOMBSTONE_RATIO
+    assert len(table.entry_keys) <= capacity
+    assert table.keys() == list(range(996, 1000))
+
+
+def test_compaction_keeps_live_items_findable():
+    table = HashSet(32)
+    for key in range(20):
+        table.set(key, str(key))
+    for key in range(0, 20, 2):
+        table.delete(key)
+    table.rehash()
+
+    assert table.removed == 0
+    assert table.tombstones == 0
+    assert table.keys() == list(range(1, 20, 2))
+    assert all(table.get(key) == str(key) for key in range(1, 20, 2))
+    assert all(key not in table for key in range(0, 20, 2))
+
+
+def test_first_skips_removed_entries():
+    table = HashSet(16)
+    for key in range(5):
+        table.set(key, key)
+    table.delete(0)
+    table.delete(1)
+
+    assert table.first() == (2, 2)
+    table.delete(2)
+    table.delete(3)
+    table.delete(4)
+    assert table.first() is None
+
+
+class Key:
+    """A key with a chosen hash that counts how often it is hashed and compared."""
+    hashes = 0
+    comparisons = 0
+
+    def __init__(self, value, key_hash):
+        self.value = value
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        Key.hashes += 1
+        return self.key_hash
+
+    def __eq__(self, other):
+        Key.comparisons += 1
+        return isinstance(other, Key) and self.value == other.value
+
+
+def test_probes_compare_cached_hashes_before_keys():
+    table = HashSet(16)
+    # Every key starts probing at slot 0, but no two keys share a hash
+    keys = [Key(value, value * 16) for value in range(8)]
+    for key in keys:
+        table.set(key, key.value)
+
+    Key.comparisons = 0
+    assert [table.get(Key(value, value * 16)) for value in range(8)] == list(range(8))
+    assert Key.comparisons == 8
+    assert table.get(Key(99, 99 * 16)) is None
+    assert Key.comparisons == 8
+
+
+def test_growth_reuses_cached_hashes():
+    table = HashSet(2)
+    keys = [Key(value, value) for value in range(100)]
+    Key.hashes = 0
+    for key in keys:
+        table.set(key, key.value)
+
+    assert table.resizes > 0
+    assert Key.hashes == 100
+    assert list(table.entry_hashes) == list(range(100))
+
+
+def test_index_array_widens_with_capacity():
+    table = HashSet(16)
+    assert table.indices.typecode == 'b'
+
+    for key in range(200):
+        table.set(key, key)
+
+    assert table.indices.typecode == 'h'
+    assert sorted(position for position in table.indices if position >= 0) == list(range(200))
+
+
+def test_stats_are_only_collected_on_request():
+    table = HashSet(16)
+    table.set(1, 1)
+    assert table.stats is None
+    assert len(table.report()) == 1
+
+    table.enable_stats()
+    table.get(1)
+    assert table.stats.get.total() == 1
+    assert len(table.report()) == 4
+
+    table.disable_stats()
+    assert table.stats is None
+
+
+def test_colliding_keys_record_their_probe_lengths():
+    table = HashSet(16, track_stats=True)
+    for value in range(4):
+        table.set(Key(value, value * 16), value)
+    for value in range(4):
+        table.get(Key(value, value * 16))
+    table.delete(Key(3, 3 * 16))
+
+    assert table.stats.set.counts == [0, 1, 1, 1, 1]
+    assert table.stats.get.counts == [0, 1, 1, 1, 1]
+    assert table.stats.get.mean() == 2.5
+    assert table.stats.get.longest() == 4
+    assert table.stats.delete.counts == [0, 0, 0, 0, 1]
+    assert table.tombstone_ratio() == 1 / 16
+
+
+def test_longest_cluster_wraps_around_the_index():
+    table = HashSet(16)
+    for value in (15, 31, 47, 3):
+        table.set(Key(value, value), value)
+
+    # Three keys start at the last slot and wrap into the first two
+    assert table.longest_cluster() == 3
+
+
+def test_empty_histogram():
+    histogram = ProbeHistogram()
+    assert (histogram.total(), histogram.mean(), histogram.longest()) == (0, 0.0, 0)
+
+    histogram.record(3)
+    assert repr(histogram) == 'n=1 mean=3.00 max=3 [3:1]'
+
+
+@pytest.mark.parametrize('size', [0, 1, 5, 6, 100, 1000])
+def test_bulk_build_never_resizes(size):
+    table = HashSet.from_items({key: -key for key in range(size)})
+
+    assert table.resizes == 0
+    assert table.keys() == list(range(size))
+    assert all(table.get(key) == -key for key in range(size))
+    assert len(table) < table.capacity * HashSet.MAX_LOAD_FACTOR
+
+
+def test_bulk_build_of_a_generator_uses_the_expected_size():
+    table = HashSet.from_items(((key, key) for key in range(50)), expected_size=50)
+
+    assert table.resizes == 0
+    assert len(table) == 50
+
+
+def test_pairs_beyond_the_expected_size_still_fit():
+    table = HashSet.from_items(((key, key) for key in range(100)), expected_size=10)
+
+    assert table.resizes > 0
+    assert table.keys() == list(range(100))
+    assert len(table) < table.capacity * HashSet.MAX_LOAD_FACTOR
+
+
+def test_update_replaces_values_and_counts_new_keys():
+    table = HashSet.from_parallel(['a', 'b'], [1, 2])
+    table.update([('b', 20), ('c', 3), ('c', 30)])
+
+    assert table.items() == [('a', 1), ('b', 20), ('c', 30)]
+    assert len(table) == 3
+
+
+def test_reserve_grows_once():
+    table = HashSet(4)
+    table.reserve(100)
+    capacity = table.capacity
+    for key in range(100):
+        table.set(key, key)
+
+    assert table.resizes == 1
+    assert table.capacity == capacity
+
+
+def test_parallel_sequences_must_match():
+    with pytest.raises(ValueError, match='got 1 values for 2 keys'):
+        HashSet.from_parallel(['a', 'b'], [1])
@@ -0,0 +1,35 @@
+from itertools import permutations
+
+import pytest
+
+from wgups.routing.held_karp import HeldKarp
+
+
+def brute_force(engine, return_to_depot):
+    stops = range(1, len(engine.nodes))
+    return min(engine.length(list(order), return_to_depot) for order in permutations(stops))
+
+
+@pytest.mark.parametrize('return_to_depot', [True, False])
+@pytest.mark.parametrize('seed', range(6))
+def test_matches_brute_force(make_engine, seed, return_to_depot):
+    engine = make_engine(seed, 2 + seed)
+    order = HeldKarp(engine).solve(return_to_depot)
+
+    assert sorted(order) == list(range(1, len(engine.nodes)))
+    assert engine.length(order, return_to_depot) == pytest.approx(
+        brute_force(engine, return_to_depot))
+
+
+def test_single_stop(make_engine):
+    engine = make_engine(0, 1)
+    assert HeldKarp(engine).solve(True) == [1]
+
+
+def test_prunes_routes_over_the_upper_bound(make_engine):
+    engine = make_engine(3, 6)
+    best = brute_force(engine, True)
+
+    assert HeldKarp(engine).solve(True, upper_bound=best - 0.5) is None
+    order = HeldKarp(engine).solve(True, upper_bound=best)
+    assert engine.length(order, True) == pytest.approx(best)
@@ -0,0 +1,62 @@
+import pytest
+
+from wgups.routing.insertion_builder import InsertionBuilder
+from wgups.structures.clock import Clock
+
+DEPARTURE = Clock(8)
+
+
+def travel_time(miles):
+    return round(miles / 18 * 60)
+
+
+def arrival(engine, route):
+    """Returns the arrival time in seconds at the last position of a route from the depot."""
+    time = DEPARTURE.total_seconds
+    for previous, position in zip([0] + route, route):
+        time += travel_time(engine.distances[previous, position]) * 60
+    return time
+
+
+def build(engine, return_to_depot):
+    order = InsertionBuilder(engine, DEPARTURE, travel_time).build(return_to_depot)
+    assert sorted(order) == list(range(1, len(engine.nodes)))
+    return order
+
+
+@pytest.mark.parametrize('return_to_depot', [False, True])
+@pytest.mark.parametrize('seed', range(10))
+def test_tight_deadline_is_met(make_engine, seed, return_to_depot):
+    engine = make_engine(seed, 8)
+    engine.deadlines = [float('inf')] * len(engine.nodes)
+    farthest = max(range(1, len(engine.nodes)), key=lambda stop: engine.distances[0, stop])
+    engine.deadlines[farthest] = arrival(engine, [farthest])
+
+    order = build(engine, return_to_depot)
+
+    assert arrival(engine, order[:order.index(farthest) + 1]) <= engine.deadlines[farthest]
+    assert engine.late_stops([0] + order, DEPARTURE, travel_time) == 0
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_infeasible_deadline_only_makes_its_own_stop_late(make_engine, seed):
+    engine = make_engine(seed, 8)
+    engine.deadlines = [float('inf')] * len(engine.nodes)
+    engine.deadlines[1] = DEPARTURE.total_seconds - 60
+    engine.deadlines[2] = arrival(engine, [2]) + 30 * 60
+
+    order = build(engine, False)
+
+    assert engine.late_stops([0] + order, DEPARTURE, travel_time) == 1
+    assert arrival(engine, order[:order.index(2) + 1]) <= engine.deadlines[2]
+
+
+def test_slack_bounds_the_delay_of_every_later_stop(make_engine):
+    engine = make_engine(4, 10)
+    builder = InsertionBuilder(engine, DEPARTURE, travel_time)
+    builder.build(True)
+
+    for index in range(1, len(builder.route)):
+        later = [engine.deadlines[position] - builder.arrivals[following]
+                 for following, position in enumerate(builder.route) if following >= index]
+        assert builder.slack[index] == min(later)
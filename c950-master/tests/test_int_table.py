@@ -0,0 +1,49 @@
+from wgups.structures.int_table import IntTable
+
+
+def test_dense_keys_are_directly_addressed():
+    table = IntTable(4)
+    for key in range(1, 41):
+        table.set(key, key)
+
+    assert len(table.sparse) == 0
+    assert table.dense_size == 40
+    assert all(table.get(key) == key for key in range(1, 41))
+
+
+def test_negative_and_sparse_keys_fall_back():
+    table = IntTable(4)
+    table.set(1, 'one')
+    table.set(-5, 'negative')
+    table.set(10 ** 9, 'large')
+
+    assert table.get(-5) == 'negative'
+    assert table.get(10 ** 9) == 'large'
+    assert -5 in table.sparse and 10 ** 9 in table.sparse
+    assert len(table.slots) < 100
+    assert len(table) == 3
+    assert sorted(table.keys()) == [-5, 1, 10 ** 9]
+
+
+def test_fallback_keys_move_into_grown_array():
+    table = IntTable(2)
+    table.set(20, 'twenty')
+    assert 20 in table.sparse
+
+    for key in range(20):
+        table.set(key, key)
+
+    assert 20 not in table.sparse
+    assert table.get(20) == 'twenty'
+    assert len(table) == 21
+
+
+def test_delete_from_both_stores():
+    table = IntTable(4)
+    table.set(2, 'dense')
+    table.set(-1, 'sparse')
+
+    assert table.delete(2) and table.delete(-1)
+    assert not table.delete(2) and not table.delete(-1)
+    assert table.get(2) is None and table.get(-1) is None
+    assert len(table) == 0
@@ -0,0 +1,65 @@
+from random import Random
+
+import pytest
+
+from wgups.routing.local_search import LocalSearch
+from wgups.structures.clock import Clock
+
+DEPARTURE = Clock(8)
+
+
+def travel_time(miles):
+    return round(miles / 18 * 60)
+
+
+def late(engine, order):
+    return engine.late_stops([0] + order, DEPARTURE, travel_time)
+
+
+def shuffled(engine, seed):
+    order = list(range(1, len(engine.nodes)))
+    Random(seed).shuffle(order)
+    return order
+
+
+@pytest.mark.parametrize('return_to_depot', [False, True])
+@pytest.mark.parametrize('seed', range(30))
+def test_improvement_never_adds_miles_or_late_stops(make_engine, seed, return_to_depot):
+    engine = make_engine(seed, 4 + seed % 20)
+    before = shuffled(engine, seed)
+
+    after = LocalSearch(engine, DEPARTURE, travel_time).improve(before, return_to_depot)
+
+    assert sorted(after) == sorted(before)
+    assert engine.length(after, return_to_depot) <= engine.length(before, return_to_depot)
+    assert late(engine, after) <= late(engine, before)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_improvement_keeps_an_on_time_route_on_time(make_engine, seed):
+    engine = make_engine(seed, 12)
+    before = engine.nearest_neighbor()
+
+    # Give every stop the deadline it meets on the starting route, so any move that delays a
+    # stop makes it late
+    engine.deadlines = [float('inf')] + [0.0] * len(before)
+    time = DEPARTURE.total_seconds
+    for previous, position in zip([0] + before, before):
+        time += travel_time(engine.distances[previous, position]) * 60
+        engine.deadlines[position] = time
+
+    after = LocalSearch(engine, DEPARTURE, travel_time).improve(before, True)
+
+    assert late(engine, after) == 0
+    assert engine.length(after, True) <= engine.length(before, True)
+
+
+def test_budget_stops_the_search(make_engine):
+    engine = make_engine(1, 20)
+    before = shuffled(engine, 1)
+
+    search = LocalSearch(engine, DEPARTURE, travel_time, max_iterations=3)
+    after = search.improve(before, True)
+
+    assert search.moves <= 3
+    assert engine.length(after, True) < engine.length(before, True)
@@ -0,0 +1,91 @@
+from json import dumps
+
+from wgups.data.data_loader import DataLoader
+
+HEADER = 'id,address,city,state,zip,kg,deadline,required_truck,available_at,peers\n'
+ROWS = [
+    '1,195 W Oakland Ave,Salt Lake City,UT,84115,21,10:30,,,\n',
+    '2,2530 S 500 E,Salt Lake City,UT,84106,44,EOD,,,3\n',
+    '3,233 Canyon Rd,Salt Lake City,UT,84103,2,EOD,x,,2\n',
+    '4,1 Nowhere St,Salt Lake City,UT,84115,5,EOD,,,\n',
+    '1,380 W 2880 S,Salt Lake City,UT,84115,1,EOD,,,\n',
+    '5,380 W 2880 S,Salt Lake City,UT,84115,1,noon,,,\n',
+    '6,380 W 2880 S,Salt Lake City,UT,84115,heavy,EOD,,,\n',
+    '7,3060 Lester St,West Valley City,UT,084119,88,EOD,2,09:05,\n',
+]
+
+
+def write_csv(tmp_path, rows):
+    manifest = tmp_path / 'manifest.csv'
+    manifest.write_text(HEADER + ''.join(rows))
+    return str(manifest)
+
+
+def test_bad_rows_are_reported_in_line_order(tmp_path):
+    packages, _, errors = DataLoader.load_manifest(write_csv(tmp_path, ROWS))
+
+    assert sorted(packages.keys()) == [1, 2, 7]
+    assert [error.line for error in errors] == [4, 5, 6, 7, 8]
+    assert "Invalid required truck: 'x'" in errors[0].reason
+    assert 'Unknown address: 1 Nowhere St' in errors[1].reason
+    assert errors[2].reason == 'Duplicate package id 1, first listed on line 2'
+    assert 'deadline' in errors[3].reason
+    assert 'integers' in errors[4].reason
+
+
+def test_duplicate_id_keeps_the_first_row(tmp_path):
+    packages, _, _ = DataLoader.load_manifest(write_csv(tmp_path, ROWS))
+
+    assert packages.get(1).street == '195 W Oakland Ave'
+    assert packages.get(1).weight == 21
+
+
+def test_rejected_rows_leave_their_groups(tmp_path):
+    _, constraints, _ = DataLoader.load_manifest(write_csv(tmp_path, ROWS))
+
+    assert constraints.group(2) == []
+    assert constraints.group(3) == []
+
+
+def test_restrictions_and_zip_codes_are_kept(tmp_path):
+    packages, constraints, _ = DataLoader.load_manifest(write_csv(tmp_path, ROWS))
+
+    package = packages.get(7)
+    assert package.zip_code == '084119'
+    assert constraints.required_truck(7) == 2
+    assert package.arrival_time.total_minutes == 9 * 60 + 5
+
+
+def test_mistyped_json_field_names_its_cause(tmp_path):
+    manifest = tmp_path / 'manifest.jsonl'
+    rows = [
+        {'id': 1, 'address': '195 W Oakland Ave', 'city': 'Salt Lake City', 'state': 'UT',
+         'zip': '84115', 'kg': 21, 'deadline': '10:30', 'available_at': 905},
+        {'id': 2, 'address': '2530 S 500 E', 'city': 'Salt Lake City', 'state': 'UT',
+         'zip': '84106', 'kg': 44, 'deadline': 'EOD'},
+    ]
+    manifest.write_text(''.join(dumps(row) + '\n' for row in rows))
+
+    packages, _, errors = DataLoader.load_manifest(str(manifest))
+
+    assert packages.keys() == [2]
+    assert [(error.line, error.reason) for error in errors] == [
+        (1, 'The available_at time must be an HH:MM string, got 905')]
+
+
+def test_rejected_row_does_not_claim_its_id(tmp_path):
+    rows = [
+        '1,1 Nowhere St,Salt Lake City,UT,84115,21,10:30,2,09:05,3\n',
+        '1,195 W Oakland Ave,Salt Lake City,UT,84115,21,10:30,,,\n',
+        '3,233 Canyon Rd,Salt Lake City,UT,84103,2,EOD,x,,\n',
+        '3,233 Canyon Rd,Salt Lake City,UT,84103,2,EOD,,,\n',
+    ]
+    packages, constraints, errors = DataLoader.load_manifest(write_csv(tmp_path, rows))
+
+    assert sorted(packages.keys()) == [1, 3]
+    assert [error.line for error in errors] == [2, 4]
+    assert not any('Duplicate' in error.reason for error in errors)
+    assert constraints.required_truck(1) is None
+    assert 1 not in constraints.available_at
+    assert constraints.group(1) == []
+    assert packages.get(1).arrival_time.total_minutes == 8 * 60
@@ -0,0 +1,45 @@
+import pytest
+
+from wgups.routing.multi_start_optimizer import MultiStartOptimizer
+from wgups.routing.route_planner import RoutePlanner
+
+
+@pytest.fixture
+def optimize(make_depot):
+    def run(seed, workers=1, starts=6):
+        depot = make_depot(planner=RoutePlanner(improve=True))
+        optimizer = MultiStartOptimizer(starts, seed=seed, workers=workers)
+        miles = optimizer.optimize(depot)
+        routes = [(package.id, package.delivery_time) for package in depot.package_table.all()]
+        return miles, optimizer.results, optimizer.best, routes
+
+    return run
+
+
+def test_same_seed_gives_same_plan(optimize):
+    assert optimize(7) == optimize(7)
+
+
+def test_plan_does_not_depend_on_worker_count(optimize):
+    assert optimize(3, workers=1) == optimize(3, workers=2)
+
+
+def test_best_start_is_replayed(optimize):
+    miles, results, best, _ = optimize(11)
+
+    assert miles == pytest.approx(results[best][0])
+    assert results[best] == min(results, key=lambda result: (result[1], result[0]))
+
+
+def test_greedy_start_comes_first(make_depot, optimize):
+    greedy = make_depot(planner=RoutePlanner(improve=True)).deliver_packages()
+
+    _, results, _, _ = optimize(0, starts=3)
+    assert results[0][0] == pytest.approx(greedy)
+
+
+def test_rejects_empty_search():
+    with pytest.raises(ValueError):
+        MultiStartOptimizer(0)
+    with pytest.raises(ValueError):
+        MultiStartOptimizer(constructions=())
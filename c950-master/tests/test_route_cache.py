@@ -0,0 +1,66 @@
+import pytest
+
+from wgups.routing.route_cache import RouteCache
+
+
+def key(stop):
+    return RouteCache.key(0, [stop], 'variant')
+
+
+def test_key_ignores_stop_order():
+    assert RouteCache.key(0, [3, 1, 2], 'a') == RouteCache.key(0, [2, 3, 1], 'a')
+    assert RouteCache.key(0, [1, 2], 'a') != RouteCache.key(0, [1, 2], 'b')
+
+
+def test_evicts_least_recently_set():
+    cache = RouteCache(3)
+    for stop in range(1, 5):
+        cache.set(key(stop), [stop], float(stop))
+
+    assert cache.get(key(1)) is None
+    assert [cache.get(key(stop))[1] for stop in (2, 3, 4)] == [2.0, 3.0, 4.0]
+    assert cache.evictions == 1
+    assert len(cache) == 3
+
+
+def test_lookup_protects_route_from_eviction():
+    cache = RouteCache(3)
+    for stop in (1, 2, 3):
+        cache.set(key(stop), [stop], float(stop))
+
+    cache.get(key(1))
+    cache.set(key(4), [4], 4.0)
+    cache.set(key(5), [5], 5.0)
+
+    assert cache.get(key(2)) is None
+    assert cache.get(key(3)) is None
+    assert cache.get(key(1)) is not None
+    assert cache.entries.keys() == [key(4), key(5), key(1)]
+
+
+def test_replacing_a_route_does_not_evict():
+    cache = RouteCache(2)
+    cache.set(key(1), [1], 1.0)
+    cache.set(key(2), [2], 2.0)
+    cache.set(key(1), [1], 0.5)
+
+    assert cache.evictions == 0
+    assert cache.entries.keys() == [key(2), key(1)]
+    assert cache.get(key(1)) == ([1], 0.5)
+
+
+def test_churn_keeps_table_size_bounded():
+    cache = RouteCache(8)
+    capacity = cache.entries.capacity
+    for stop in range(1, 2000):
+        cache.set(key(stop % 50), [stop], 0.0)
+        cache.get(key((stop - 3) % 50))
+
+    assert len(cache) == 8
+    assert cache.entries.capacity == capacity
+    assert cache.entries.resizes == 0
+
+
+def test_rejects_empty_cache():
+    with pytest.raises(ValueError):
+        RouteCache(0)
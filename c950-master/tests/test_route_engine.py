@@ -0,0 +1,128 @@
+from copy import copy
+
+import pytest
+
+from wgups.data.distance_table import DistanceTable
+from wgups.routing.route_engine import RouteEngine
+from wgups.routing.route_planner import RoutePlanner
+from wgups.structures.clock import Clock
+
+
+def greedy(engine):
+    """Orders the stops of an engine by scanning every unvisited stop at each step."""
+    unvisited = set(range(1, len(engine.nodes)))
+    order = []
+    current = 0
+    while unvisited:
+        row = engine.distances[current]
+        current = min(unvisited, key=lambda position: (row[position], position))
+        unvisited.remove(current)
+        order.append(current)
+    return order
+
+
+@pytest.fixture
+def short_lists(distances):
+    """The sample distance table with candidate lists too short to cover every stop."""
+    table = copy(distances)
+    table.neighbor_count = 4
+    table.neighbors = None
+    return table
+
+
+def test_neighbors_are_closest_first(distances):
+    size = len(distances.addresses)
+    for index in range(size):
+        neighbors = distances.neighbors_of(index)
+        row = distances.row_at(index)
+        assert len(neighbors) == min(DistanceTable.neighbor_count, size)
+        assert [row[neighbor] for neighbor in neighbors] == sorted(row)[:len(neighbors)]
+
+
+def test_short_neighbor_lists_hold_the_nearest_addresses(short_lists):
+    for index in range(len(short_lists.addresses)):
+        neighbors = short_lists.neighbors_of(index)
+        row = short_lists.row_at(index)
+        assert len(neighbors) == 4
+        assert [row[neighbor] for neighbor in neighbors] == sorted(row)[:4]
+
+
+def test_candidate_lists_hold_route_positions(make_engine):
+    engine = make_engine(7, 12)
+    for position, candidates in enumerate(engine.neighbors):
+        assert position not in candidates
+        assert sorted(candidates) == [other for other in range(len(engine.nodes))
+                                      if other != position]
+        assert [engine.distances[position, other] for other in candidates] == \
+            sorted(engine.distances[position, other] for other in candidates)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_nearest_neighbor_matches_a_full_scan(make_engine, seed):
+    engine = make_engine(seed, 3 + seed % 15)
+    assert engine.nearest_neighbor() == greedy(engine)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_nearest_neighbor_falls_back_when_candidates_are_visited(packages, short_lists, seed):
+    engine = RouteEngine(short_lists, list(packages.values())[seed:seed + 20])
+    assert all(len(candidates) < len(engine.nodes) - 1 for candidates in engine.neighbors)
+    assert engine.nearest_neighbor() == greedy(engine)
+
+
+def test_leg_times_are_computed_once_per_travel_time(make_engine):
+    engine = make_engine(3, 9)
+    calls = []
+
+    def travel_time(miles):
+        calls.append(miles)
+        return round(miles / 18 * 60)
+
+    planner = RoutePlanner(improve=True)
+    first = planner.plan(engine, Clock(8), travel_time, True)
+    assert planner.plan(engine, Clock(8), travel_time, True) == first
+    planner.late_stops(engine, first, Clock(8), travel_time)
+
+    assert len(calls) == engine.distances.size
+    assert engine.travel_minutes(travel_time).tolist() == \
+        [[travel_time(miles) for miles in row] for row in engine.distances.tolist()]
+    assert engine.travel_minutes(lambda miles: 0).sum() == 0
+
+
+def test_packages_are_grouped_by_stop(distances, packages):
+    load = [packages.get(identifier) for identifier in (38, 5, 13, 37, 39, 9)]
+    engine = RouteEngine(distances, load)
+
+    assert engine.nodes[0] == distances.depot_index
+    assert engine.nodes[1:] == sorted({package.node for package in load})
+    for position, node in enumerate(engine.nodes[1:], 1):
+        stop = [package for package in load if package.node == node]
+        assert engine.deliveries.get(node) == stop
+        assert engine.deadlines[position] == min(package.deadline.total_seconds
+                                                 for package in stop)
+
+
+@pytest.mark.parametrize('return_to_depot', [False, True])
+def test_legs_follow_the_order(make_engine, return_to_depot):
+    engine = make_engine(5, 9)
+    order = list(range(len(engine.nodes) - 1, 0, -1))
+
+    legs = engine.legs(order, return_to_depot)
+
+    stops = [0] + order + ([0] if return_to_depot else [])
+    assert [miles for miles, _ in legs] == [engine.distances[i, j]
+                                           for i, j in zip(stops, stops[1:])]
+    assert [deliveries for _, deliveries in legs[:len(order)]] == \
+        [engine.deliveries.get(engine.nodes[position]) for position in order]
+    assert len(legs) == len(order) + return_to_depot
+    assert engine.length(order, return_to_depot) == pytest.approx(sum(miles for miles, _ in legs))
+
+
+def test_late_stops_count_missed_deadlines(make_engine):
+    engine = make_engine(6, 5)
+    order = [1, 2, 3, 4]
+    engine.deadlines = [float('inf')] + [0.0, Clock(23).total_seconds, 0.0, 0.0]
+
+    assert engine.late_stops([0] + order, Clock(8), lambda miles: 1) == 3
+    # Positions past the last stop, such as the end of an open route, are ignored
+    assert engine.late_stops([0] + order + [len(engine.nodes)], Clock(8), lambda miles: 1) == 3
@@ -0,0 +1,63 @@
+from random import Random
+
+import pytest
+
+from wgups.structures.clock import Clock
+
+
+@pytest.fixture(scope='module')
+def depot(make_depot):
+    depot = make_depot()
+    depot.deliver_packages()
+    return depot
+
+
+def day_times(step):
+    return [Clock(7).add_minutes(minutes) for minutes in range(0, 12 * 60, step)]
+
+
+def snapshot(depot, time):
+    return ([depot.timeline.package_status(package.id, time)
+             for package in depot.package_table.all()],
+            depot.timeline.trucks_at(time))
+
+
+def test_matches_package_history(depot):
+    for time in day_times(5):
+        for package in depot.package_table.all():
+            assert depot.timeline.package_status(package.id, time) == package.status_at(time)
+
+
+def test_seeking_backward_matches_seeking_forward(depot):
+    times = day_times(3)
+    forward = [snapshot(depot, time) for time in times]
+    backward = [snapshot(depot, time) for time in reversed(times)]
+
+    assert backward[::-1] == forward
+
+
+def test_random_jumps_match_forward_replay(depot):
+    times = day_times(3)
+    forward = [snapshot(depot, time) for time in times]
+    order = list(range(len(times)))
+    Random(5).shuffle(order)
+
+    for index in order:
+        assert snapshot(depot, times[index]) == forward[index]
+
+
+def test_event_takes_effect_after_its_time(depot):
+    package = depot.package_table.all()[0]
+    delivered = package.delivery_time
+
+    assert depot.timeline.package_status(package.id, delivered) != \
+        depot.timeline.package_status(package.id, delivered.add_seconds(1))
+    assert depot.timeline.package_status(package.id, delivered.add_seconds(1)) == \
+        package.status_at(delivered.add_seconds(1))
+
+
+def test_events_between(depot):
+    events = depot.timeline.events_between(Clock(8), Clock(9))
+
+    assert events
+    assert all(Clock(8) <= event.time < Clock(9) for event in events)
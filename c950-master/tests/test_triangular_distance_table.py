@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from wgups.data.binary_cache import BinaryCache
+from wgups.data.data_loader import DataLoader
+from wgups.data.package_table import PackageTable
+from wgups.data.triangular_distance_table import TriangularDistanceTable
+from wgups.routing.depot import Depot
+
+
+@pytest.fixture(scope='module')
+def compact(distances):
+    return TriangularDistanceTable.from_matrix(distances.addresses, distances.matrix)
+
+
+def test_every_distance_is_the_dense_one_to_a_tenth(distances, compact):
+    size = len(distances)
+    assert compact.triangle.nbytes * 8 < distances.matrix.nbytes * 2
+
+    tenth = pytest.approx(0, abs=0.05)
+    for index in range(size):
+        assert compact.row_at(index) - distances.row_at(index) == tenth
+        for other in range(size):
+            assert compact.distance_between(index, other) == \
+                compact.distance_between(other, index)
+            assert compact.distance_between(index, other) - \
+                distances.distance_between(index, other) == tenth
+
+    nodes = [compact.depot_index, 7, 3, 12]
+    assert compact.submatrix(nodes) - distances.submatrix(nodes) == tenth
+    assert compact.to_depot_vector() - distances.to_depot_vector() == tenth
+
+
+def test_cached_triangle_matches_the_dense_table(tmp_path, monkeypatch, compact):
+    monkeypatch.setattr(BinaryCache, 'directory', str(tmp_path))
+    source = DataLoader.data_path('data/distance_data.json')
+
+    for _ in range(2):
+        addresses, triangle = BinaryCache.load_triangle(source)
+        assert addresses == compact.addresses
+        assert np.array_equal(triangle, compact.triangle)
+
+
+def test_routes_match_the_dense_table(compact):
+    packages, constraints = DataLoader.load_packages()
+    depot = Depot(compact, PackageTable(packages), constraints=constraints)
+
+    assert depot.deliver_packages() == pytest.approx(108.26, abs=0.1)
+    assert depot.late_packages() == 0
+
+
+def test_out_of_range_distances_and_bad_shapes_are_rejected(distances):
+    assert TriangularDistanceTable.quantize(np.array([0.04, 0.05, 1.26])).tolist() == [0, 0, 13]
+    with pytest.raises(ValueError, match='between 0 and 6553.5 miles'):
+        TriangularDistanceTable.quantize(np.array([-1.0]))
+    with pytest.raises(ValueError, match='between 0 and 6553.5 miles'):
+        TriangularDistanceTable.quantize(np.array([6553.6]))
+    with pytest.raises(ValueError, match='upper triangle of 3 addresses'):
+        TriangularDistanceTable(distances.addresses[:3], np.zeros(2, dtype='<u2'))
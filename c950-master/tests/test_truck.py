@@ -0,0 +1,47 @@
+import pytest
+
+from wgups.data.data_loader import DataLoader
+from wgups.routing.event_log import EventKind, EventLog
+from wgups.routing.truck import Truck
+from wgups.structures.clock import Clock
+
+
+@pytest.fixture
+def fresh():
+    """A copy of the sample packages that may be delivered."""
+    return DataLoader.load_packages()[0]
+
+
+def test_packages_resolve_to_the_node_of_their_street(distances, packages):
+    for package in packages.values():
+        assert distances.address(package.node) == package.street
+
+    assert packages.get(9).street == '410 S State St'
+
+
+def test_truck_routes_by_node(distances, fresh):
+    # Packages 13 and 39, 5, 9 and 37, and 8 and 30 share their streets, 9 once corrected
+    shared = [(13, 39), (5, 9, 37), (8, 30)]
+    load = [fresh.get(identifier) for identifier in (13, 39, 5, 9, 37, 8, 30, 16)]
+    truck = Truck(1)
+    truck.depart_at(Clock(8))
+    truck.load_packages(load)
+
+    assert truck.destinations() == [package.node for package in load]
+
+    events = EventLog()
+    miles = truck.deliver_packages(distances, True, events)
+
+    stops = [distances.depot_index]
+    for event in events.ordered():
+        if event.kind == EventKind.DELIVER:
+            node = fresh.get(event.package_id).node
+            if node != stops[-1]:
+                stops.append(node)
+    stops.append(distances.depot_index)
+
+    assert miles == pytest.approx(sum(distances.distance_between(i, j)
+                                      for i, j in zip(stops, stops[1:])))
+    assert len(stops) - 2 == 4
+    for group in shared:
+        assert len({fresh.get(identifier).delivery_time for identifier in group}) == 1
@@ -0,0 +1,691 @@
+from hashlib import sha256
+from json import load
+from os import makedirs, path, replace, stat
+from struct import Struct
+from typing import Any, Callable, List, Mapping, Optional, TextIO, Tuple
+
+import numpy as np
+
+from wgups.data.distance_preprocessor import DistancePreprocessor
+from wgups.data.triangular_distance_table import TriangularDistanceTable
+from wgups.structures.clock import Clock
+from wgups.structures.int_table import IntTable
+
+# Magic bytes, format version, payload kind, source modification time and source SHA-256
+HEADER = Struct('<8sHHq32s')
+# Number of entries, number of strings and the byte length of the string table
+COUNTS = Struct('<III')
+
+PACKAGE_RECORD = np.dtype([
+    ('id', '<i4'),
+    ('zip', '<u4'),
+    ('kg', '<i4'),
+    ('deadline', '<i4'),
+    ('street', '<u4'),
+    ('city', '<u4'),
+    ('state', '<u4'),
+    ('required_truck', '<i2'),
+    ('is_peer', 'u1'),
+    ('is_delayed', 'u1'),
+    ('available_at', '<i4'),
+    ('correction', '<i4'),
+    ('group', '<i4'),
+])
+
+
+class BinaryCache:
+    """A class which compiles the JSON data files into versioned binary caches. Caches are
+    memory-mapped when read, so loading them costs page faults rather than JSON parsing.
+
+    A cache is rebuilt when its format version changes or when the content hash of its
+    source file changes. The modification time of the source is checked first so the hash
+    is only computed after the source has been touched.
+
+    Every cache starts with a header of magic bytes, the format version, the payload kind,
+    the source modification time and the SHA-256 of the source, followed by the entry count,
+    the number of strings and byte length of a string table, the string table and the payload
+    itself.
+
+    Class Attributes
+    ----------------
+        MAGIC : bytes
+            The bytes that open every cache file.
+        VERSION : int
+            The cache format version. Bump it whenever the layout of a payload changes.
+        DISTANCES : int
+            The payload kind of a distance matrix.
+        PACKAGES : int
+            The payload kind of packed package records.
+        TRIANGLE : int
+            The payload kind of the quantized upper triangle of a symmetric distance matrix.
+        CLOSED : int
+            The payload kind of a distance matrix closed under shortest paths.
+        SUFFIXES : Mapping[int, str]
+            The suffix of the cache file of each payload kind compiled from a shared source.
+        directory : str
+            The directory in which cache files are written.
+    """
+
+    MAGIC = b'WGUPSBIN'
+    VERSION = 3
+    DISTANCES = 1
+    PACKAGES = 2
+    TRIANGLE = 3
+    CLOSED = 4
+
+    SUFFIXES = {TRIANGLE: '.triangle', CLOSED: '.closed'}
+
+    directory = path.join(path.dirname(__file__), 'cache')
+
+    @classmethod
+    def cache_path(cls, source: str, kind: int) -> str:
+        """Determines the path of the cache file for a source file. The file name keeps the
+        extension of the source and a hash of its absolute path, so sources that share a stem or
+        a file name never share a cache.
+
+        Parameters
+        ----------
+            source : str
+                The path of the source file.
+            kind : int
+                The payload kind.
+
+        Returns
+        -------
+            str
+                The path of the cache file.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        name = path.basename(source)
+        location = sha256(path.abspath(source).encode('utf-8')).hexdigest()[:12]
+        return path.join(cls.directory, f'{name}.{location}{cls.SUFFIXES.get(kind, "")}.bin')
+
+    @classmethod
+    def digest(cls, source: str) -> bytes:
+        """Computes the SHA-256 of a source file.
+
+        Parameters
+        ----------
+            source : str
+                The path of the source file.
+
+        Returns
+        -------
+            bytes
+                The digest.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        hasher = sha256()
+        with open(source, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                hasher.update(chunk)
+        return hasher.digest()
+
+    @classmethod
+    def is_fresh(cls, source: str, cache: str, kind: int) -> bool:
+        """Determines if a cache file was compiled from the current contents of its source.
+        If only the modification time of the source changed, the header is updated so the
+        hash is not recomputed on the next start.
+
+        Parameters
+        ----------
+            source : str
+                The path of the source file.
+            cache : str
+                The path of the cache file.
+            kind : int
+                The expected payload kind.
+
+        Returns
+        -------
+            bool
+                Returns `True` if the cache can be used, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) if the source is untouched, otherwise O(n)
+        """
+        try:
+            with open(cache, 'rb') as file:
+                header = file.read(HEADER.size)
+        except OSError:
+            return False
+
+        if len(header) < HEADER.size:
+            return False
+
+        magic, version, cached_kind, mtime, digest = HEADER.unpack(header)
+        if magic != cls.MAGIC or version != cls.VERSION or cached_kind != kind:
+            return False
+
+        source_mtime = stat(source).st_mtime_ns
+        if source_mtime == mtime:
+            return True
+
+        if cls.digest(source) != digest:
+            return False
+
+        # The contents are unchanged, so remember the new modification time
+        try:
+            with open(cache, 'r+b') as file:
+                file.write(HEADER.pack(magic, version, kind, source_mtime, digest))
+        except OSError:
+            pass
+
+        return True
+
+    @classmethod
+    def write(cls, source: str, cache: str, kind: int, count: int,
+              strings: List[str], payload: bytes) -> None:
+        """Writes a cache file. The file is written beside its final path and then moved
+        into place, so readers never see a partially written cache.
+
+        Parameters
+        ----------
+            source : str
+                The path of the source file.
+            cache : str
+                The path of the cache file.
+            kind : int
+                The payload kind.
+            count : int
+                The number of entries in the payload.
+            strings : List[str]
+                The string table.
+            payload : bytes
+                The payload.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        table = '\0'.join(strings).encode('utf-8')
+        header = HEADER.pack(cls.MAGIC, cls.VERSION, kind,
+                             stat(source).st_mtime_ns, cls.digest(source))
+        prefix = header + COUNTS.pack(count, len(strings), len(table)) + table
+
+        # Align the payload so that it can be mapped as an array of 8 byte values
+        padding = b'\0' * (-len(prefix) % 8)
+
+        makedirs(path.dirname(cache), exist_ok=True)
+        temporary = f'{cache}.tmp'
+        with open(temporary, 'wb') as file:
+            file.write(prefix + padding)
+            file.write(payload)
+        replace(temporary, cache)
+
+    @classmethod
+    def read(cls, cache: str) -> Tuple[int, List[str], int]:
+        """Reads the string table of a cache file and locates its payload.
+
+        Parameters
+        ----------
+            cache : str
+                The path of the cache file.
+
+        Returns
+        -------
+            Tuple[int, List[str], int]
+                The number of entries, the string table and the byte offset of the payload.
+
+        Space Complexity
+        ---------------
+            O(s)
+
+        Time Complexity
+        ---------------
+            O(s)
+        """
+        with open(cache, 'rb') as file:
+            file.seek(HEADER.size)
+            count, size, length = COUNTS.unpack(file.read(COUNTS.size))
+            table = file.read(length).decode('utf-8')
+
+        offset = HEADER.size + COUNTS.size + length
+        offset += -offset % 8
+        # An empty table and a table holding one empty string are told apart by the count
+        return count, table.split('\0') if size else [], offset
+
+    @classmethod
+    def load(cls, source: str, kind: int,
+             compiler: Callable[[Any], Tuple[int, List[str], bytes]],
+             reader: Callable[[TextIO], Any] = load,
+             ) -> Tuple[int, List[str], Optional[str], int, Optional[bytes]]:
+        """Returns the contents of a cache file, compiling the source first if the cache is
+        missing or stale.
+
+        Parameters
+        ----------
+            source : str
+                The path of the source file.
+            kind : int
+                The payload kind.
+            compiler : Callable[[Any], Tuple[int, List[str], bytes]]
+                Builds the entry count, string table and payload from the parsed source.
+            reader : Callable[[TextIO], Any]
+                Parses the source file. Defaults to parsing JSON.
+
+        Returns
+        -------
+            Tuple[int, List[str], Optional[str], int, Optional[bytes]]
+                The entry count, the string table, the cache path and payload offset to map,
+                and the payload itself if the cache could not be written.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        cache = cls.cache_path(source, kind)
+
+        if not cls.is_fresh(source, cache, kind):
+            with open(source, 'r', newline='') as file:
+                count, strings, payload = compiler(reader(file))
+
+            try:
+                cls.write(source, cache, kind, count, strings, payload)
+            except OSError:
+                # Without a writable cache directory the compiled payload is used directly
+                return count, strings, None, 0, payload
+
+        count, strings, offset = cls.read(cache)
+        return count, strings, cache, offset, None
+
+    @classmethod
+    def compile_distances(cls, data: Mapping[str, Mapping[str, float]]
+                          ) -> Tuple[int, List[str], bytes]:
+        """Compiles the distance data into a dense, row-major matrix of 64 bit floats.
+
+        Parameters
+        ----------
+            data : Mapping[str, Mapping[str, float]]
+                The parsed distance data.
+
+        Returns
+        -------
+            Tuple[int, List[str], bytes]
+                The number of addresses, the addresses in matrix order and the matrix.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^2)
+        """
+        addresses = list(data.keys())
+        matrix = np.array([[float(data[from_address][to_address]) for to_address in addresses]
+                           for from_address in addresses], dtype='<f8').reshape(
+                               len(addresses), len(addresses))
+        return len(addresses), addresses, matrix.tobytes()
+
+    @classmethod
+    def compile_closed(cls, data: Mapping[str, Mapping[str, float]]
+                       ) -> Tuple[int, List[str], bytes]:
+        """Compiles the distance data into a dense matrix of shortest path distances.
+
+        Parameters
+        ----------
+            data : Mapping[str, Mapping[str, float]]
+                The parsed distance data.
+
+        Returns
+        -------
+            Tuple[int, List[str], bytes]
+                The number of addresses, the addresses in matrix order and the matrix.
+
+        Raises
+        ------
+            DistanceError
+                The distance data is invalid.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^3)
+        """
+        addresses, matrix = DistancePreprocessor.from_mapping(data)
+        closed = DistancePreprocessor.prepare(addresses, matrix)
+        return len(addresses), addresses, closed.astype('<f8').tobytes()
+
+    @classmethod
+    def compile_edges(cls, edges: List[Tuple[str, str, float]]
+                      ) -> Tuple[int, List[str], bytes]:
+        """Compiles a list of road segments into a dense matrix of shortest path distances.
+
+        Parameters
+        ----------
+            edges : List[Tuple[str, str, float]]
+                The (from address, to address, miles) segments.
+
+        Returns
+        -------
+            Tuple[int, List[str], bytes]
+                The number of addresses, the addresses in matrix order and the matrix.
+
+        Raises
+        ------
+            DistanceError
+                The segments are invalid or leave some address unreachable.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^3)
+        """
+        addresses, matrix = DistancePreprocessor.from_edges(edges)
+        closed = DistancePreprocessor.prepare(addresses, matrix)
+        return len(addresses), addresses, closed.astype('<f8').tobytes()
+
+    @classmethod
+    def compile_triangle(cls, data: Mapping[str, Mapping[str, float]]
+                         ) -> Tuple[int, List[str], bytes]:
+        """Compiles the distance data into the upper triangle of the distance matrix, without
+        the diagonal, stored row by row as unsigned 16 bit tenths of a mile. Distances are
+        rounded to the nearest tenth, and the distance from `a` to `b` is assumed to equal the
+        distance from `b` to `a`.
+
+        Parameters
+        ----------
+            data : Mapping[str, Mapping[str, float]]
+                The parsed distance data.
+
+        Returns
+        -------
+            Tuple[int, List[str], bytes]
+                The number of addresses, the addresses in matrix order and the triangle.
+
+        Raises
+        ------
+            ValueError
+                A distance is negative or too large to be stored in tenths of a mile.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^2)
+        """
+        addresses = list(data.keys())
+        triangle = np.array([float(data[from_address][to_address])
+                             for i, from_address in enumerate(addresses)
+                             for to_address in addresses[i + 1:]], dtype='<f8')
+
+        return len(addresses), addresses, TriangularDistanceTable.quantize(triangle).tobytes()
+
+    @classmethod
+    def compile_packages(cls, data: Mapping[str, Mapping[str, Any]], groups: IntTable[int]
+                         ) -> Tuple[int, List[str], bytes]:
+        """Compiles the package data into packed records. Repeated strings such as cities
+        and states are stored once in the string table, and ZIP codes are stored as strings so
+        leading zeros survive. Each linked package records the representative of its
+        co-delivery group. Missing times, corrections and groups are stored as -1.
+
+        Parameters
+        ----------
+            data : Mapping[str, Mapping[str, Any]]
+                The parsed package data.
+            groups : IntTable[int]
+                The representative of the co-delivery group of each linked package.
+
+        Returns
+        -------
+            Tuple[int, List[str], bytes]
+                The number of packages, the string table and the packed records.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        strings: List[str] = []
+        positions = {}
+
+        def intern(value: str) -> int:
+            if value not in positions:
+                positions[value] = len(strings)
+                strings.append(value)
+            return positions[value]
+
+        records = np.zeros(len(data), dtype=PACKAGE_RECORD)
+        for index, value in enumerate(data.values()):
+            available_at = value.get('available_at')
+            correction = value.get('corrected_address')
+            records[index] = (
+                value['id'],
+                intern(str(value['zip']).strip()),
+                value['kg'],
+                Clock.from_string(value['deadline']).total_seconds,
+                intern(value['address']),
+                intern(value['city']),
+                intern(value['state']),
+                value['required_truck'] or 0,
+                bool(value['is_peer']),
+                bool(value['is_delayed']),
+                Clock.from_string(available_at).total_seconds if available_at else -1,
+                intern(correction) if correction else -1,
+                groups.get(value['id']) if value['id'] in groups else -1,
+            )
+
+        return len(records), strings, records.tobytes()
+
+    @classmethod
+    def load_distances(cls, source: str) -> Tuple[List[str], np.ndarray]:
+        """Returns the addresses and distance matrix compiled from a distance data file.
+
+        Parameters
+        ----------
+            source : str
+                The path of the distance data file.
+
+        Returns
+        -------
+            Tuple[List[str], np.ndarray]
+                The addresses, and the matrix in which `matrix[i, j]` is the distance in miles
+                from `addresses[i]` to `addresses[j]`.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n) on a cache hit, O(n^2) otherwise
+        """
+        count, addresses, cache, offset, payload = cls.load(
+            source, cls.DISTANCES, cls.compile_distances)
+        return addresses, cls.map_matrix(count, cache, offset, payload)
+
+    @classmethod
+    def load_closed(cls, source: str) -> Tuple[List[str], np.ndarray]:
+        """Returns the addresses and shortest path distance matrix compiled from a distance
+        data file or, for a `.csv` source, from a list of road segments with `from`, `to` and
+        `miles` columns. The closed matrix is cached beside the cache of the direct legs.
+
+        Parameters
+        ----------
+            source : str
+                The path of the distance data file or edge list.
+
+        Returns
+        -------
+            Tuple[List[str], np.ndarray]
+                The addresses, and the matrix in which `matrix[i, j]` is the length in miles of
+                the shortest path from `addresses[i]` to `addresses[j]`.
+
+        Raises
+        ------
+            DistanceError
+                The distance data is invalid.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n) on a cache hit, O(n^3) otherwise
+        """
+        if path.splitext(source)[1].lower() == '.csv':
+            count, addresses, cache, offset, payload = cls.load(
+                source, cls.CLOSED, cls.compile_edges, DistancePreprocessor.read_edges)
+        else:
+            count, addresses, cache, offset, payload = cls.load(
+                source, cls.CLOSED, cls.compile_closed)
+
+        return addresses, cls.map_matrix(count, cache, offset, payload)
+
+    @classmethod
+    def map_matrix(cls, count: int, cache: Optional[str], offset: int,
+                   payload: Optional[bytes]) -> np.ndarray:
+        """Maps a dense matrix payload from a cache file, or wraps the payload itself if the
+        cache could not be written.
+
+        Parameters
+        ----------
+            count : int
+                The number of rows and columns of the matrix.
+            cache : Optional[str]
+                The path of the cache file.
+            offset : int
+                The byte offset of the payload within the cache file.
+            payload : Optional[bytes]
+                The payload, if the cache could not be written.
+
+        Returns
+        -------
+            np.ndarray
+                The matrix.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        if cache is None:
+            matrix = np.frombuffer(payload, dtype='<f8').reshape(count, count)
+        elif count:
+            matrix = np.memmap(cache, dtype='<f8', mode='r', offset=offset, shape=(count, count))
+        else:
+            matrix = np.zeros((0, 0), dtype='<f8')
+
+        return matrix
+
+    @classmethod
+    def load_triangle(cls, source: str) -> Tuple[List[str], np.ndarray]:
+        """Returns the addresses and quantized upper triangle compiled from a distance data
+        file.
+
+        Parameters
+        ----------
+            source : str
+                The path of the distance data file.
+
+        Returns
+        -------
+            Tuple[List[str], np.ndarray]
+                The addresses, and the upper triangle of the distance matrix in tenths of a
+                mile, stored row by row.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n) on a cache hit, O(n^2) otherwise
+        """
+        count, addresses, cache, offset, payload = cls.load(
+            source, cls.TRIANGLE, cls.compile_triangle)
+        size = count * (count - 1) // 2
+
+        if cache is None:
+            triangle = np.frombuffer(payload, dtype='<u2')
+        elif size:
+            triangle = np.memmap(cache, dtype='<u2', mode='r', offset=offset, shape=(size,))
+        else:
+            triangle = np.zeros(0, dtype='<u2')
+
+        return addresses, triangle
+
+    @classmethod
+    def load_packages(cls, source: str,
+                      groups: Callable[[Mapping[str, Mapping[str, Any]]], IntTable[int]]
+                      ) -> Tuple[np.ndarray, List[str]]:
+        """Returns the packed package records compiled from a package data file. Co-delivery
+        groups are resolved by the caller when the cache is compiled, so the cache holds the
+        same groups as every other source of packages.
+
+        Parameters
+        ----------
+            source : str
+                The path of the package data file.
+            groups : Callable[[Mapping[str, Mapping[str, Any]]], IntTable[int]]
+                Maps each linked package of the parsed package data to the representative of
+                its co-delivery group.
+
+        Returns
+        -------
+            Tuple[np.ndarray, List[str]]
+                The package records and the string table their string fields index into.
+
+        Space Complexity
+        ---------------
+            O(s)
+
+        Time Complexity
+        ---------------
+            O(s) on a cache hit, O(n) otherwise
+        """
+        count, strings, cache, offset, payload = cls.load(
+            source, cls.PACKAGES, lambda data: cls.compile_packages(data, groups(data)))
+
+        if cache is None:
+            records = np.frombuffer(payload, dtype=PACKAGE_RECORD)
+        elif count:
+            records = np.memmap(cache, dtype=PACKAGE_RECORD, mode='r', offset=offset,
+                                shape=(count,))
+        else:
+            records = np.zeros(0, dtype=PACKAGE_RECORD)
+
+        return records, strings
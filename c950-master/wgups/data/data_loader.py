@@ -1,15 +1,19 @@
 from __future__ import annotations
-from datetime import timedelta
 from json import load
 from os import path
-from typing import Any, Mapping
+from typing import Any, List, Mapping, Tuple
 
+from wgups.data.binary_cache import BinaryCache
+from wgups.data.distance_table import DistanceTable
+from wgups.data.manifest_reader import ManifestError, ManifestReader
+from wgups.data.triangular_distance_table import TriangularDistanceTable
+from wgups.routing.constraints import ConstraintIndex
 from wgups.structures.clock import Clock
 from wgups.structures.hash_set import HashSet
+from wgups.structures.int_table import IntTable
 from wgups.routing.package import Package
 
-Distances = HashSet[str, HashSet[str, str]]
-Packages = HashSet[int, Package]
+Packages = IntTable[Package]
 Prompts = HashSet[str, str]
 
 
@@ -21,9 +25,19 @@ class DataLoader:
     ----------------
         cache : HashSet[str, Any]
             The cache which handles storing file data.
+        compact_distances : bool
+            Whether distances are loaded into a `TriangularDistanceTable`, which stores each
+            distance once as tenths of a mile, rather than a dense `DistanceTable`. Must be set
+            before the distances are first loaded.
+        closed_distances : bool
+            Whether the distance data is validated and closed under shortest paths, so that
+            each distance is the shortest path through any other addresses rather than the
+            direct leg. Must be set before the distances are first loaded.
     """
 
     cache = HashSet[str, Any]()
+    compact_distances = False
+    closed_distances = False
 
     @classmethod
     def load_json(cls, filename) -> Mapping[Any, Any]:
@@ -43,11 +57,33 @@ class DataLoader:
         ---------------
             O(n)
         """
-        file_path = path.join(path.dirname(__file__), filename)
-
-        with open(file_path, 'r') as file:
+        with open(cls.data_path(filename), 'r') as file:
             return load(file)
 
+    @classmethod
+    def data_path(cls, filename: str) -> str:
+        """Determines the path of a data file bundled with the application.
+
+        Parameters
+        ----------
+            filename : str
+                The path of the file relative to the data package.
+
+        Returns
+        -------
+            str
+                The absolute path of the file.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return path.join(path.dirname(__file__), filename)
+
     @classmethod
     def get_packages(cls) -> Packages:
         """Attempts to retrieve the packages from the cache. Loads the package data from a file
@@ -55,7 +91,7 @@ class DataLoader:
 
         Returns
         -------
-            HashSet[int, str]
+            IntTable[Package]
                 The mapping of package identifiers to package objects.
 
         Space Complexity
@@ -67,18 +103,21 @@ class DataLoader:
             O(n)
         """
         if 'packages' not in cls.cache:
-            cls.cache.set('packages', cls.load_packages())
+            packages, constraints = cls.load_packages()
+            cls.cache.set('packages', packages)
+            cls.cache.set('constraints', constraints)
 
         return cls.cache.get('packages')
 
     @classmethod
-    def load_packages(cls) -> Packages:
-        """Loads the package data from a file.
+    def get_constraints(cls) -> ConstraintIndex:
+        """Attempts to retrieve the delivery restrictions of the packages from the cache. Loads
+        the package data from a file if it is not present in the cache.
 
         Returns
         -------
-            HashSet[int, str]
-                The mapping of package identifiers to package objects.
+            ConstraintIndex
+                The index of package delivery restrictions.
 
         Space Complexity
         ---------------
@@ -88,58 +127,199 @@ class DataLoader:
         ---------------
             O(n)
         """
-        data = cls.load_json('data/package_data.json')
-        size = len(data)
-        packages = HashSet(size)
+        cls.get_packages()
+        return cls.cache.get('constraints')
 
-        for key, value in data.items():
-            identifier = int(key)
+    @classmethod
+    def load_packages(cls) -> Tuple[Packages, ConstraintIndex]:
+        """Loads the package data from the binary cache of the package data file, compiling
+        the cache first if needed. The delivery restrictions stored with each record are
+        indexed and applied to the packages.
 
-            (hours, minutes) = map(int, value['deadline'].split(':'))
-            deadline = Clock(hours, minutes)
+        Returns
+        -------
+            Tuple[IntTable[Package], ConstraintIndex]
+                The mapping of package identifiers to package objects, and the index of their
+                delivery restrictions.
+
+        Space Complexity
+        ---------------
+            O(n)
 
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        records, strings = BinaryCache.load_packages(cls.data_path('data/package_data.json'),
+                                                     cls.compile_groups)
+        size = len(records)
+        # Package identifiers start at 1, so reserve a slot for every identifier up to `size`
+        packages = IntTable(size + 1)
+        constraints = ConstraintIndex()
+
+        for (identifier, zip_code, kg, deadline, street, city, state, required_truck, _, _,
+             available_at, correction, group) in records.tolist():
             package = Package(
                 identifier,
-                value['address'],
-                value['city'],
-                value['state'],
-                value['zip'],
-                value['kg'],
-                deadline,
+                strings[street],
+                strings[city],
+                strings[state],
+                strings[zip_code],
+                kg,
+                Clock.from_seconds(deadline),
             )
 
-            # Delayed packages - will not arrive at depot until 09:05
-            if package.id in [6, 25, 28, 32]:
-                package.arrival_time = Clock(9, 5)
+            constraints.add(
+                identifier,
+                required_truck=required_truck or None,
+                available_at=Clock.from_seconds(available_at) if available_at >= 0 else None,
+                corrected_street=strings[correction] if correction >= 0 else None,
+                peers=(group,) if group >= 0 else (),
+            )
+            packages.set(identifier, package)
 
-            # Incorrect address - will be corrected at 10:20
-            if package.id == 9:
-                package.street = '410 S State St'
-                package.arrival_time = Clock(10, 20)
+        cls.apply_constraints(packages, constraints)
+        cls.get_distances().resolve(packages.values())
+        return packages, constraints
 
-            # Package must be delivered via truck two
-            if package.id in [3, 18, 36, 38]:
-                package.deliverable_by = [2]
-                package.is_priority = True
+    @classmethod
+    def compile_groups(cls, data: Mapping[str, Mapping[str, Any]]) -> IntTable[int]:
+        """Resolves the co-delivery groups listed in the `peers` fields of the package data
+        with a `ConstraintIndex`, the same index that holds the groups of loaded packages.
 
-            # Package must be delivered with linked packages
-            if package.id in [13, 14, 15, 16, 19, 20]:
-                package.linked = True
-                package.is_priority = True
+        Parameters
+        ----------
+            data : Mapping[str, Mapping[str, Any]]
+                The parsed package data.
 
-            packages.set(identifier, package)
+        Returns
+        -------
+            IntTable[int]
+                The mapping of each linked package identifier to the representative of its group.
 
-        return packages
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n*α(n))
+        """
+        constraints = ConstraintIndex()
+        for value in data.values():
+            constraints.add(value['id'], peers=[int(peer) for peer in value.get('peers') or []])
+
+        groups = IntTable[int]()
+        for identifier in constraints.parents.keys():
+            groups.set(identifier, constraints.find(identifier))
+        return groups
 
     @classmethod
-    def get_distances(cls) -> Distances:
+    def load_manifest(cls, filename: str
+                      ) -> Tuple[Packages, ConstraintIndex, List[ManifestError]]:
+        """Streams packages from a CSV or JSON Lines manifest. Rows are turned into packages
+        one at a time, so no intermediate copy of the manifest is held in memory. Invalid rows
+        are skipped and returned alongside the packages, in line order, rather than aborting the
+        load.
+
+        Delivery restrictions are read from the optional `required_truck`, `available_at`,
+        `corrected_address` and `peers` fields of each row. Rows whose street is not in the
+        distance table, or whose identifier was already listed by an accepted row, are skipped,
+        and skipped packages are left out of every co-delivery group.
+
+        Parameters
+        ----------
+            filename : str
+                The path of the manifest.
+
+        Returns
+        -------
+            Tuple[IntTable[Package], ConstraintIndex, List[ManifestError]]
+                The mapping of package identifiers to package objects, the index of their
+                delivery restrictions and the skipped rows.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        reader = ManifestReader(filename)
+        packages = IntTable()
+        constraints = ConstraintIndex()
+        lines = IntTable[int]()
+        distances = cls.get_distances()
+
+        for line, row, package in reader.packages():
+            first_line = lines.get(package.id)
+            if first_line is not None:
+                reader.errors.append(ManifestError(
+                    line, f'Duplicate package id {package.id}, first listed on line {first_line}'))
+                continue
+
+            try:
+                restrictions = ConstraintIndex.parse_row(row)
+            except ValueError as error:
+                reader.errors.append(ManifestError(line, str(error)))
+                continue
+
+            # Streets are checked after corrections, which replace the listed street
+            street = restrictions['corrected_street'] or package.street
+            if street not in distances:
+                reader.errors.append(ManifestError(line, f'Unknown address: {street}'))
+                continue
+
+            # Only rows that pass every check claim their identifier and restrictions
+            lines.set(package.id, line)
+            constraints.add(package.id, **restrictions)
+            packages.set(package.id, package)
+
+        # Rejected rows and peers that were never listed must not remain in any group
+        for identifier in constraints.parents.keys() + constraints.required_trucks.keys() + \
+                constraints.available_at.keys() + constraints.corrections.keys():
+            if identifier not in packages:
+                constraints.discard(identifier)
+
+        cls.apply_constraints(packages, constraints)
+        distances.resolve(packages.values())
+
+        return packages, constraints, reader.errors
+
+    @classmethod
+    def apply_constraints(cls, packages: Packages, constraints: ConstraintIndex) -> None:
+        """Completes the co-delivery groups of an index and applies its restrictions to every
+        package.
+
+        Parameters
+        ----------
+            packages : IntTable[Package]
+                The packages to update.
+            constraints : ConstraintIndex
+                The index of package delivery restrictions.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        constraints.finalize()
+        for package in packages.values():
+            constraints.apply(package)
+
+    @classmethod
+    def get_distances(cls) -> DistanceTable:
         """Attempts to retrieve the distances from the cache. Loads the distance data from a file
         if it is not present in the cache.
 
         Returns
         -------
-            HashSet[str, HashSet[str, str]]
-                The mapping of from and to addresses and the corresponding distance between them.
+            DistanceTable
+                The table of distances between addresses.
 
         Space Complexity
         ---------------
@@ -155,13 +335,17 @@ class DataLoader:
         return cls.cache.get('distances')
 
     @classmethod
-    def load_distances(cls) -> Distances:
-        """Loads the distance data from a file.
+    def load_distances(cls) -> DistanceTable:
+        """Loads the distance data from the binary cache of the distance data file, compiling
+        the cache first if needed. The cached matrix, or the cached triangle when
+        `compact_distances` is set, backs the table directly. When `closed_distances` is set
+        the closed matrix is loaded from its own cache, and quantized in memory if
+        `compact_distances` is also set.
 
         Returns
         -------
-            HashSet[str, HashSet[str, str]]
-                The mapping of from and to addresses and the corresponding distance between them.
+            DistanceTable
+                The table of distances between addresses.
 
         Space Complexity
         ---------------
@@ -171,18 +355,51 @@ class DataLoader:
         ---------------
             O(n)
         """
-        data = cls.load_json('data/distance_data.json')
-        size = len(data)
-        distances = HashSet(size)
+        source = cls.data_path('data/distance_data.json')
 
-        for from_address, destinations in data.items():
-            if from_address not in distances:
-                distances.set(from_address, HashSet(size))
+        if cls.closed_distances:
+            return cls.load_edge_list(source)
 
-            for to_address, miles in destinations.items():
-                distances.get(from_address).set(to_address, miles)
+        if cls.compact_distances:
+            return TriangularDistanceTable(*BinaryCache.load_triangle(source))
 
-        return distances
+        return DistanceTable(*BinaryCache.load_distances(source))
+
+    @classmethod
+    def load_edge_list(cls, filename: str) -> DistanceTable:
+        """Loads distances closed under shortest paths from a CSV list of road segments with
+        `from`, `to` and `miles` columns, or from a JSON distance data file. The closed matrix
+        is cached beside the source, so validation and closure only run when it changes.
+
+        Parameters
+        ----------
+            filename : str
+                The path of the edge list or distance data file.
+
+        Returns
+        -------
+            DistanceTable
+                The table of shortest path distances between addresses.
+
+        Raises
+        ------
+            DistanceError
+                The distance data is invalid or leaves some address unreachable.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n) on a cache hit, O(n^3) otherwise
+        """
+        addresses, matrix = BinaryCache.load_closed(filename)
+
+        if cls.compact_distances:
+            return TriangularDistanceTable.from_matrix(addresses, matrix)
+
+        return DistanceTable(addresses, matrix)
 
     @classmethod
     def get_prompts(cls) -> Prompts:
@@ -225,10 +442,4 @@ class DataLoader:
             O(n)
         """
         data = cls.load_json('data/prompts.json')
-        size = len(data)
-        prompts = HashSet(size)
-
-        for key, value in data.items():
-            prompts.set(key, value)
-
-        return prompts
+        return HashSet.from_items(data, len(data))
@@ -0,0 +1,316 @@
+from csv import DictReader
+from typing import Any, Iterable, List, Mapping, TextIO, Tuple
+
+import numpy as np
+
+Edge = Tuple[str, str, float]
+
+
+class DistanceError(ValueError):
+    """An error raised for distance data that cannot be used for routing.
+
+    Attributes
+    ----------
+        from_address : str
+            The starting address of the offending distance, if any.
+        to_address : str
+            The ending address of the offending distance, if any.
+        reason : str
+            A description of the problem.
+    """
+
+    from_address: str
+    to_address: str
+    reason: str
+
+    def __init__(self, reason: str, from_address: str = '', to_address: str = '') -> None:
+        location = f' ({from_address} -> {to_address})' if from_address or to_address else ''
+        super().__init__(f'{reason}{location}')
+        self.from_address = from_address
+        self.to_address = to_address
+        self.reason = reason
+
+
+class DistancePreprocessor:
+    """A class which validates distance data and closes it under shortest paths. The source
+    data lists direct legs, and a direct leg is not always the shortest way between two
+    addresses. Once closed, every distance is the length of the shortest path through any
+    intermediate addresses, so the matrix obeys the triangle inequality.
+
+    Distances may be given either as a complete matrix or as a sparse list of road segments,
+    in which case pairs without a segment are reached through the closure.
+
+    Class Attributes
+    ----------------
+        TOLERANCE : float
+            The largest difference in miles at which two distances are considered equal.
+        EDGE_FIELDS : Tuple[str, ...]
+            The columns every edge list must provide.
+    """
+
+    TOLERANCE = 1e-9
+    EDGE_FIELDS = ('from', 'to', 'miles')
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Mapping[str, Any]]
+                     ) -> Tuple[List[str], np.ndarray]:
+        """Builds a matrix from nested distance data. Missing distances are stored as NaN
+        so that `validate` can report them.
+
+        Parameters
+        ----------
+            data : Mapping[str, Mapping[str, Any]]
+                The distance from each address to every other address.
+
+        Returns
+        -------
+            Tuple[List[str], np.ndarray]
+                The addresses and the matrix in which `matrix[i, j]` is the distance in miles
+                from `addresses[i]` to `addresses[j]`.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^2)
+        """
+        addresses = list(data.keys())
+        matrix = np.full((len(addresses), len(addresses)), np.nan)
+
+        for i, from_address in enumerate(addresses):
+            row = data[from_address]
+            for j, to_address in enumerate(addresses):
+                if to_address in row:
+                    matrix[i, j] = float(row[to_address])
+
+        return addresses, matrix
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Edge], symmetric: bool = True
+                   ) -> Tuple[List[str], np.ndarray]:
+        """Builds a matrix from a list of road segments. Addresses are numbered in the order
+        they first appear, pairs without a segment are stored as infinity and the shortest of
+        repeated segments is kept.
+
+        Parameters
+        ----------
+            edges : Iterable[Tuple[str, str, float]]
+                The (from address, to address, miles) segments.
+            symmetric : bool
+                Whether each segment may also be driven in the opposite direction.
+
+        Returns
+        -------
+            Tuple[List[str], np.ndarray]
+                The addresses and the matrix.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^2 + e)
+        """
+        addresses: List[str] = []
+        positions = {}
+        segments = []
+
+        for from_address, to_address, miles in edges:
+            for address in (from_address, to_address):
+                if address not in positions:
+                    positions[address] = len(addresses)
+                    addresses.append(address)
+            segments.append((positions[from_address], positions[to_address], float(miles)))
+
+        matrix = np.full((len(addresses), len(addresses)), np.inf)
+        np.fill_diagonal(matrix, 0.0)
+
+        if segments:
+            rows, columns, miles = (np.array(values) for values in zip(*segments))
+            rows, columns = rows.astype(np.int64), columns.astype(np.int64)
+            np.minimum.at(matrix, (rows, columns), miles)
+            if symmetric:
+                np.minimum.at(matrix, (columns, rows), miles)
+
+        return addresses, matrix
+
+    @classmethod
+    def read_edges(cls, file: TextIO) -> List[Edge]:
+        """Reads road segments from a CSV file with `from`, `to` and `miles` columns.
+
+        Parameters
+        ----------
+            file : TextIO
+                The open file.
+
+        Returns
+        -------
+            List[Tuple[str, str, float]]
+                The (from address, to address, miles) segments.
+
+        Raises
+        ------
+            DistanceError
+                A column is missing or a row has an invalid distance.
+
+        Space Complexity
+        ---------------
+            O(e)
+
+        Time Complexity
+        ---------------
+            O(e)
+        """
+        reader = DictReader(file)
+        missing = [field for field in cls.EDGE_FIELDS if field not in (reader.fieldnames or [])]
+        if missing:
+            raise DistanceError(f'The edge list is missing {", ".join(missing)}')
+
+        edges = []
+        for row in reader:
+            from_address, to_address = row['from'].strip(), row['to'].strip()
+            try:
+                miles = float(row['miles'])
+            except (TypeError, ValueError):
+                raise DistanceError(f'Invalid distance on line {reader.line_num}',
+                                    from_address, to_address)
+            edges.append((from_address, to_address, miles))
+
+        return edges
+
+    @classmethod
+    def validate(cls, addresses: List[str], matrix: np.ndarray,
+                 symmetric: bool = True) -> List[DistanceError]:
+        """Checks that a matrix can be closed. The matrix must be square with one row per
+        unique address, every distance must be present and non-negative and every address
+        must be zero miles from itself. For symmetric data the distance each way between two
+        addresses must also agree. Infinite distances mark pairs without a direct leg and are
+        allowed.
+
+        Parameters
+        ----------
+            addresses : List[str]
+                The addresses in matrix order.
+            matrix : np.ndarray
+                The matrix.
+            symmetric : bool
+                Whether the distance between two addresses is the same in both directions.
+
+        Returns
+        -------
+            List[DistanceError]
+                The problems found, or an empty list if the matrix is valid.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^2)
+        """
+        size = len(addresses)
+        if matrix.shape != (size, size):
+            return [DistanceError(f'Expected a {size}x{size} matrix, got {matrix.shape}')]
+
+        errors = []
+        if len(set(addresses)) != size:
+            errors.append(DistanceError('The addresses are not unique'))
+
+        def report(reason: str, mask: np.ndarray) -> None:
+            for i, j in np.argwhere(mask).tolist():
+                errors.append(DistanceError(reason, addresses[i], addresses[j]))
+
+        report('Missing distance', np.isnan(matrix))
+        report('Negative distance', matrix < 0)
+
+        diagonal = np.zeros_like(matrix, dtype=bool)
+        np.fill_diagonal(diagonal, np.diagonal(matrix) != 0)
+        report('Nonzero distance from an address to itself', diagonal)
+
+        with np.errstate(invalid='ignore'):
+            difference = np.abs(matrix - matrix.T)
+        if symmetric:
+            report('Distance differs by direction',
+                   np.triu(~np.isnan(difference) & (difference > cls.TOLERANCE), 1))
+
+        return errors
+
+    @classmethod
+    def close(cls, matrix: np.ndarray) -> np.ndarray:
+        """Computes the shortest path between every pair of addresses with the Floyd-Warshall
+        algorithm. Each intermediate address relaxes the whole matrix in one vectorized step,
+        so the loop runs once per address rather than once per triple.
+
+        Parameters
+        ----------
+            matrix : np.ndarray
+                The matrix of direct legs. It is not modified.
+
+        Returns
+        -------
+            np.ndarray
+                The matrix of shortest path distances.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^3)
+        """
+        closed = np.array(matrix, dtype=np.float64)
+        for via in range(len(closed)):
+            np.minimum(closed, closed[:, via, None] + closed[None, via, :], out=closed)
+
+        return closed
+
+    @classmethod
+    def prepare(cls, addresses: List[str], matrix: np.ndarray,
+                symmetric: bool = True) -> np.ndarray:
+        """Validates a matrix and closes it under shortest paths.
+
+        Parameters
+        ----------
+            addresses : List[str]
+                The addresses in matrix order.
+            matrix : np.ndarray
+                The matrix of direct legs.
+            symmetric : bool
+                Whether the distance between two addresses is the same in both directions.
+
+        Returns
+        -------
+            np.ndarray
+                The matrix of shortest path distances.
+
+        Raises
+        ------
+            DistanceError
+                The matrix is invalid, or some address cannot be reached from another. The
+                first problem found is raised.
+
+        Space Complexity
+        ---------------
+            O(n^2)
+
+        Time Complexity
+        ---------------
+            O(n^3)
+        """
+        errors = cls.validate(addresses, matrix, symmetric)
+        if errors:
+            raise errors[0]
+
+        closed = cls.close(matrix)
+
+        unreachable = np.argwhere(np.isinf(closed))
+        if len(unreachable):
+            i, j = unreachable[0].tolist()
+            raise DistanceError('No path between addresses', addresses[i], addresses[j])
+
+        return closed
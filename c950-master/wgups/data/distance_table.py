@@ -1,26 +1,158 @@
-from wgups.structures.hash_set import HashSet
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
 
-Distances = HashSet[str, HashSet[str, float]]
+from wgups.routing.package import Package
+from wgups.structures.hash_set import HashSet
 
 
 class DistanceTable:
     """A class which represents a table of the distances between destinations
     serviced by the WGUPS.
 
+    Distances are stored in a dense matrix in which `matrix[i, j]` is the distance in miles
+    from the address with index `i` to the address with index `j`. Each address is interned
+    once into an index, so a lookup by index reads the matrix directly and a lookup by address
+    costs one hash probe per address. Whole rows can be read as vectors for bulk comparisons.
+
     Attributes
     ----------
         depot_address : str
             The address of the WGUPS depot.
-        distances : HashSet[str, HashSet[str, float]]
-            The underlying data structure which stores the distances between all
-            destinations services by the WGUPS.
+        addresses : List[str]
+            The address of each index of the matrix.
+        indices : HashSet[str, int]
+            The index of each address.
+        matrix : np.ndarray
+            The dense matrix of distances between all destinations serviced by the WGUPS.
+        depot_index : int
+            The index of the depot address.
+        neighbor_count : int
+            The number of nearest neighbors listed for each address.
+        neighbors : Optional[List[List[int]]]
+            The nearest neighbors of each address, closest first. Built on first use.
     """
 
     depot_address = '4001 South 700 East'
-    distances: Distances
+    neighbor_count = 32
+    addresses: List[str]
+    indices: HashSet[str, int]
+    matrix: np.ndarray
+    depot_index: int
+    neighbors: Optional[List[List[int]]]
+
+    def __init__(self, addresses: List[str], matrix: np.ndarray) -> None:
+        if matrix.shape != (len(addresses), len(addresses)):
+            raise ValueError(
+                f'Expected a {len(addresses)}x{len(addresses)} matrix, got {matrix.shape}.')
+
+        self.matrix = matrix
+        self.intern(addresses)
+
+    def intern(self, addresses: List[str]) -> None:
+        """Assigns each address the index of its position in the list.
+
+        Parameters
+        ----------
+            addresses : List[str]
+                The addresses in matrix order.
+
+        Raises
+        ------
+            KeyError
+                The depot address is not one of the addresses.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        self.addresses = addresses
+        self.indices = HashSet.from_parallel(addresses, range(len(addresses)))
+        self.depot_index = self.index(self.depot_address)
+        self.neighbors = None
 
-    def __init__(self, distances: Distances) -> None:
-        self.distances = distances
+    def index(self, address: str) -> int:
+        """Determines the index of an address.
+
+        Parameters
+        ----------
+            address : str
+                The address.
+
+        Returns
+        -------
+            int
+                The index of the address in the matrix.
+
+        Raises
+        ------
+            KeyError
+                The `address` was not found in the distance table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        index = self.indices.get(address)
+        if index is None:
+            raise KeyError(f'The address {address} was not found in the city map.')
+
+        return index
+
+    def resolve(self, packages: Iterable[Package]) -> None:
+        """Resolves the destination street of each package to its node in the table.
+
+        Parameters
+        ----------
+            packages : Iterable[Package]
+                The packages to resolve.
+
+        Raises
+        ------
+            KeyError
+                The street of a package was not found in the distance table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        for package in packages:
+            package.node = self.index(package.street)
+
+    def address(self, index: int) -> str:
+        """Determines the address of an index.
+
+        Parameters
+        ----------
+            index : int
+                The index of the address in the matrix.
+
+        Returns
+        -------
+            str
+                The address.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.addresses[index]
 
     def distance(self, from_address: str, to_address: str) -> float:
         """Determines the distances between two destinations.
@@ -44,21 +176,38 @@ class DistanceTable:
 
         Space Complexity
         ---------------
-            O(n)
+            O(1)
 
         Time Complexity
         ---------------
-            O(n)
+            O(1)
+        """
+        return self.distance_between(self.index(from_address), self.index(to_address))
+
+    def distance_between(self, from_index: int, to_index: int) -> float:
+        """Determines the distance between two destinations by index.
+
+        Parameters
+        ----------
+            from_index : int
+                The index of the starting address.
+            to_index : int
+                The index of the ending address.
+
+        Returns
+        -------
+            float
+                The distance between the two addresses.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
         """
-        if from_address in self.distances:
-            if to_address in self.distances[from_address]:
-                return self.distances[from_address][to_address]
-            else:
-                raise KeyError(
-                    f'The address {to_address} was not found in the city map.')
-        else:
-            raise KeyError(
-                f'The address {from_address} was not found in the city map.')
+        return self.matrix.item(from_index, to_index)
 
     def to_depot(self, address: str) -> float:
         """Determines the distance between the specified address and the depot.
@@ -80,10 +229,165 @@ class DistanceTable:
 
         Space Complexity
         ---------------
-            O(n)
+            O(1)
 
         Time Complexity
         ---------------
-            O(n)
+            O(1)
+        """
+        return self.distance_between(self.depot_index, self.index(address))
+
+    def row(self, address: str) -> np.ndarray:
+        """Returns the distances from an address to every address in the table, in index
+        order. The row is a read-only view of the matrix rather than a copy.
+
+        Parameters
+        ----------
+            address : str
+                The address.
+
+        Returns
+        -------
+            np.ndarray
+                The distances from the address.
+
+        Raises
+        ------
+            KeyError
+                The `address` was not found in the distance table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
         """
-        return self.distance(self.depot_address, address)
+        return self.row_at(self.index(address))
+
+    def row_at(self, index: int) -> np.ndarray:
+        """Returns the distances from an address to every address in the table by index.
+
+        Parameters
+        ----------
+            index : int
+                The index of the address.
+
+        Returns
+        -------
+            np.ndarray
+                The distances from the address.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        row = self.matrix[index]
+        row.flags.writeable = False
+        return row
+
+    def build_neighbors(self) -> None:
+        """Lists the `neighbor_count` nearest addresses of every address, closest first. An
+        address is its own nearest neighbor, and ties are broken by index. Rows are handled one
+        at a time, so only the lists themselves are held in memory.
+
+        Space Complexity
+        ---------------
+            O(n*k)
+
+        Time Complexity
+        ---------------
+            O(n^2 + n*k*log(k))
+        """
+        size = len(self.addresses)
+        count = min(self.neighbor_count, size)
+        neighbors = np.empty((size, count), dtype=np.int64)
+
+        for index in range(size):
+            row = self.row_at(index)
+            candidates = np.argpartition(row, count - 1)[:count] if count < size \
+                else np.arange(size)
+            neighbors[index] = candidates[np.lexsort((candidates, row[candidates]))]
+
+        self.neighbors = neighbors.tolist()
+
+    def neighbors_of(self, index: int) -> List[int]:
+        """Returns the `neighbor_count` nearest addresses of an address, closest first. The
+        lists of every address are built on first use.
+
+        Parameters
+        ----------
+            index : int
+                The index of the address.
+
+        Returns
+        -------
+            List[int]
+                The indices of the nearest addresses, starting with the address itself.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1), after building the lists once
+        """
+        if self.neighbors is None:
+            self.build_neighbors()
+
+        return self.neighbors[index]
+
+    def submatrix(self, nodes: Sequence[int]) -> np.ndarray:
+        """Returns the distances between a subset of addresses as a new, writable matrix in
+        which entry `[i, j]` is the distance from `nodes[i]` to `nodes[j]`.
+
+        Parameters
+        ----------
+            nodes : Sequence[int]
+                The indices of the addresses.
+
+        Returns
+        -------
+            np.ndarray
+                The distances between the addresses.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(m^2)
+        """
+        nodes = np.asarray(nodes, dtype=np.int64)
+        return self.matrix[np.ix_(nodes, nodes)]
+
+    def to_depot_vector(self) -> np.ndarray:
+        """Returns the distances from the depot to every address in the table, in index order.
+
+        Returns
+        -------
+            np.ndarray
+                The distances from the depot.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.row_at(self.depot_index)
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self.indices
@@ -0,0 +1,196 @@
+from csv import DictReader
+from json import JSONDecodeError, loads
+from os import path
+from typing import Any, Generator, List, Mapping, Optional, Tuple
+
+from wgups.routing.package import Package
+from wgups.structures.clock import Clock
+
+Row = Tuple[int, Mapping[str, Any]]
+
+
+class ManifestError(ValueError):
+    """An error raised for a manifest row that cannot be turned into a package.
+
+    Attributes
+    ----------
+        line : int
+            The line of the manifest on which the row starts.
+        reason : str
+            A description of the problem.
+    """
+
+    line: int
+    reason: str
+
+    def __init__(self, line: int, reason: str) -> None:
+        super().__init__(f'Line {line}: {reason}')
+        self.line = line
+        self.reason = reason
+
+
+class ManifestReader:
+    """A class which streams packages from a CSV or JSON Lines manifest. Rows are read and
+    turned into packages one at a time, so memory use does not grow with the size of the
+    manifest. Rows that cannot be turned into packages are recorded in `errors` and skipped.
+
+    Each row holds the same fields as an entry of `package_data.json`: `id`, `address`,
+    `city`, `state`, `zip`, `kg` and `deadline`, where a deadline of `EOD` means 17:00.
+
+    Attributes
+    ----------
+        REQUIRED_FIELDS : Tuple[str, ...]
+            The fields every row must provide.
+        FORMATS : Mapping[str, str]
+            The manifest format for each recognized file extension.
+        filename : str
+            The path of the manifest.
+        format : str
+            The manifest format, either `csv` or `jsonl`.
+        errors : List[ManifestError]
+            The rows that were skipped, in the order they were read.
+    """
+
+    REQUIRED_FIELDS = ('id', 'address', 'city', 'state', 'zip', 'kg', 'deadline')
+    FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+
+    filename: str
+    format: str
+    errors: List[ManifestError]
+
+    def __init__(self, filename: str, format: Optional[str] = None) -> None:
+        self.filename = filename
+        self.errors = []
+
+        if format is None:
+            extension = path.splitext(filename)[1].lower()
+            if extension not in self.FORMATS:
+                raise ValueError(f'Unable to determine the manifest format of {filename}')
+            format = self.FORMATS[extension]
+
+        if format not in ('csv', 'jsonl'):
+            raise ValueError(f'Unsupported manifest format: {format}')
+
+        self.format = format
+
+    def rows(self) -> Generator[Row, None, None]:
+        """Yields each row of the manifest alongside the line it starts on. Lines of a JSON
+        Lines manifest that are not JSON objects are recorded as errors.
+
+        Returns
+        -------
+            Generator[Tuple[int, Mapping[str, Any]], None, None]
+                The (line, row) pairs.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        with open(self.filename, 'r', newline='') as file:
+            if self.format == 'csv':
+                reader = DictReader(file)
+                # Read the header so that line numbers start at the first row
+                reader.fieldnames
+                line = reader.line_num
+                for row in reader:
+                    yield line + 1, row
+                    line = reader.line_num
+                return
+
+            for line, text in enumerate(file, 1):
+                if not text.strip():
+                    continue
+                try:
+                    row = loads(text)
+                except JSONDecodeError as error:
+                    self.errors.append(ManifestError(line, f'Invalid JSON: {error.msg}'))
+                    continue
+                if not isinstance(row, dict):
+                    self.errors.append(ManifestError(line, 'Expected a JSON object'))
+                    continue
+                yield line, row
+
+    def packages(self) -> Generator[Tuple[int, Mapping[str, Any], Package], None, None]:
+        """Yields a package for each valid row of the manifest alongside the row itself and
+        the line it starts on.
+
+        Returns
+        -------
+            Generator[Tuple[int, Mapping[str, Any], Package], None, None]
+                The (line, row, package) triples.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        for line, row in self.rows():
+            try:
+                package = self.create_package(line, row)
+            except ManifestError as error:
+                self.errors.append(error)
+                continue
+            yield line, row, package
+
+    @classmethod
+    def create_package(cls, line: int, row: Mapping[str, Any]) -> Package:
+        """Creates a package from a manifest row.
+
+        Parameters
+        ----------
+            line : int
+                The line of the manifest on which the row starts.
+            row : Mapping[str, Any]
+                The row.
+
+        Returns
+        -------
+            Package
+                The package.
+
+        Raises
+        ------
+            ManifestError
+                The row is missing a required field or a field has an invalid value.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        missing = [field for field in cls.REQUIRED_FIELDS
+                   if row.get(field) is None or str(row.get(field)).strip() == '']
+        if missing:
+            raise ManifestError(line, f'Missing {", ".join(missing)}')
+
+        try:
+            identifier = int(row['id'])
+            weight = int(row['kg'])
+        except (TypeError, ValueError):
+            raise ManifestError(line, 'The id and kg fields must be integers')
+
+        deadline = str(row['deadline']).strip()
+        try:
+            deadline = Clock(17) if deadline.upper() == 'EOD' else Clock.from_string(deadline)
+        except ValueError:
+            raise ManifestError(line, f'Invalid deadline: {deadline}')
+
+        return Package(
+            identifier,
+            str(row['address']).strip(),
+            str(row['city']).strip(),
+            str(row['state']).strip(),
+            str(row['zip']).strip(),
+            weight,
+            deadline,
+        )
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from wgups.structures.hash_set import HashSet
+from wgups.structures.int_table import IntTable
 from wgups.routing.package import Package
 
 
@@ -10,13 +10,13 @@ class PackageTable:
 
     Attributes
     ----------
-        packages : HashSet[int, Package]
+        packages : IntTable[Package]
             The underlying data structure which stores packages. Maps package ids to package data.
     """
 
-    packages: HashSet[int, Package]
+    packages: IntTable[Package]
 
-    def __init__(self, packages: HashSet[int, Package]) -> None:
+    def __init__(self, packages: IntTable[Package]) -> None:
         self.packages = packages
 
     def get(self, identifier: int) -> Optional[Package]:
@@ -34,11 +34,11 @@ class PackageTable:
 
         Space Complexity
         ---------------
-            O(n)
+            O(1)
 
         Time Complexity
         ---------------
-            O(n)
+            O(1)
         """
         return self.packages.get(identifier)
 
@@ -58,4 +58,4 @@ class PackageTable:
         ---------------
             O(n)
         """
-        return [package for _, package in self.packages]
+        return self.packages.values()
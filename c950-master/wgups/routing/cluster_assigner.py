@@ -0,0 +1,280 @@
+from math import ceil
+from typing import List, Sequence
+
+import numpy as np
+
+from wgups.data.distance_table import DistanceTable
+from wgups.routing.package import Package
+from wgups.structures.int_table import IntTable
+
+
+class ClusterAssigner:
+    """A class which chooses geographically compact truckloads using capacity-bounded
+    k-medoids over the distance matrix. Each time a truck is loaded, the most urgent units it
+    may deliver at that time are clustered into groups of at most one truckload, and the group
+    holding the most urgent unit is loaded. Only considering packages the truck may take
+    keeps truck restrictions and arrival times satisfied, and keeping each route to a small
+    area shortens it and the problem the route planner has to solve.
+
+    Units are the packages the depot loads together, so a co-delivery group is a single unit
+    and is never split. Units are clustered:
+
+    - Medoids start at the stop farthest from the depot and then, one at a time, at the stop
+      farthest from every medoid chosen so far.
+    - Units are assigned in order of regret, the extra distance to their second nearest
+      medoid, to the nearest medoid whose group still has room.
+    - Each medoid moves to the stop of its group closest to the other units in total.
+
+    The last two steps repeat until no unit changes group. Deadlines come first: urgent units,
+    those with a deadline before the end of the day, are assigned before the others, and the
+    truck loads the urgent units of the chosen group, then every other urgent unit that fits,
+    and only then regular units, those of the chosen group first. Trucks still leave full,
+    and a unit is always loaded whole.
+
+    Attributes
+    ----------
+        max_iterations : int
+            The largest number of assignment and update rounds per load.
+        window : int
+            The number of truckloads of the most urgent packages considered per load.
+    """
+
+    max_iterations: int
+    window: int
+
+    def __init__(self, max_iterations: int = 10, window: int = 4) -> None:
+        self.max_iterations = max_iterations
+        self.window = window
+
+    def select(self, distance_table: DistanceTable, candidates: Sequence[List[Package]],
+               capacity: int) -> List[Package]:
+        """Chooses the load of a truck from the units it may deliver. The candidates are
+        clustered into groups of at most `capacity` packages, and the group of the first
+        candidate is chosen. Urgent units are loaded before regular ones, and within each, the
+        units of the chosen group before the others.
+
+        A unit is loaded whole or not at all: units that would overflow the truck are skipped.
+
+        Parameters
+        ----------
+            distance_table : DistanceTable
+                The distances between addresses.
+            candidates : Sequence[List[Package]]
+                The units the truck may deliver, most urgent first.
+            capacity : int
+                The number of packages the truck can carry.
+
+        Returns
+        -------
+            List[Package]
+                The packages to load, urgent units first, each in the order of the
+                candidates.
+
+        Space Complexity
+        ---------------
+            O(u*m + m^2)
+
+        Time Complexity
+        ---------------
+            O(i*(u*k*log(k) + u*m)) for i rounds, u units, k groups and m stops
+        """
+        units = list(candidates)
+        if sum(len(unit) for unit in units) <= capacity:
+            return [package for unit in units for package in unit]
+
+        groups = self.cluster(distance_table, units, capacity)
+        chosen = next(group for group in groups if any(unit is units[0] for unit in group))
+        selected = set(id(unit) for unit in chosen)
+
+        load = []
+        for urgent, wanted in ((True, True), (True, False), (False, True), (False, False)):
+            for unit in units:
+                if self.is_urgent(unit) is urgent and (id(unit) in selected) is wanted \
+                        and len(load) + len(unit) <= capacity:
+                    load.extend(unit)
+
+        return load
+
+    @classmethod
+    def is_urgent(cls, unit: List[Package]) -> bool:
+        """Determines if a unit has a deadline before the end of the day.
+
+        Parameters
+        ----------
+            unit : List[Package]
+                The packages of the unit.
+
+        Returns
+        -------
+            bool
+                Returns `True` if any package of the unit is high priority, otherwise returns
+                `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(u)
+        """
+        return any(package.is_high_priority() for package in unit)
+
+    def cluster(self, distance_table: DistanceTable, units: List[List[Package]],
+                capacity: int) -> List[List[List[Package]]]:
+        """Clusters units into groups of at most `capacity` packages where possible. A unit
+        that fits in no group joins the group with the most room left.
+
+        Parameters
+        ----------
+            distance_table : DistanceTable
+                The distances between addresses.
+            units : List[List[Package]]
+                The units.
+            capacity : int
+                The number of packages a truck can carry.
+
+        Returns
+        -------
+            List[List[List[Package]]]
+                The units of each non-empty group.
+
+        Space Complexity
+        ---------------
+            O(u*m + m^2)
+
+        Time Complexity
+        ---------------
+            O(i*(u*k*log(k) + u*m))
+        """
+        sizes = np.array([len(unit) for unit in units], dtype=np.int64)
+        urgent = np.array([self.is_urgent(unit) for unit in units], dtype=bool)
+        count = ceil(int(sizes.sum()) / capacity)
+        if count <= 1:
+            return [units]
+
+        # Every stop of the units, and the distance from each unit to each stop, where a
+        # unit with several stops is as close as its closest stop
+        nodes = sorted({package.node for unit in units for package in unit})
+        columns = IntTable()
+        for column, node in enumerate(nodes):
+            columns.set(node, column)
+        distances = distance_table.submatrix(nodes)
+
+        unit_columns = [np.array(sorted({columns.get(package.node) for package in unit}))
+                        for unit in units]
+        starts = np.cumsum([0] + [len(unit) for unit in unit_columns[:-1]])
+        costs = np.minimum.reduceat(distances[np.concatenate(unit_columns)], starts, axis=0)
+
+        medoids = self.initial_medoids(distance_table, nodes, distances, count)
+        labels = None
+
+        for _ in range(self.max_iterations):
+            assigned = self.assign_units(costs[:, medoids], sizes, urgent, capacity)
+            if labels is not None and np.array_equal(assigned, labels):
+                break
+            labels = assigned
+
+            for group in range(count):
+                members = np.flatnonzero(labels == group)
+                if len(members) == 0:
+                    continue
+                candidates = np.unique(np.concatenate([unit_columns[member]
+                                                       for member in members]))
+                totals = (costs[np.ix_(members, candidates)] * sizes[members, None]).sum(axis=0)
+                medoids[group] = int(candidates[np.argmin(totals)])
+
+        return [[units[member] for member in np.flatnonzero(labels == group)]
+                for group in range(count) if np.any(labels == group)]
+
+    @classmethod
+    def initial_medoids(cls, distance_table: DistanceTable, nodes: List[int],
+                        distances: np.ndarray, count: int) -> List[int]:
+        """Chooses the first medoids by farthest-first traversal from the depot.
+
+        Parameters
+        ----------
+            distance_table : DistanceTable
+                The distances between addresses.
+            nodes : List[int]
+                The stops of the units.
+            distances : np.ndarray
+                The distances between the stops.
+            count : int
+                The number of medoids.
+
+        Returns
+        -------
+            List[int]
+                The positions of the medoids in `nodes`.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(k*m)
+        """
+        nearest = distance_table.to_depot_vector()[nodes].astype(np.float64)
+        medoids = []
+        for _ in range(min(count, len(nodes))):
+            medoid = int(np.argmax(nearest))
+            medoids.append(medoid)
+            nearest = np.minimum(nearest, distances[medoid])
+            nearest[medoids] = -1
+
+        # Units with fewer stops than groups reuse stops as medoids
+        while len(medoids) < count:
+            medoids.append(medoids[len(medoids) % len(nodes)])
+
+        return medoids
+
+    @classmethod
+    def assign_units(cls, costs: np.ndarray, sizes: np.ndarray, urgent: np.ndarray,
+                     capacity: int) -> np.ndarray:
+        """Assigns each unit to the nearest group with room for it. Urgent units are
+        assigned first, and among them and among the rest, units with the most to lose from
+        not getting their nearest group go first. A unit that fits in no group joins the group
+        with the most room left.
+
+        Parameters
+        ----------
+            costs : np.ndarray
+                The distance from each unit to each medoid.
+            sizes : np.ndarray
+                The number of packages in each unit.
+            urgent : np.ndarray
+                Whether each unit has a deadline before the end of the day.
+            capacity : int
+                The number of packages a group may hold.
+
+        Returns
+        -------
+            np.ndarray
+                The group of each unit.
+
+        Space Complexity
+        ---------------
+            O(u*k)
+
+        Time Complexity
+        ---------------
+            O(u*k*log(k))
+        """
+        units, count = costs.shape
+        preferences = np.argsort(costs, axis=1, kind='stable')
+        ordered = np.take_along_axis(costs, preferences, axis=1)
+        regret = ordered[:, 1] - ordered[:, 0]
+        order = np.lexsort((np.arange(units), -regret, ~urgent))
+
+        room = np.full(count, capacity, dtype=np.int64)
+        labels = np.empty(units, dtype=np.int64)
+        for unit in order.tolist():
+            size = sizes.item(unit)
+            group = next((group for group in preferences[unit].tolist()
+                          if room.item(group) >= size), int(np.argmax(room)))
+            labels[unit] = group
+            room[group] -= size
+
+        return labels
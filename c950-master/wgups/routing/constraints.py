@@ -0,0 +1,377 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from wgups.routing.package import Package
+from wgups.structures.clock import Clock
+from wgups.structures.int_table import IntTable
+
+
+class ConstraintIndex:
+    """A class which indexes the delivery restrictions of every package by package identifier.
+    The index is built once while loading a manifest, after which each restriction is found
+    with a single O(1) lookup regardless of the size of the manifest.
+
+    Packages that must be delivered together are merged into co-delivery groups with a
+    union-find structure, so listing peers on any member of a group is enough to link the
+    whole group.
+
+    Attributes
+    ----------
+        required_trucks : IntTable[int]
+            The truck that must deliver a package, for packages restricted to one truck.
+        available_at : IntTable[Clock]
+            The time a package becomes available at the depot, for packages that arrive late
+            or whose address is only corrected later in the day.
+        corrections : IntTable[str]
+            The corrected street of packages listed with a wrong address.
+        parents : IntTable[int]
+            The union-find parent of each linked package.
+        groups : IntTable[List[int]]
+            The members of the co-delivery group of each linked package, sorted by identifier.
+        discarded : IntTable[bool]
+            The packages removed from the index, which are left out of every group.
+    """
+
+    required_trucks: IntTable[int]
+    available_at: IntTable[Clock]
+    corrections: IntTable[str]
+    parents: IntTable[int]
+    groups: IntTable[List[int]]
+    discarded: IntTable[bool]
+
+    def __init__(self) -> None:
+        self.required_trucks = IntTable()
+        self.available_at = IntTable()
+        self.corrections = IntTable()
+        self.parents = IntTable()
+        self.groups = IntTable()
+        self.discarded = IntTable()
+
+    def add(self, identifier: int, required_truck: Optional[int] = None,
+            available_at: Optional[Clock] = None, corrected_street: Optional[str] = None,
+            peers: Iterable[int] = ()) -> None:
+        """Adds the restrictions of a package to the index.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+            required_truck : Optional[int]
+                The truck that must deliver the package, if any.
+            available_at : Optional[Clock]
+                The time the package becomes available at the depot, if later than the start
+                of the day.
+            corrected_street : Optional[str]
+                The corrected street of the package, if its listed address is wrong.
+            peers : Iterable[int]
+                The packages that must be delivered together with the package.
+
+        Space Complexity
+        ---------------
+            O(p)
+
+        Time Complexity
+        ---------------
+            O(p)
+        """
+        if required_truck:
+            self.required_trucks.set(identifier, required_truck)
+        if available_at is not None:
+            self.available_at.set(identifier, available_at)
+        if corrected_street:
+            self.corrections.set(identifier, corrected_street)
+        for peer in peers:
+            self.link(identifier, peer)
+
+    def add_row(self, identifier: int, row: Mapping[str, Any]) -> None:
+        """Adds the restrictions listed in a manifest row to the index.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+            row : Mapping[str, Any]
+                The manifest row.
+
+        Raises
+        ------
+            ValueError
+                A restriction field has an invalid value.
+
+        Space Complexity
+        ---------------
+            O(p)
+
+        Time Complexity
+        ---------------
+            O(p)
+        """
+        self.add(identifier, **self.parse_row(row))
+
+    @classmethod
+    def parse_row(cls, row: Mapping[str, Any]) -> Dict[str, Any]:
+        """Reads the restrictions listed in a manifest row without adding them to the index.
+        Recognized fields are `required_truck`, `available_at` (HH:MM), `corrected_address`
+        and `peers`, which may be a list or a string of identifiers separated by commas or
+        semicolons.
+
+        Parameters
+        ----------
+            row : Mapping[str, Any]
+                The manifest row.
+
+        Returns
+        -------
+            Dict[str, Any]
+                The keyword arguments of `add` for the restrictions of the row.
+
+        Raises
+        ------
+            ValueError
+                A restriction field has an invalid value.
+
+        Space Complexity
+        ---------------
+            O(p)
+
+        Time Complexity
+        ---------------
+            O(p)
+        """
+        required_truck = row.get('required_truck')
+        if isinstance(required_truck, str) and required_truck.strip().isdigit():
+            required_truck = int(required_truck)
+        elif required_truck is None or required_truck == '':
+            required_truck = None
+        elif isinstance(required_truck, bool) or not isinstance(required_truck, int):
+            raise ValueError(f'Invalid required truck: {required_truck!r}')
+
+        available_at = row.get('available_at')
+        if isinstance(available_at, str) and available_at.strip():
+            try:
+                available_at = Clock.from_string(available_at.strip())
+            except ValueError:
+                raise ValueError(f'Invalid available_at time: {available_at!r}')
+        elif available_at is None or available_at == '':
+            available_at = None
+        else:
+            raise ValueError(f'The available_at time must be an HH:MM string, '
+                             f'got {available_at!r}')
+
+        corrected_street = row.get('corrected_address')
+        if corrected_street is not None and not isinstance(corrected_street, str):
+            raise ValueError(f'The corrected address must be a string, got {corrected_street!r}')
+
+        peers = row.get('peers') or []
+        if isinstance(peers, str):
+            peers = [peer for peer in peers.replace(';', ',').split(',') if peer.strip()]
+        elif not isinstance(peers, list):
+            raise ValueError(f'The peers must be a list or a string of identifiers, '
+                             f'got {peers!r}')
+
+        try:
+            if any(isinstance(peer, (bool, float)) for peer in peers):
+                raise TypeError
+            peers = [int(peer) for peer in peers]
+        except (TypeError, ValueError):
+            raise ValueError(f'Invalid peers: {row.get("peers")!r}')
+
+        return {
+            'required_truck': required_truck,
+            'available_at': available_at,
+            'corrected_street': corrected_street or None,
+            'peers': peers,
+        }
+
+    def find(self, identifier: int) -> int:
+        """Finds the representative package of the co-delivery group of a package. Paths are
+        halved along the way to keep later searches short.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+
+        Returns
+        -------
+            int
+                The identifier of the representative package.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(α(n)) amortized
+        """
+        parent = self.parents.get(identifier)
+        if parent is None:
+            self.parents.set(identifier, identifier)
+            return identifier
+
+        while parent != identifier:
+            grandparent = self.parents.get(parent)
+            self.parents.set(identifier, grandparent)
+            identifier, parent = grandparent, self.parents.get(grandparent)
+
+        return identifier
+
+    def link(self, first: int, second: int) -> None:
+        """Places two packages in the same co-delivery group.
+
+        Parameters
+        ----------
+            first : int
+                The identifier of the first package.
+            second : int
+                The identifier of the second package.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(α(n)) amortized
+        """
+        first_root = self.find(first)
+        second_root = self.find(second)
+
+        # The smaller identifier becomes the representative so that groups are stable
+        if first_root != second_root:
+            self.parents.set(max(first_root, second_root), min(first_root, second_root))
+
+    def discard(self, identifier: int) -> None:
+        """Removes a package from the index, such as one whose manifest row was rejected. Its
+        restrictions are dropped and it is left out of its co-delivery group, although the
+        packages it linked stay linked. Must be called before `finalize`.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.required_trucks.delete(identifier)
+        self.available_at.delete(identifier)
+        self.corrections.delete(identifier)
+        if identifier in self.parents:
+            self.discarded.set(identifier, True)
+
+    def finalize(self) -> None:
+        """Builds the member list of every co-delivery group. Must be called after the last
+        package has been added and before groups are queried.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        members = IntTable[List[int]]()
+        for identifier in self.parents.keys():
+            if identifier in self.discarded:
+                continue
+            root = self.find(identifier)
+            if root not in members:
+                members.set(root, [])
+            members.get(root).append(identifier)
+
+        # Every member of a group shares the same sorted list
+        for _, group in members:
+            group.sort()
+
+        # A package left alone once the discarded packages are removed is no longer linked
+        self.groups = IntTable()
+        for identifier in self.parents.keys():
+            if identifier not in self.discarded:
+                group = members.get(self.find(identifier))
+                if len(group) > 1:
+                    self.groups.set(identifier, group)
+
+    def group(self, identifier: int) -> List[int]:
+        """Returns the co-delivery group of a package.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+
+        Returns
+        -------
+            List[int]
+                The members of the group, or an empty list if the package is not linked.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.groups.get(identifier) or []
+
+    def required_truck(self, identifier: int) -> Optional[int]:
+        """Returns the truck that must deliver a package.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+
+        Returns
+        -------
+            Optional[int]
+                The truck identifier, or `None` if any truck may deliver the package.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.required_trucks.get(identifier)
+
+    def apply(self, package: Package) -> None:
+        """Copies the indexed corrections and arrival times onto a package. Packages that are
+        restricted to a truck or linked to other packages are given priority, so they are
+        loaded early. The restrictions themselves are enforced by looking them up in the
+        index when loading trucks.
+
+        Parameters
+        ----------
+            package : Package
+                The package to update.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        identifier = package.id
+
+        corrected_street = self.corrections.get(identifier)
+        if corrected_street is not None:
+            package.street = corrected_street
+
+        available_at = self.available_at.get(identifier)
+        if available_at is not None:
+            package.arrival_time = available_at
+
+        if identifier in self.required_trucks or identifier in self.groups:
+            package.is_priority = True
@@ -1,12 +1,22 @@
-from random import randint, sample
-from typing import List, Tuple
+from heapq import heappop, heappush
+from random import Random
+from typing import List, Optional, Tuple
 
 from wgups.data.distance_table import DistanceTable
 from wgups.data.package_table import PackageTable
+from wgups.routing.cluster_assigner import ClusterAssigner
+from wgups.routing.constraints import ConstraintIndex
+from wgups.routing.dispatch_queue import ANY_TRUCK, DispatchQueue
+from wgups.routing.event_log import EventLog
+from wgups.routing.fleet_config import FleetConfig
 from wgups.routing.package import Package
+from wgups.routing.route_engine import RouteEngine
+from wgups.routing.route_planner import RoutePlanner
+from wgups.routing.timeline import Timeline
 from wgups.routing.truck import Truck
 from wgups.structures.clock import Clock
 from wgups.structures.hash_set import HashSet
+from wgups.structures.int_table import IntTable
 
 
 class Depot:
@@ -20,26 +30,73 @@ class Depot:
             the WGUPS.
         package_table : PackageTable
             A table containing the packages that must be delivered by the WGUPS.
+        fleet : FleetConfig
+            The number, capacity, speed and earliest departure times of the trucks.
         trucks : HashSet[int, Truck]
-            A mapping between truck identifiers and trucks.
+            A mapping between truck positions in the fleet and trucks.
+        planner : RoutePlanner
+            Chooses the order in which each truck visits its stops.
+        assigner : Optional[ClusterAssigner]
+            Chooses a compact load for each truck from the packages it may deliver, if any.
+        constraints : ConstraintIndex
+            The truck restrictions and co-delivery groups of the packages.
+        events : EventLog
+            The loading, departures, deliveries and returns of the last delivery day.
+        timeline : Optional[Timeline]
+            The state of every package and truck throughout the last delivery day, or `None`
+            if the packages have not been delivered.
     """
 
     distance_table: DistanceTable
     package_table: PackageTable
+    fleet: FleetConfig
     trucks: HashSet[int, Truck]
+    planner: RoutePlanner
+    assigner: Optional[ClusterAssigner]
+    constraints: ConstraintIndex
+    events: EventLog
+    timeline: Optional[Timeline]
 
-    def __init__(self, distance_table: DistanceTable, package_table: PackageTable) -> None:
+    def __init__(self, distance_table: DistanceTable, package_table: PackageTable,
+                 planner: Optional[RoutePlanner] = None,
+                 fleet: Optional[FleetConfig] = None,
+                 assigner: Optional[ClusterAssigner] = None,
+                 constraints: Optional[ConstraintIndex] = None) -> None:
         self.distance_table = distance_table
         self.package_table = package_table
+        self.planner = planner or RoutePlanner()
+        self.assigner = assigner
+        self.constraints = constraints or ConstraintIndex()
+        # The first truck will leave on time at 08:00, while the second truck will be held
+        # at the depot until the late packages arrive at 09:05
+        self.fleet = fleet or FleetConfig(2, earliest_departures=[Clock(8), Clock(9, 5)])
 
-        self.trucks = HashSet(2)
-        # The first truck will leave on time at 08:00
-        self.trucks.set(0, Truck(1))
-        # The second truck will be held at the depot until the late packages arrive at 09:05
-        self.trucks.set(1, Truck(2))
+        self.trucks = HashSet(HashSet.capacity_for(self.fleet.count))
+        for index in range(self.fleet.count):
+            self.trucks.set(index, Truck(index + 1, self.planner, self.fleet.capacity,
+                                         self.fleet.mph, self.fleet.earliest_departure(index)))
 
-    def deliver_packages(self) -> float:
-        """Returns the total distance traveled by trucks during package delivery.
+        self.events = EventLog()
+        self.timeline = None
+
+    def deliver_packages(self, rng: Optional[Random] = None, jitter: float = 0.0) -> float:
+        """Returns the total distance traveled by trucks during package delivery. Every
+        event of the day is recorded in `events` and indexed by `timeline`.
+
+        Packages are loaded by deadline and distance to the depot, and each co-delivery group
+        is loaded as a whole onto the truck it is restricted to, if any. Given a random number
+        generator, each distance is first scaled by a random factor within `jitter` of 1, which
+        yields a different but reproducible assignment of packages to trucks for each seed.
+        Given an assigner, each truck instead loads the compact group it chooses from the most
+        urgent packages the truck may deliver, unless that group makes more stops late than
+        the greedy load.
+
+        Parameters
+        ----------
+            rng : Optional[Random]
+                The generator used to randomize the loading order, if any.
+            jitter : float
+                The largest fraction by which a distance may be scaled up or down.
 
         Returns
         -------
@@ -48,103 +105,337 @@ class Depot:
 
         Space Complexity
         ---------------
-            O(n^3)
+            O(n)
 
         Time Complexity
         ---------------
-            O(n^3*log(n))
+            O(n*log(n)) to load the trucks, in addition to planning each route
         """
         packages = self.package_table.all()
+        self.events = EventLog()
+        to_depot = self.distance_table.to_depot_vector()
+
+        distances = IntTable[float]()
+        percent = round(jitter * 100)
+        for package in packages:
+            distance = to_depot.item(package.node)
+            if rng is not None:
+                distance *= 1 + rng.randint(-percent, percent) / 100
+            distances.set(package.id, distance)
+
+        # Queue the high and low priority units that must be delivered, ordered by the
+        # earliest deadline (if applicable) and the shortest distance to the depot of their
+        # packages. A unit with any high priority package is high priority
+        high_priority = DispatchQueue()
+        regular_priority = DispatchQueue()
+        for unit in self.units(packages):
+            if len(unit) > self.fleet.capacity:
+                raise ValueError(f'Packages {[package.id for package in unit]} must be '
+                                 f'delivered together but do not fit on one truck.')
+
+            truck_id = self.unit_truck(unit)
+            distance = min(distances.get(package.id) for package in unit)
+            if any(package.is_high_priority() for package in unit):
+                deadline = min(package.deadline.total_seconds for package in unit)
+                high_priority.push(unit, (deadline, distance), truck_id)
+            else:
+                regular_priority.push(unit, (distance,), truck_id)
+
+        # Every truck is first ready to load at its earliest departure time. The schedule
+        # holds (time, truck identifier, truck position) entries, so ties go to the lower truck
+        schedule = []
+        for index, truck in self.trucks:
+            heappush(schedule, (self.fleet.earliest_departure(index), truck.id, index))
 
-        # Obtain separate lists of the high and low priority packages that must be delivered
-        # and sort them by deadline (if applicable) and their distance to the depot
-        high_priority = sorted(
-            [package for package in packages
-             if package.is_high_priority()],
-            key=lambda x: (x.deadline, self.distance_table.to_depot(x.street))
-        )
-        regular_priority = sorted(
-            [package for package in packages
-             if not package.is_high_priority()],
-            key=lambda x: self.distance_table.to_depot(x.street)
-        )
-
-        # Initialize loop parameters
-        trip = 0
-        truck_index = 0
-        delivered = 0
         total_distance = 0
-        departure_times = [Clock(8), Clock(9, 5), Clock(10, 20)]
-
-        # Continue delivering packages while the number of packages that have been delivered
-        # is less than the total number of packages that need to be delivered. The loop will
-        # iterate three times in total given that our truck capacity is 16 and the trucks are
-        # always loaded to capacity
-        while delivered < len(packages):
-            # Obtain the truck and set its departure time
-            truck: Truck = self.trucks.get(truck_index)
-            truck.depart_at(departure_times[trip].clone())
-
-            # Obtain the priority packages that are deliverable by the truck
-            priority_deliveries = [package for package in high_priority
-                                   if truck.can_deliver(package)]
-
-            # Obtain the regular priority packages that are deliverable by the truck
-            regular_deliveries = [package for package in regular_priority
-                                  if truck.can_deliver(package)]
-
-            # First, load all priority deliveries that fit on the truck
-            for package in priority_deliveries:
-                if not truck.is_full() and not truck.has_package(package):
-                    high_priority.remove(package)
-                    truck.load_package(package)
-                    delivered += 1
-
-            # Then, load all regular priority deliveries that fit on the truck
-            for package in regular_deliveries:
-                if not truck.is_full() and not truck.has_package(package):
-                    regular_priority.remove(package)
-                    truck.load_package(package)
-                    delivered += 1
+
+        # Each entry is a truck waiting at the depot. A truck leaves as soon as it can be
+        # filled, otherwise it waits for the next package it may deliver to arrive, unless
+        # waiting would make a package it could take now late. Once no more packages are
+        # coming it leaves with whatever is available, and it retires if there is nothing
+        # left for it to deliver
+        while schedule:
+            time, _, index = heappop(schedule)
+            truck: Truck = self.trucks.get(index)
+            truck.depart_at(time)
+
+            available = high_priority.available(truck.id, time) + \
+                regular_priority.available(truck.id, time)
+            if available < truck.capacity:
+                arrivals = [arrival for arrival in (high_priority.next_arrival(truck.id),
+                                                    regular_priority.next_arrival(truck.id))
+                            if arrival is not None]
+                if arrivals and self.can_wait(truck, min(arrivals),
+                                              high_priority, regular_priority):
+                    heappush(schedule, (min(arrivals), truck.id, index))
+                    continue
+            if available == 0:
+                continue
+
+            # First, load the priority units deliverable by the truck until the next one does
+            # not fit, then load the regular priority units
+            if self.assigner is None:
+                for queue in (high_priority, regular_priority):
+                    while True:
+                        unit = queue.peek(truck.id, truck.departure_time)
+                        if unit is None or not truck.can_load(len(unit)):
+                            break
+                        truck.load_packages(queue.pop(truck.id, truck.departure_time))
+            else:
+                self.load_cluster(truck, high_priority, regular_priority)
 
             # Calculate the total distance traveled by the truck in addition to the
-            # distance to return to the depot, if necessary
-            remaining_packages = len(packages) - delivered
-            return_to_depot = remaining_packages > 0
+            # distance to return to the depot, if packages it may deliver remain to be loaded
+            return_to_depot = high_priority.remaining(truck.id) + \
+                regular_priority.remaining(truck.id) > 0
             total_distance += truck.deliver_packages(
-                self.distance_table, return_to_depot)
+                self.distance_table, return_to_depot, self.events)
 
-            # Increment the trip index and the truck index
-            trip += 1
-            truck_index = trip % len(self.trucks)
+            # The truck can be loaded again as soon as it is back at the depot
+            if return_to_depot:
+                heappush(schedule, (truck.current_time, truck.id, index))
 
+        self.timeline = Timeline(self.events, packages, [truck.id for _, truck in self.trucks])
         return total_distance
 
-    def can_deliver(self, truck: Truck, package: Package) -> bool:
-        """Determines if the specified truck can deliver the specified package.
+    def units(self, packages: List[Package]) -> List[List[Package]]:
+        """Splits packages into the units they are loaded in: each co-delivery group is one
+        unit, ordered by identifier, and every other package is a unit of its own.
+
+        Parameters
+        ----------
+            packages : List[Package]
+                The packages.
+
+        Returns
+        -------
+            List[List[Package]]
+                The units, ordered by their first listed package.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        by_id = IntTable[Package]()
+        for package in packages:
+            by_id.set(package.id, package)
+
+        units = []
+        grouped = IntTable[bool]()
+        for package in packages:
+            if package.id in grouped:
+                continue
+
+            unit = [by_id.get(member) for member in self.constraints.group(package.id)
+                    if member in by_id] or [package]
+            for member in unit:
+                grouped.set(member.id, True)
+            units.append(unit)
+
+        return units
+
+    def unit_truck(self, unit: List[Package]) -> int:
+        """Determines the truck that must deliver a unit of packages.
+
+        Parameters
+        ----------
+            unit : List[Package]
+                The packages.
+
+        Returns
+        -------
+            int
+                The identifier of the truck, or `ANY_TRUCK` if any truck may deliver the unit.
+
+        Raises
+        ------
+            ValueError
+                The packages are restricted to different trucks, or to a truck the fleet does
+                not have.
+
+        Space Complexity
+        ---------------
+            O(u)
+
+        Time Complexity
+        ---------------
+            O(u)
+        """
+        trucks = {self.constraints.required_truck(package.id) for package in unit} - {None}
+        if len(trucks) > 1:
+            raise ValueError(f'Packages {[package.id for package in unit]} must be delivered '
+                             f'together but are restricted to trucks {sorted(trucks)}.')
+
+        truck_id = trucks.pop() if trucks else ANY_TRUCK
+        if truck_id != ANY_TRUCK and not 1 <= truck_id <= self.fleet.count:
+            raise ValueError(f'Packages {[package.id for package in unit]} must be delivered '
+                             f'by truck {truck_id}, but the fleet only has {self.fleet.count} '
+                             f'trucks.')
+
+        return truck_id
+
+    def can_wait(self, truck: Truck, time: Clock, *queues: DispatchQueue) -> bool:
+        """Determines if a truck may wait at the depot until the specified time. It may not if
+        a package it could leave with now would miss its deadline even by driving straight to
+        it at that time.
 
         Parameters
         ----------
             truck : Truck
-                The truck to check.
-            package : Package
-                The package to check.
+                The truck.
+            time : Clock
+                The time the truck would leave instead.
+            queues : DispatchQueue
+                The queues the truck loads from.
 
         Returns
         -------
             bool
-                Returns `True` if the truck can deliver the package, otherwise returns `False`.
+                Returns `True` if waiting makes no package late, otherwise returns `False`.
 
         Space Complexity
         ---------------
-            O(1)
+            O(r) for r packages the truck could leave with
 
         Time Complexity
         ---------------
-            O(1)
+            O(r)
+        """
+        to_depot = self.distance_table.to_depot_vector()
+        for queue in queues:
+            for package in queue.ready_packages(truck.id):
+                arrival = time.total_seconds + truck.travel_time(to_depot.item(package.node)) * 60
+                if arrival > package.deadline.total_seconds:
+                    return False
+
+        return True
+
+    def load_cluster(self, truck: Truck, *queues: DispatchQueue) -> None:
+        """Loads a truck with a compact group of packages chosen by the assigner. The most
+        urgent packages the truck may deliver, up to `assigner.window` truckloads, are taken
+        from the queues in order and clustered, and the units that are not loaded are
+        returned whole to their queues.
+
+        The group is only loaded if its route makes no more stops late than the greedy load,
+        the units each queue would yield in order until the next one does not fit. Otherwise
+        the greedy load is used, so clustering never costs a deadline the greedy loading keeps.
+
+        Parameters
+        ----------
+            truck : Truck
+                The truck, which must be empty.
+            queues : DispatchQueue
+                The queues to load from, most urgent first.
+
+        Space Complexity
+        ---------------
+            O(w*c) for a window of w truckloads of c packages
+
+        Time Complexity
+        ---------------
+            O(w*c*log(n)) in addition to clustering and planning both loads
+        """
+        limit = self.assigner.window * truck.capacity
+        candidates = []
+        count = 0
+        for queue in queues:
+            while count < limit:
+                entry = queue.pop_entry(truck.id, truck.departure_time)
+                if entry is None:
+                    break
+                candidates.append((queue, entry))
+                count += len(entry[2])
+
+        load = self.assigner.select(self.distance_table,
+                                    [unit for _, (_, _, unit) in candidates], truck.capacity)
+
+        greedy = []
+        blocked = set()
+        for queue, (_, _, unit) in candidates:
+            if id(queue) in blocked or len(greedy) + len(unit) > truck.capacity:
+                blocked.add(id(queue))
+            else:
+                greedy.extend(unit)
+
+        if self.late_stops(truck, load) > self.late_stops(truck, greedy):
+            load = greedy
+        loaded = set(id(package) for package in load)
+
+        truck.load_packages(load)
+        for queue, (key, truck_id, unit) in candidates:
+            if id(unit[0]) not in loaded:
+                queue.push(unit, key, truck_id)
+
+    def late_stops(self, truck: Truck, packages: List[Package]) -> int:
+        """Counts the stops a truck would reach after their deadline if it left now with the
+        specified packages, following the route its planner chooses for a round trip.
+
+        Parameters
+        ----------
+            truck : Truck
+                The truck.
+            packages : List[Package]
+                The packages the truck would leave with.
+
+        Returns
+        -------
+            int
+                The number of late stops.
+
+        Space Complexity
+        ---------------
+            O(m^2) for m stops
+
+        Time Complexity
+        ---------------
+            As `RoutePlanner.plan`
+        """
+        if not packages:
+            return 0
+
+        engine = RouteEngine(self.distance_table, packages)
+        order = truck.planner.plan(engine, truck.departure_time, truck.travel_time, True)
+        return truck.planner.late_stops(engine, order, truck.departure_time, truck.travel_time)
+
+    def late_packages(self) -> int:
+        """Counts the packages that were delivered after their deadline or not at all.
+
+        Returns
+        -------
+            int
+                The number of late packages.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
         """
-        # Packages that must be delivered on truck two
-        if package.id in [3, 18, 36, 38]:
-            return truck.id == 2
+        return sum(1 for package in self.package_table.all()
+                   if package.delivery_time is None or package.delivery_time > package.deadline)
 
-        return package.arrival_time <= truck.departure_time
+    def use_planner(self, planner: RoutePlanner) -> None:
+        """Sets the planner used by the depot and every truck.
+
+        Parameters
+        ----------
+            planner : RoutePlanner
+                The planner.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(t)
+        """
+        self.planner = planner
+        for _, truck in self.trucks:
+            truck.planner = planner
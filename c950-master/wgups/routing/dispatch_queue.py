@@ -0,0 +1,354 @@
+from heapq import heappop, heappush
+from typing import Any, List, Optional, Tuple
+
+from wgups.routing.package import Package
+from wgups.structures.clock import Clock
+from wgups.structures.int_table import IntTable
+
+# The truck key of packages that any truck may deliver
+ANY_TRUCK = 0
+
+# Packages that are always loaded together, such as a co-delivery group
+Unit = List[Package]
+
+
+class DispatchQueue:
+    """A class which hands out the packages waiting at the depot in loading order, so each
+    loading decision costs O(log n) instead of a scan over every remaining package.
+
+    Packages are queued in units that are always loaded together, such as a co-delivery group
+    or a single package. A unit that has not yet fully arrived waits in a pending heap ordered
+    by the arrival of its last package. Once released it moves to a ready heap ordered by its
+    loading key. Both kinds of heap are kept once for the units any truck may deliver and once
+    for the units of each restricted truck, so a truck only ever looks at the shared heaps and
+    its own. Units with equal keys are handed out in the order they were pushed.
+
+    Release times must not decrease, which holds when trucks are loaded in order of
+    departure.
+
+    Attributes
+    ----------
+        pending : IntTable[List[Tuple[int, int, Tuple[Any, ...], List[Package]]]]
+            The (arrival seconds, sequence, key, unit) heap of units that have not been
+            released for each truck, where `ANY_TRUCK` holds the units any truck may deliver.
+        ready : IntTable[List[Tuple[Tuple[Any, ...], int, List[Package]]]]
+            The (key, sequence, unit) heap of released units for each truck, where
+            `ANY_TRUCK` holds the units any truck may deliver.
+        ready_counts : IntTable[int]
+            The number of packages in the released units of each truck.
+        truck_sizes : IntTable[int]
+            The number of packages queued for each truck, released or not.
+        pushed : int
+            The number of units ever pushed, which numbers each unit in push order.
+        size : int
+            The number of packages in the queue.
+    """
+
+    pending: IntTable[List[Tuple[int, int, Tuple[Any, ...], Unit]]]
+    ready: IntTable[List[Tuple[Tuple[Any, ...], int, Unit]]]
+    ready_counts: IntTable[int]
+    truck_sizes: IntTable[int]
+    pushed: int
+    size: int
+
+    def __init__(self) -> None:
+        self.pending = IntTable()
+        self.ready = IntTable()
+        self.ready_counts = IntTable()
+        self.truck_sizes = IntTable()
+        self.pushed = 0
+        self.size = 0
+
+    def push(self, unit: Unit, key: Tuple[Any, ...], truck_id: int = ANY_TRUCK) -> None:
+        """Adds a unit of packages to the queue.
+
+        Parameters
+        ----------
+            unit : List[Package]
+                The packages, which are always loaded together.
+            key : Tuple[Any, ...]
+                The loading key of the unit. Units with smaller keys are loaded first.
+            truck_id : int
+                The truck that must deliver the unit, or `ANY_TRUCK`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(u + log(n)) for a unit of u packages
+        """
+        if truck_id not in self.pending:
+            self.pending.set(truck_id, [])
+        arrival = max(package.arrival_time.total_seconds for package in unit)
+        heappush(self.pending.get(truck_id), (arrival, self.pushed, key, unit))
+        self.pushed += 1
+        self.size += len(unit)
+        self.truck_sizes.set(truck_id, (self.truck_sizes.get(truck_id) or 0) + len(unit))
+
+    def release(self, truck_id: int, time: Clock) -> None:
+        """Makes every unit that a truck may deliver and that has fully arrived by the
+        specified time ready for loading.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+            time : Clock
+                The current time.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(r*log(n)) for r released units
+        """
+        for truck in (ANY_TRUCK, truck_id):
+            pending = self.pending.get(truck)
+            if not pending:
+                continue
+            if truck not in self.ready:
+                self.ready.set(truck, [])
+                self.ready_counts.set(truck, 0)
+            ready = self.ready.get(truck)
+            count = self.ready_counts.get(truck)
+            while pending and pending[0][0] <= time.total_seconds:
+                _, sequence, key, unit = heappop(pending)
+                heappush(ready, (key, sequence, unit))
+                count += len(unit)
+            self.ready_counts.set(truck, count)
+
+    def available(self, truck_id: int, time: Clock) -> int:
+        """Counts the packages that a truck leaving at the specified time may deliver.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+            time : Clock
+                The time the truck leaves the depot.
+
+        Returns
+        -------
+            int
+                The number of packages.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(r*log(n)) for r released units
+        """
+        self.release(truck_id, time)
+        return (self.ready_counts.get(ANY_TRUCK) or 0) + (self.ready_counts.get(truck_id) or 0)
+
+    def remaining(self, truck_id: int) -> int:
+        """Counts the packages left in the queue that a truck may deliver, whether or not
+        they have arrived.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+
+        Returns
+        -------
+            int
+                The number of packages.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return (self.truck_sizes.get(ANY_TRUCK) or 0) + (self.truck_sizes.get(truck_id) or 0)
+
+    def next_arrival(self, truck_id: int) -> Optional[Clock]:
+        """Determines when the next unit that a truck may deliver has fully arrived at the
+        depot.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+
+        Returns
+        -------
+            Optional[Clock]
+                The arrival time of the earliest pending unit, or `None` if every unit the
+                truck may deliver has been released.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        arrivals = [pending[0][0] for pending in (self.pending.get(ANY_TRUCK),
+                                                  self.pending.get(truck_id)) if pending]
+        return Clock.from_seconds(min(arrivals)) if arrivals else None
+
+    def ready_packages(self, truck_id: int) -> List[Package]:
+        """Lists the released packages that a truck may deliver, in no particular order.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+
+        Returns
+        -------
+            List[Package]
+                The packages.
+
+        Space Complexity
+        ---------------
+            O(r) for r released packages
+
+        Time Complexity
+        ---------------
+            O(r)
+        """
+        return [package for truck in (ANY_TRUCK, truck_id)
+                for _, _, unit in self.ready.get(truck) or () for package in unit]
+
+    def peek(self, truck_id: int, time: Clock) -> Optional[Unit]:
+        """Returns the next unit that a truck leaving at the specified time may deliver without
+        removing it.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+            time : Clock
+                The time the truck leaves the depot.
+
+        Returns
+        -------
+            Optional[List[Package]]
+                The unit with the smallest key, or `None` if the truck may not deliver any
+                remaining unit.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        truck = self.next_heap(truck_id, time)
+        return self.ready.get(truck)[0][2] if truck is not None else None
+
+    def pop(self, truck_id: int, time: Clock) -> Optional[Unit]:
+        """Removes and returns the next unit that a truck leaving at the specified time may
+        deliver.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+            time : Clock
+                The time the truck leaves the depot.
+
+        Returns
+        -------
+            Optional[List[Package]]
+                The unit with the smallest key, or `None` if the truck may not deliver any
+                remaining unit.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(log(n)) amortized
+        """
+        entry = self.pop_entry(truck_id, time)
+        return entry[2] if entry is not None else None
+
+    def pop_entry(self, truck_id: int, time: Clock
+                  ) -> Optional[Tuple[Tuple[Any, ...], int, Unit]]:
+        """Removes and returns the next unit that a truck leaving at the specified time may
+        deliver alongside its loading key and truck, so that it can be pushed back unchanged.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+            time : Clock
+                The time the truck leaves the depot.
+
+        Returns
+        -------
+            Optional[Tuple[Tuple[Any, ...], int, List[Package]]]
+                The key, truck and unit with the smallest key, where the truck is `ANY_TRUCK`
+                for an unrestricted unit, or `None` if the truck may not deliver any remaining
+                unit.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(log(n)) amortized
+        """
+        truck = self.next_heap(truck_id, time)
+        if truck is None:
+            return None
+
+        key, _, unit = heappop(self.ready.get(truck))
+        self.ready_counts.set(truck, self.ready_counts.get(truck) - len(unit))
+        self.truck_sizes.set(truck, self.truck_sizes.get(truck) - len(unit))
+        self.size -= len(unit)
+        return key, truck, unit
+
+    def next_heap(self, truck_id: int, time: Clock) -> Optional[int]:
+        """Determines which ready heap holds the next unit that a truck leaving at the
+        specified time may deliver.
+
+        Parameters
+        ----------
+            truck_id : int
+                The identifier of the truck.
+            time : Clock
+                The time the truck leaves the depot.
+
+        Returns
+        -------
+            Optional[int]
+                `truck_id` or `ANY_TRUCK`, or `None` if both heaps are empty.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        self.release(truck_id, time)
+
+        shared = self.ready.get(ANY_TRUCK)
+        own = self.ready.get(truck_id)
+
+        if not shared and not own:
+            return None
+        if not shared or (own and own[0] < shared[0]):
+            return truck_id
+        return ANY_TRUCK
+
+    def __len__(self) -> int:
+        return self.size
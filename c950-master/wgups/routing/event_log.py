@@ -0,0 +1,141 @@
+from enum import Enum
+from typing import Iterator, List, Optional
+
+from wgups.structures.clock import Clock
+
+
+class EventKind(Enum):
+    """A class representing the kind of a delivery event.
+
+    Attributes
+    ----------
+    LOAD : int
+        A package was loaded onto a truck.
+    DEPART : int
+        A truck left the depot.
+    DELIVER : int
+        A package was delivered.
+    RETURN : int
+        A truck returned to the depot.
+    """
+    LOAD = 1
+    DEPART = 2
+    DELIVER = 3
+    RETURN = 4
+
+
+class Event:
+    """A class representing something that happened during the delivery day.
+
+    Attributes
+    ----------
+        time : Clock
+            The time of the event.
+        kind : EventKind
+            The kind of the event.
+        truck_id : int
+            The identifier of the truck involved.
+        package_id : Optional[int]
+            The identifier of the package involved, for load and deliver events.
+    """
+
+    __slots__ = ('time', 'kind', 'truck_id', 'package_id')
+
+    time: Clock
+    kind: EventKind
+    truck_id: int
+    package_id: Optional[int]
+
+    def __init__(self, time: Clock, kind: EventKind, truck_id: int,
+                 package_id: Optional[int] = None) -> None:
+        self.time = time
+        self.kind = kind
+        self.truck_id = truck_id
+        self.package_id = package_id
+
+    def __repr__(self) -> str:
+        package = f' Package={self.package_id}' if self.package_id is not None else ''
+        return f'{self.time} {self.kind.name} Truck={self.truck_id}{package}'
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class EventLog:
+    """A class which records the events of a delivery day. Each truck records its own trip as
+    it runs, so events arrive grouped by trip rather than by time. `ordered` sorts them once
+    by time, keeping the recorded order of simultaneous events.
+
+    Attributes
+    ----------
+        events : List[Event]
+            The events in the order they were recorded.
+    """
+
+    events: List[Event]
+
+    def __init__(self) -> None:
+        self.events = []
+
+    def record(self, time: Clock, kind: EventKind, truck_id: int,
+               package_id: Optional[int] = None) -> None:
+        """Records an event.
+
+        Parameters
+        ----------
+            time : Clock
+                The time of the event.
+            kind : EventKind
+                The kind of the event.
+            truck_id : int
+                The identifier of the truck involved.
+            package_id : Optional[int]
+                The identifier of the package involved, if any.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        self.events.append(Event(time, kind, truck_id, package_id))
+
+    def ordered(self) -> List[Event]:
+        """Returns the events ordered by time. Simultaneous events keep the order they were
+        recorded in, so a package is always loaded before its truck departs.
+
+        Returns
+        -------
+            List[Event]
+                The ordered events.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n*log(n))
+        """
+        return sorted(self.events, key=lambda event: event.time.total_seconds)
+
+    def clear(self) -> None:
+        """Removes every event.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.events = []
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self.events)
+
+    def __len__(self) -> int:
+        return len(self.events)
@@ -0,0 +1,73 @@
+from typing import List, Optional
+
+from wgups.structures.clock import Clock
+
+
+class FleetConfig:
+    """A class which describes the trucks of a depot. Every truck shares the same capacity and
+    speed, while each may have its own earliest departure time, such as a truck that is held
+    at the depot until late packages arrive.
+
+    Attributes
+    ----------
+        count : int
+            The number of trucks.
+        capacity : int
+            The number of packages each truck can carry.
+        mph : int
+            The speed of each truck.
+        earliest_departures : List[Clock]
+            The earliest time each truck can leave the depot, in truck order. Trucks beyond
+            the end of the list can leave at the start of the delivery day.
+    """
+
+    count: int
+    capacity: int
+    mph: int
+    earliest_departures: List[Clock]
+
+    def __init__(self, count: int = 2, capacity: int = 16, mph: int = 18,
+                 earliest_departures: Optional[List[Clock]] = None) -> None:
+        if count < 1:
+            raise ValueError('The fleet must have at least one truck.')
+        if capacity < 1:
+            raise ValueError('Each truck must be able to carry at least one package.')
+        if mph <= 0:
+            raise ValueError('The speed of the trucks must be positive.')
+
+        earliest_departures = list(earliest_departures or [])
+        if len(earliest_departures) > count:
+            raise ValueError(f'Expected at most {count} departure times, '
+                             f'got {len(earliest_departures)}.')
+
+        self.count = count
+        self.capacity = capacity
+        self.mph = mph
+        self.earliest_departures = earliest_departures
+
+    def earliest_departure(self, index: int) -> Clock:
+        """Determines the earliest time a truck can leave the depot.
+
+        Parameters
+        ----------
+            index : int
+                The position of the truck in the fleet, starting from 0.
+
+        Returns
+        -------
+            Clock
+                The earliest departure time.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        if index < len(self.earliest_departures):
+            return self.earliest_departures[index]
+
+        # Trucks without a configured time leave at the start of the delivery day
+        return Clock(8)
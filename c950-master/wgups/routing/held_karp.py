@@ -0,0 +1,111 @@
+from typing import List, Optional
+
+import numpy as np
+
+from wgups.routing.route_engine import RouteEngine
+
+
+class HeldKarp:
+    """A class which finds the shortest order in which to visit the stops of a route with the
+    Held-Karp dynamic program. Entry `[s, j]` of the table is the length of the shortest path
+    that leaves the depot, visits exactly the stops in the bitset `s` and ends at stop `j`.
+
+    The table is filled one subset size at a time, and each step relaxes every subset of that
+    size ending at one stop in a single vectorized operation. Paths longer than a known route
+    can never complete a shorter one, so they are pruned as soon as they are found. Time and
+    space grow as `2^m`, so the solver is meant for routes with few distinct stops.
+
+    Class Attributes
+    ----------------
+        TOLERANCE : float
+            The slack in miles allowed over the upper bound before a path is pruned.
+
+    Attributes
+    ----------
+        engine : RouteEngine
+            The stops of the route and the distances between them.
+        lengths : np.ndarray
+            The dynamic programming table of path lengths.
+        parents : np.ndarray
+            The stop visited before the last stop of each path in `lengths`.
+    """
+
+    TOLERANCE = 1e-9
+
+    engine: RouteEngine
+    lengths: np.ndarray
+    parents: np.ndarray
+
+    def __init__(self, engine: RouteEngine) -> None:
+        self.engine = engine
+
+    def solve(self, return_to_depot: bool, upper_bound: float = np.inf) -> Optional[List[int]]:
+        """Finds the shortest visiting order.
+
+        Parameters
+        ----------
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+            upper_bound : float
+                The length of a known route. Paths longer than it are pruned.
+
+        Returns
+        -------
+            Optional[List[int]]
+                The positions of the stops in visiting order, excluding the depot, or `None`
+                if no route is within the upper bound.
+
+        Space Complexity
+        ---------------
+            O(2^m*m)
+
+        Time Complexity
+        ---------------
+            O(2^m*m^2)
+        """
+        size = len(self.engine.nodes) - 1
+        if size == 0:
+            return []
+
+        distances = self.engine.distances
+        stops = distances[1:, 1:]
+        bound = upper_bound + self.TOLERANCE
+
+        full = (1 << size) - 1
+        self.lengths = np.full((full + 1, size), np.inf)
+        self.parents = np.full((full + 1, size), -1, dtype=np.int8)
+
+        # Paths that visit a single stop come straight from the depot
+        singles = 1 << np.arange(size)
+        self.lengths[singles, np.arange(size)] = distances[0, 1:]
+
+        # Group every subset by the number of stops it holds
+        subsets = np.arange(full + 1)
+        counts = np.zeros(full + 1, dtype=np.int64)
+        for stop in range(size):
+            counts += (subsets >> stop) & 1
+
+        for count in range(2, size + 1):
+            layer = subsets[counts == count]
+            for stop in range(size):
+                ending = layer[(layer >> stop) & 1 == 1]
+                previous = self.lengths[ending ^ (1 << stop)] + stops[:, stop]
+                parents = np.argmin(previous, axis=1)
+                lengths = previous[np.arange(len(ending)), parents]
+
+                lengths[lengths > bound] = np.inf
+                self.lengths[ending, stop] = lengths
+                self.parents[ending, stop] = parents
+
+        totals = self.lengths[full] + (distances[1:, 0] if return_to_depot else 0)
+        last = int(np.argmin(totals))
+        if not np.isfinite(totals[last]) or totals[last] > bound:
+            return None
+
+        order = []
+        subset = full
+        while last >= 0:
+            order.append(last + 1)
+            subset, last = subset ^ (1 << last), int(self.parents[subset, last])
+
+        return order[::-1]
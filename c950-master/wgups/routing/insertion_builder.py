@@ -0,0 +1,216 @@
+from math import inf
+from typing import Callable, List, Tuple
+
+from wgups.routing.route_engine import RouteEngine
+from wgups.structures.clock import Clock
+
+
+class InsertionBuilder:
+    """A class which builds a route by cheapest insertion while keeping every stop on time.
+    The route starts empty, and each step inserts the unrouted stop whose cheapest on-time
+    insertion adds the fewest miles.
+
+    Alongside the route the builder keeps the arrival time at each stop and its forward slack:
+    the number of seconds the arrival could be delayed without any stop from there on missing
+    its deadline. Inserting a stop delays every later stop by the same number of seconds, so an
+    insertion is on time exactly when the new stop meets its own deadline and the delay fits
+    within the slack of the stop after it. Each candidate insertion is therefore checked in
+    constant time.
+
+    If no stop can be inserted on time, the stop that can be inserted with the fewest late
+    stops is inserted where it adds the fewest miles, so a route is only late when no on-time
+    route could be found.
+
+    Attributes
+    ----------
+        engine : RouteEngine
+            The stops of the route and the distances between them.
+        departure_time : Clock
+            The time the truck leaves the depot.
+        travel_time : Callable[[float], int]
+            The minutes the truck takes to drive a number of miles.
+        miles : List[List[float]]
+            The distances between positions.
+        seconds : List[List[int]]
+            The driving time in seconds between positions, rounded to whole minutes per leg.
+        closed : bool
+            Whether the route ends with a leg back to the depot.
+        route : List[int]
+            The positions routed so far, starting with the depot and, for routes that return to
+            the depot, ending with it.
+        arrivals : List[int]
+            The arrival time in seconds at each entry of `route`.
+        slack : List[float]
+            The forward slack in seconds of each entry of `route`.
+    """
+
+    engine: RouteEngine
+    departure_time: Clock
+    travel_time: Callable[[float], int]
+    miles: List[List[float]]
+    seconds: List[List[int]]
+    closed: bool
+    route: List[int]
+    arrivals: List[int]
+    slack: List[float]
+
+    def __init__(self, engine: RouteEngine, departure_time: Clock,
+                 travel_time: Callable[[float], int]) -> None:
+        self.engine = engine
+        self.departure_time = departure_time
+        self.travel_time = travel_time
+
+        self.miles = engine.distances.tolist()
+        self.seconds = (engine.travel_minutes(travel_time) * 60).tolist()
+
+        self.closed = False
+        self.route = []
+        self.arrivals = []
+        self.slack = []
+
+    def build(self, return_to_depot: bool) -> List[int]:
+        """Builds a route through every stop.
+
+        Parameters
+        ----------
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            List[int]
+                The positions of the stops in visiting order, excluding the depot.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(m^3)
+        """
+        self.closed = return_to_depot
+        self.route = [0, 0] if return_to_depot else [0]
+        self.update()
+
+        unrouted = list(range(1, len(self.engine.nodes)))
+        while unrouted:
+            stop, place = self.cheapest(unrouted)
+            if stop is None:
+                stop, place = self.least_late(unrouted)
+
+            unrouted.remove(stop)
+            self.route.insert(place, stop)
+            self.update()
+
+        return self.route[1:-1] if return_to_depot else self.route[1:]
+
+    def cheapest(self, unrouted: List[int]) -> Tuple[int, int]:
+        """Finds the on-time insertion that adds the fewest miles.
+
+        Parameters
+        ----------
+            unrouted : List[int]
+                The positions not yet routed.
+
+        Returns
+        -------
+            Tuple[int, int]
+                The position to insert and the index of `route` to insert it at, or
+                `(None, None)` if no stop can be inserted on time.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(m^2)
+        """
+        route, arrivals, slack = self.route, self.arrivals, self.slack
+        miles, seconds, deadlines = self.miles, self.seconds, self.engine.deadlines
+
+        # A route that returns to the depot cannot be extended past its final leg
+        places = len(route) - 1 if self.closed else len(route)
+
+        best, best_stop, best_place = inf, None, None
+        for stop in unrouted:
+            for index in range(places):
+                previous = route[index]
+                arrival = arrivals[index] + seconds[previous][stop]
+                if arrival > deadlines[stop]:
+                    continue
+
+                if index + 1 < len(route):
+                    following = route[index + 1]
+                    delay = arrival + seconds[stop][following] - arrivals[index + 1]
+                    if delay > slack[index + 1]:
+                        continue
+                    added = miles[previous][stop] + miles[stop][following] \
+                        - miles[previous][following]
+                else:
+                    added = miles[previous][stop]
+
+                if added < best:
+                    best, best_stop, best_place = added, stop, index + 1
+
+        return best_stop, best_place
+
+    def least_late(self, unrouted: List[int]) -> Tuple[int, int]:
+        """Finds the insertion with the fewest late stops, breaking ties by the miles added.
+        Used only when no stop can be inserted on time.
+
+        Parameters
+        ----------
+            unrouted : List[int]
+                The positions not yet routed.
+
+        Returns
+        -------
+            Tuple[int, int]
+                The position to insert and the index of `route` to insert it at.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m^3)
+        """
+        places = len(self.route) - 1 if self.closed else len(self.route)
+        length = self.engine.length(self.route[1:], False)
+
+        best, best_stop, best_place = (inf, inf), None, None
+        for stop in unrouted:
+            for place in range(1, places + 1):
+                route = self.route[:place] + [stop] + self.route[place:]
+                late = self.engine.late_stops(route, self.departure_time, self.travel_time)
+                added = self.engine.length(route[1:], False) - length
+                if (late, added) < best:
+                    best, best_stop, best_place = (late, added), stop, place
+
+        return best_stop, best_place
+
+    def update(self) -> None:
+        """Recomputes the arrival times and forward slack of the route.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        route, seconds, deadlines = self.route, self.seconds, self.engine.deadlines
+
+        self.arrivals = [self.departure_time.total_seconds]
+        for previous, position in zip(route, route[1:]):
+            self.arrivals.append(self.arrivals[-1] + seconds[previous][position])
+
+        self.slack = [inf] * len(route)
+        remaining = inf
+        for index in range(len(route) - 1, 0, -1):
+            remaining = min(remaining, deadlines[route[index]] - self.arrivals[index])
+            self.slack[index] = remaining
@@ -0,0 +1,366 @@
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from wgups.routing.route_engine import RouteEngine
+from wgups.structures.clock import Clock
+
+
+class LocalSearch:
+    """A class which shortens a truck route with 2-opt and Or-opt moves. A 2-opt move reverses
+    a run of stops, and an Or-opt move relocates a run of up to three stops elsewhere in the
+    route. Every candidate move is priced from the four to six distances it changes, and only
+    moves that shorten the route are checked against the deadlines.
+
+    Candidate moves are drawn from the candidate lists of the engine. A move is only priced if
+    one of the legs it adds joins a stop to one of its nearest neighbors, closer than the leg
+    of that stop it removes, or for Or-opt, closer than the detour the move saves. Each pass
+    therefore prices O(m*k) moves for m stops and candidate lists of k stops, rather than every
+    pair of positions.
+
+    A move is accepted only if it does not add late stops, so a route that meets every deadline
+    keeps meeting them. The search takes the first improving move it finds and stops once no
+    move improves the route, after `max_iterations` accepted moves, or after `max_evaluations`
+    candidate moves have been priced, whichever comes first. These bounds do not depend on the
+    speed of the machine, so the same route is always improved the same way. A wall-clock
+    `time_limit` may be set as well, at the cost of that reproducibility. The budgets are
+    checked before each run of candidates that share their first position, so a search may
+    price up to one run more than `max_evaluations`. Distances are assumed to be the same in
+    both directions.
+
+    Class Attributes
+    ----------------
+        TOLERANCE : float
+            The smallest saving in miles for which a move is taken.
+        SEGMENT_LENGTHS : Tuple[int, ...]
+            The lengths of the runs of stops relocated by Or-opt moves.
+
+    Attributes
+    ----------
+        engine : RouteEngine
+            The stops of the route and the distances between them.
+        departure_time : Clock
+            The time the truck leaves the depot.
+        travel_time : Callable[[float], int]
+            The minutes the truck takes to drive a number of miles.
+        max_iterations : int
+            The largest number of moves to accept.
+        max_evaluations : int
+            The largest number of candidate moves to price.
+        time_limit : Optional[float]
+            The largest number of seconds to search for, or `None` for no limit.
+        distances : List[List[float]]
+            The distances between positions, with an extra position for the end of a route
+            that does not return to the depot. The end is zero miles from every position.
+        route : List[int]
+            The current route, starting at the depot and ending at the depot or the end.
+        places : List[int]
+            The index in `route` of each position. The depot is placed at the start.
+        late : int
+            The number of late stops on the current route.
+        moves : int
+            The number of moves accepted so far.
+        evaluations : int
+            The number of candidate moves priced so far.
+        stop_at : Optional[float]
+            The performance counter value at which the search gives up, if time limited.
+    """
+
+    TOLERANCE = 1e-9
+    SEGMENT_LENGTHS = (1, 2, 3)
+
+    engine: RouteEngine
+    departure_time: Clock
+    travel_time: Callable[[float], int]
+    max_iterations: int
+    max_evaluations: int
+    time_limit: Optional[float]
+    distances: List[List[float]]
+    route: List[int]
+    places: List[int]
+    late: int
+    moves: int
+    evaluations: int
+    stop_at: Optional[float]
+
+    def __init__(self, engine: RouteEngine, departure_time: Clock,
+                 travel_time: Callable[[float], int], max_iterations: int = 1000,
+                 max_evaluations: int = 100000, time_limit: Optional[float] = None) -> None:
+        self.engine = engine
+        self.departure_time = departure_time
+        self.travel_time = travel_time
+        self.max_iterations = max_iterations
+        self.max_evaluations = max_evaluations
+        self.time_limit = time_limit
+
+        self.distances = np.pad(engine.distances, ((0, 1), (0, 1))).tolist()
+        self.route = []
+        self.places = []
+        self.late = 0
+        self.moves = 0
+        self.evaluations = 0
+        self.stop_at = None
+
+    def improve(self, order: List[int], return_to_depot: bool) -> List[int]:
+        """Improves a route until no move shortens it or the budget runs out.
+
+        Parameters
+        ----------
+            order : List[int]
+                The positions of the stops in visiting order, excluding the depot.
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            List[int]
+                The improved visiting order, excluding the depot.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(i*m^2*k) for i accepted moves, bounded by O(e*m) for e evaluations
+        """
+        end = 0 if return_to_depot else len(self.engine.nodes)
+        self.place([0] + list(order) + [end])
+        self.late = self.engine.late_stops(self.route, self.departure_time, self.travel_time)
+        self.moves = 0
+        self.evaluations = 0
+        self.stop_at = perf_counter() + self.time_limit if self.time_limit is not None else None
+
+        while self.moves < self.max_iterations and not self.exhausted():
+            if not (self.two_opt() or self.or_opt()):
+                break
+
+        return self.route[1:-1]
+
+    def exhausted(self) -> bool:
+        """Determines if the evaluation budget or the time limit, if any, has run out.
+
+        Returns
+        -------
+            bool
+                Returns `True` if the search should stop, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.evaluations >= self.max_evaluations or \
+            (self.stop_at is not None and perf_counter() >= self.stop_at)
+
+    def accept(self, route: List[int]) -> bool:
+        """Replaces the current route with a shorter one if it adds no late stops.
+
+        Parameters
+        ----------
+            route : List[int]
+                The shorter route.
+
+        Returns
+        -------
+            bool
+                Returns `True` if the route was accepted, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        late = self.engine.late_stops(route, self.departure_time, self.travel_time)
+        if late > self.late:
+            return False
+
+        self.place(route)
+        self.late = late
+        self.moves += 1
+        return True
+
+    def place(self, route: List[int]) -> None:
+        """Makes a route the current route and records where each position lies on it.
+
+        Parameters
+        ----------
+            route : List[int]
+                The route.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        self.route = route
+        self.places = [0] * (len(self.engine.nodes) + 1)
+        for index in range(len(route) - 1, -1, -1):
+            self.places[route[index]] = index
+
+    def closing(self, position: int) -> List[Tuple[int, int]]:
+        """Lists the positions that may follow a position after a move, closest first,
+        together with their index in the route. The end of a route that does not return to
+        the depot is zero miles from every position, so it comes first, and the depot may
+        only follow a position at the end of a route that returns to it.
+
+        Parameters
+        ----------
+            position : int
+                The position.
+
+        Returns
+        -------
+            List[Tuple[int, int]]
+                The (position, route index) pairs.
+
+        Space Complexity
+        ---------------
+            O(k)
+
+        Time Complexity
+        ---------------
+            O(k)
+        """
+        route, places = self.route, self.places
+        last = len(route) - 1
+        candidates = [(route[last], last)] if route[last] else []
+        for neighbor in self.engine.neighbors[position] if position < len(places) - 1 else ():
+            if neighbor:
+                candidates.append((neighbor, places[neighbor]))
+            elif not route[last]:
+                candidates.append((0, last))
+        return candidates
+
+    def two_opt(self) -> bool:
+        """Applies the first 2-opt move that shortens the route. Reversing the stops from
+        index `p + 1` to index `q` replaces the legs `(a, b)` and `(c, d)` with `(a, c)` and
+        `(b, d)`, where `a = route[p]`, `b` follows `a`, `c = route[q]` and `d` follows `c`.
+
+        Moves are found from both new legs: each position is joined to a candidate closer
+        than the position that follows it, or closer than the position that precedes it.
+
+        Returns
+        -------
+            bool
+                Returns `True` if a move was applied, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m*k)
+        """
+        route, distances, places = self.route, self.distances, self.places
+        last = len(route) - 2
+
+        for index in range(len(route)):
+            if self.exhausted():
+                return False
+            position = route[index]
+
+            # The new leg (a, c) joins `position` to a candidate at the start of the route
+            moves = []
+            if index <= last:
+                limit = distances[position][route[index + 1]] - self.TOLERANCE
+                for candidate in self.engine.neighbors[position] if position < len(places) - 1 \
+                        else ():
+                    if distances[position][candidate] >= limit:
+                        break
+                    other = places[candidate]
+                    moves.append((index, other) if other > index else (other, index))
+
+            # The new leg (b, d) joins `position` to a candidate at the end of the route
+            if index >= 1:
+                limit = distances[position][route[index - 1]] - self.TOLERANCE
+                for candidate, other in self.closing(position):
+                    if distances[position][candidate] >= limit:
+                        break
+                    moves.append((index - 1, other - 1) if other > index else
+                                 (other - 1, index - 1))
+
+            for p, q in moves:
+                if p < 0 or q - p < 2 or q > last:
+                    continue
+                self.evaluations += 1
+
+                a, b, c, d = route[p], route[p + 1], route[q], route[q + 1]
+                delta = distances[a][c] + distances[b][d] - distances[a][b] - distances[c][d]
+                if delta < -self.TOLERANCE and \
+                        self.accept(route[:p + 1] + route[p + 1:q + 1][::-1] + route[q + 1:]):
+                    return True
+
+        return False
+
+    def or_opt(self) -> bool:
+        """Applies the first Or-opt move that shortens the route. The run of stops starting at
+        index `i` is removed, joining its neighbors, and inserted between two other
+        consecutive indices `p` and `p + 1`.
+
+        The run is only inserted after a candidate of its first stop, or before a candidate
+        of its last stop, that is closer to it than the detour removing the run saves.
+
+        Returns
+        -------
+            bool
+                Returns `True` if a move was applied, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(k)
+
+        Time Complexity
+        ---------------
+            O(m*k)
+        """
+        route, distances, places = self.route, self.distances, self.places
+        last = len(route) - 2
+
+        for length in self.SEGMENT_LENGTHS:
+            for i in range(1, last - length + 2):
+                if self.exhausted():
+                    return False
+
+                before, first = route[i - 1], route[i]
+                tail, after = route[i + length - 1], route[i + length]
+                saving = distances[before][first] + distances[tail][after] \
+                    - distances[before][after]
+                limit = saving - self.TOLERANCE
+
+                insertions = []
+                for candidate in self.engine.neighbors[first]:
+                    if distances[first][candidate] >= limit:
+                        break
+                    insertions.append(places[candidate])
+                for candidate, other in self.closing(tail):
+                    if distances[tail][candidate] >= limit:
+                        break
+                    insertions.append(other - 1)
+
+                for p in insertions:
+                    # Inserting next to its current place leaves the route unchanged
+                    if p < 0 or i - 1 <= p <= i + length - 1:
+                        continue
+                    self.evaluations += 1
+
+                    u, v = route[p], route[p + 1]
+                    delta = distances[u][first] + distances[tail][v] - distances[u][v] - saving
+                    if delta < -self.TOLERANCE:
+                        rest = route[:i] + route[i + length:]
+                        k = p + 1 if p < i else p + 1 - length
+                        if self.accept(rest[:k] + route[i:i + length] + rest[k:]):
+                            return True
+
+        return False
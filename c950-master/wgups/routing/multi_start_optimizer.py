@@ -0,0 +1,290 @@
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from random import Random
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+from wgups.data.distance_table import DistanceTable
+from wgups.data.package_table import PackageTable
+from wgups.routing.cluster_assigner import ClusterAssigner
+from wgups.routing.constraints import ConstraintIndex
+from wgups.routing.depot import Depot
+from wgups.routing.fleet_config import FleetConfig
+from wgups.routing.package import Package, PackageStatus
+from wgups.routing.route_planner import RoutePlanner
+from wgups.structures.int_table import IntTable
+
+# A start of the search: the seed of its loading order, or `None` for the greedy order, and
+# the route construction it uses
+Start = Tuple[Optional[int], str]
+
+
+class MultiStartOptimizer:
+    """A class which searches for a better delivery plan by running many randomized plans and
+    keeping the best. The first start is the greedy plan of the depot, and every other start
+    scales the distances used to load the trucks by a random factor and builds its routes with
+    a randomly chosen construction. Starts run in parallel across a pool of processes, each
+    of which receives the distance table, packages and fleet once.
+
+    Each start is described only by its seed and construction, and the seed of every start is
+    drawn from `seed`, so the same seed always yields the same plan regardless of the number of
+    workers. The local search is bounded by counts of moves rather than time, so results are
+    exactly reproducible unless the planner is also given a wall-clock time limit.
+
+    The best start is the one with the fewest late packages, then the fewest miles, so a plan
+    with no late packages always wins if one is found. It is replayed on the depot so that the
+    packages, event log and timeline of the depot describe it.
+
+    Class Attributes
+    ----------------
+        worker_state : Optional[Tuple[Any, ...]]
+            The distance table, packages, planner, fleet, assigner, delivery restrictions and
+            jitter of the current worker process.
+
+    Attributes
+    ----------
+        starts : int
+            The number of plans to run, including the greedy plan.
+        seed : int
+            The seed from which the seed of every start is drawn.
+        workers : Optional[int]
+            The number of processes to run starts in. `None` uses every core, and 1 runs every
+            start in the calling process.
+        jitter : float
+            The largest fraction by which a distance may be scaled when loading the trucks.
+        constructions : Sequence[str]
+            The route constructions a randomized start may choose from.
+        results : List[Tuple[float, int]]
+            The miles and number of late packages of each start of the last search.
+        best : Optional[int]
+            The index of the best start of the last search.
+    """
+
+    worker_state: Optional[Tuple[Any, ...]] = None
+
+    starts: int
+    seed: int
+    workers: Optional[int]
+    jitter: float
+    constructions: Sequence[str]
+    results: List[Tuple[float, int]]
+    best: Optional[int]
+
+    def __init__(self, starts: int = 16, seed: int = 0, workers: Optional[int] = None,
+                 jitter: float = 0.25,
+                 constructions: Sequence[str] = (RoutePlanner.NEAREST_NEIGHBOR,
+                                                 RoutePlanner.INSERTION)) -> None:
+        if starts < 1:
+            raise ValueError('The search must run at least one start.')
+        if not constructions:
+            raise ValueError('At least one route construction is required.')
+
+        self.starts = starts
+        self.seed = seed
+        self.workers = workers
+        self.jitter = jitter
+        self.constructions = tuple(constructions)
+        self.results = []
+        self.best = None
+
+    def plan_starts(self, construction: str) -> List[Start]:
+        """Draws the seed and route construction of every start.
+
+        Parameters
+        ----------
+            construction : str
+                The route construction of the greedy start.
+
+        Returns
+        -------
+            List[Tuple[Optional[int], str]]
+                The (seed, construction) pair of each start.
+
+        Space Complexity
+        ---------------
+            O(s)
+
+        Time Complexity
+        ---------------
+            O(s)
+        """
+        rng = Random(self.seed)
+        starts = [(None, construction)]
+        for _ in range(self.starts - 1):
+            starts.append((rng.randint(0, 2 ** 31 - 1), rng.choice(self.constructions)))
+
+        return starts
+
+    def optimize(self, depot: Depot) -> float:
+        """Runs every start and delivers the packages of the depot with the best plan.
+
+        Parameters
+        ----------
+            depot : Depot
+                The depot.
+
+        Returns
+        -------
+            float
+                The total distance traveled with the best plan.
+
+        Space Complexity
+        ---------------
+            O(w*n) for w workers
+
+        Time Complexity
+        ---------------
+            O(s/w) plans for s starts and w workers
+        """
+        starts = self.plan_starts(depot.planner.construction)
+        state = (depot.distance_table, depot.package_table.all(), depot.planner, depot.fleet,
+                 depot.assigner, depot.constraints, self.jitter)
+
+        if self.workers == 1 or self.starts == 1:
+            self.initialize_worker(*state)
+            self.results = [self.run_start(start) for start in starts]
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=self.initialize_worker,
+                                     initargs=state) as pool:
+                self.results = list(pool.map(self.run_start, starts))
+
+        self.best = min(range(len(starts)),
+                        key=lambda index: (self.results[index][1], self.results[index][0], index))
+
+        # Replay the best start so that the depot describes its plan
+        seed, construction = starts[self.best]
+        planner = depot.planner
+        depot.use_planner(self.planner_for(planner, construction))
+        try:
+            return depot.deliver_packages(None if seed is None else Random(seed), self.jitter)
+        finally:
+            depot.use_planner(planner)
+
+    @classmethod
+    def initialize_worker(cls, distance_table: DistanceTable, packages: List[Package],
+                          planner: RoutePlanner, fleet: FleetConfig,
+                          assigner: Optional[ClusterAssigner], constraints: ConstraintIndex,
+                          jitter: float) -> None:
+        """Stores the data shared by every start run in the current process.
+
+        Parameters
+        ----------
+            distance_table : DistanceTable
+                The distances between addresses.
+            packages : List[Package]
+                The packages to deliver. Each start delivers its own copies.
+            planner : RoutePlanner
+                The planner whose settings and cache each start uses.
+            fleet : FleetConfig
+                The trucks of the depot.
+            assigner : Optional[ClusterAssigner]
+                The assigner of the depot, if any.
+            constraints : ConstraintIndex
+                The delivery restrictions of the packages.
+            jitter : float
+                The largest fraction by which a distance may be scaled.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        cls.worker_state = (distance_table, packages, planner, fleet, assigner, constraints,
+                            jitter)
+
+    @classmethod
+    def run_start(cls, start: Start) -> Tuple[float, int]:
+        """Runs a start on fresh copies of the packages of the current process.
+
+        Parameters
+        ----------
+            start : Tuple[Optional[int], str]
+                The seed and route construction of the start.
+
+        Returns
+        -------
+            Tuple[float, int]
+                The total distance traveled and the number of late packages.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(1) plans
+        """
+        distance_table, packages, planner, fleet, assigner, constraints, jitter = \
+            cls.worker_state
+        seed, construction = start
+
+        depot = Depot(distance_table, PackageTable(cls.fresh_packages(packages)),
+                      cls.planner_for(planner, construction), fleet, assigner, constraints)
+        miles = depot.deliver_packages(None if seed is None else Random(seed), jitter)
+        return miles, depot.late_packages()
+
+    @classmethod
+    def planner_for(cls, planner: RoutePlanner, construction: str) -> RoutePlanner:
+        """Returns a planner with the same settings and cache as another planner but the
+        specified route construction.
+
+        Parameters
+        ----------
+            planner : RoutePlanner
+                The planner to copy.
+            construction : str
+                The route construction.
+
+        Returns
+        -------
+            RoutePlanner
+                The planner.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        if construction == planner.construction:
+            return planner
+
+        return RoutePlanner(planner.improve, planner.max_iterations, planner.time_limit,
+                            planner.exact_threshold, construction, planner.cache,
+                            planner.max_evaluations)
+
+    @classmethod
+    def fresh_packages(cls, packages: Iterable[Package]) -> IntTable[Package]:
+        """Copies packages as they were before being picked up.
+
+        Parameters
+        ----------
+            packages : Iterable[Package]
+                The packages.
+
+        Returns
+        -------
+            IntTable[Package]
+                The copies keyed by package identifier.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        table = IntTable()
+        for package in packages:
+            package = copy(package)
+            package.status = PackageStatus.AWAITING_DELIVERY
+            package.pickup_time = None
+            package.delivery_time = None
+            table.set(package.id, package)
+
+        return table
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Callable, List
+from typing import Callable, List, Optional
 
 from wgups.structures.clock import Clock
 
@@ -30,6 +30,9 @@ class Package:
             The package identifier.
         street : str
             The destination street for the package.
+        node : Optional[int]
+            The index of the destination street in the distance table. Resolved once when the
+            package is loaded, after which routing compares nodes rather than streets.
         city : str
             The destination city for the package.
         state : str
@@ -42,10 +45,6 @@ class Package:
             The delivery deadline for the package.
         status : PackageStatus
             The delivery status of the package.
-        linked : bool
-            Determines if the package is linked to other packages.
-        deliverable_by : int
-            Determines which trucks can deliver the package.
         is_priority : bool
             Determines if the package should be given priority during delivery.
         arrival_time : Clock
@@ -58,14 +57,13 @@ class Package:
 
     id: int
     street: str
+    node: Optional[int]
     city: str
     state: str
     zip_code: str
     weight: int
     deadline: Clock
     status: PackageStatus
-    linked: bool
-    deliverable_by: int
     is_priority: bool
     arrival_time: Clock
     pickup_time: Clock
@@ -75,14 +73,13 @@ class Package:
                  weight: int, deadline: Clock, arrival_time: Clock = Clock(8)) -> None:
         self.id = id
         self.street = street
+        self.node = None
         self.city = city
         self.state = state
         self.zip_code = zip_code
         self.weight = weight
         self.deadline = deadline
         self.status = PackageStatus.AWAITING_DELIVERY
-        self.linked = False
-        self.deliverable_by = [1, 2]
         self.is_priority = False
         self.arrival_time = Clock(8)
         self.pickup_time = None
@@ -128,9 +125,16 @@ class Package:
         self.status = PackageStatus.DELIVERED
         self.delivery_time = time
 
-    def delivery_report(self, time: Clock) -> List[str]:
+    def delivery_report(self, time: Clock, status: Optional[PackageStatus] = None) -> List[str]:
         """Returns a delivery report for the package.
 
+        Parameters
+        ----------
+            time : Clock
+                The time for which the report should be generated.
+            status : Optional[PackageStatus]
+                The status of the package at that time, if already known.
+
         Space Complexity
         ---------------
             O(1)
@@ -139,9 +143,10 @@ class Package:
         ---------------
             O(1)
         """
-        status = self.status_at(time)
+        if status is None:
+            status = self.status_at(time)
 
-        if self.delivery_time and time > self.delivery_time:
+        if status == PackageStatus.DELIVERED:
             on_time = self.delivery_time <= self.deadline if self.delivery_time else None
             return[
                 f'Package={self.id}',
@@ -150,7 +155,7 @@ class Package:
                 f'Delivery Time={self.delivery_time}',
                 f'On Time={on_time}'
             ]
-        elif self.pickup_time and time > self.pickup_time:
+        elif status == PackageStatus.ON_TRUCK:
             return [
                 f'Package={self.id}',
                 f'Status={status.name}',
@@ -211,15 +216,17 @@ class Package:
         ---------------
             O(1)
         """
-        return self.deadline < Clock(17) or self.is_priority
+        return self.deadline.time_of_day() < Clock(17) or self.is_priority
 
-    def inline_report(self, time: Clock) -> str:
+    def inline_report(self, time: Clock, status: Optional[PackageStatus] = None) -> str:
         """Retrieves an inline report of the package details for the specified time.
 
         Parameters
         ----------
             time : Clock
                 The time for which the package report should be generated.
+            status : Optional[PackageStatus]
+                The status of the package at that time, if already known.
 
         Returns
         -------
@@ -242,7 +249,7 @@ class Package:
             f'\tZip Code={self.zip_code}\n' \
             f'\tWeight={self.weight}\n' \
             f'\tDeadline={self.deadline}\n' \
-            f'\tDelivery Status={self.status_at(time).name}'
+            f'\tDelivery Status={(status or self.status_at(time)).name}'
 
     def __repr__(self) -> str:
         return 'Package(\n' \
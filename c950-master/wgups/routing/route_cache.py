@@ -0,0 +1,223 @@
+from typing import Hashable, List, Optional, Tuple
+
+from wgups.structures.hash_set import HashSet
+
+Route = Tuple[List[int], float]
+
+
+class RouteCache:
+    """A class which remembers planned routes so that the same route is never planned twice.
+    A route is keyed by its start node and the frozen bitset of the nodes it visits, together
+    with a variant describing everything else the plan depends on, such as the strategy, the
+    departure time and whether the route returns to the depot. Because the key is the set of
+    stops rather than their order, the same load always finds the same entry.
+
+    The cache holds at most `capacity` routes. Entries are kept in order of use in a `HashSet`,
+    which preserves insertion order, so the least recently used route is the first entry and
+    is evicted when a new route does not fit. A lookup moves its route to the back by
+    removing and reinserting it, and `HashSet.first` skips the removed entries this leaves at
+    the front only once, so both lookups and evictions are amortized O(1). Keys hold node
+    indices, so a cache must only be shared by routes planned over the same distance table.
+
+    Attributes
+    ----------
+        capacity : int
+            The largest number of routes held.
+        entries : HashSet[Tuple[int, int, Hashable], Tuple[List[int], float]]
+            The visiting order and length of each route, least recently used first.
+        hits : int
+            The number of lookups that found a route.
+        misses : int
+            The number of lookups that did not find a route.
+        evictions : int
+            The number of routes evicted to make room.
+    """
+
+    capacity: int
+    entries: HashSet[Tuple[int, int, Hashable], Route]
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, capacity: int = 4096) -> None:
+        if capacity < 1:
+            raise ValueError('The route cache must hold at least one route.')
+
+        self.capacity = capacity
+        self.entries = HashSet(HashSet.capacity_for(capacity))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def key(cls, start: int, stops: List[int], variant: Hashable) -> Tuple[int, int, Hashable]:
+        """Builds the key of a route.
+
+        Parameters
+        ----------
+            start : int
+                The node the route starts from.
+            stops : List[int]
+                The nodes the route visits, in any order.
+            variant : Hashable
+                Everything else the planned route depends on.
+
+        Returns
+        -------
+            Tuple[int, int, Hashable]
+                The start node, the bitset of the stops and the variant.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        bitset = 0
+        for stop in stops:
+            bitset |= 1 << stop
+        return start, bitset, variant
+
+    def get(self, key: Tuple[int, int, Hashable]) -> Optional[Route]:
+        """Looks up a route and marks it as the most recently used.
+
+        Parameters
+        ----------
+            key : Tuple[int, int, Hashable]
+                The key of the route.
+
+        Returns
+        -------
+            Optional[Tuple[List[int], float]]
+                The visiting order and length of the route, or `None` if it is not cached.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        route = self.entries.get(key)
+        if route is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.delete(key)
+        self.entries.set(key, route)
+        return route
+
+    def set(self, key: Tuple[int, int, Hashable], order: List[int], length: float) -> None:
+        """Stores a route, evicting the least recently used route if the cache is full.
+
+        Parameters
+        ----------
+            key : Tuple[int, int, Hashable]
+                The key of the route.
+            order : List[int]
+                The visiting order of the route.
+            length : float
+                The length of the route in miles.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        if key in self.entries:
+            self.entries.delete(key)
+        elif len(self.entries) >= self.capacity:
+            oldest, _ = self.entries.first()
+            self.entries.delete(oldest)
+            self.evictions += 1
+
+        self.entries.set(key, (list(order), length))
+
+    def clear(self) -> None:
+        """Removes every route and resets the statistics.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.__init__(self.capacity)
+
+    def hit_rate(self) -> float:
+        """Determines the fraction of lookups that found a route.
+
+        Returns
+        -------
+            float
+                The hit rate, or 0 if nothing has been looked up.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def enable_stats(self) -> None:
+        """Starts collecting probe statistics for the underlying table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.entries.enable_stats()
+
+    def disable_stats(self) -> None:
+        """Stops collecting probe statistics for the underlying table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.entries.disable_stats()
+
+    def report(self) -> List[str]:
+        """Returns a report of the cache statistics and the shape of the underlying table.
+
+        Returns
+        -------
+            List[str]
+                The lines of the report.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return [
+            f'Routes={len(self.entries)} Capacity={self.capacity} Hits={self.hits} '
+            f'Misses={self.misses} Hit Rate={self.hit_rate():.2f} Evictions={self.evictions}'
+        ] + self.entries.report()
+
+    def __len__(self) -> int:
+        return len(self.entries)
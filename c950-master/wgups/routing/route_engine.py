@@ -0,0 +1,268 @@
+from math import inf
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from wgups.data.distance_table import DistanceTable
+from wgups.routing.package import Package
+from wgups.structures.clock import Clock
+from wgups.structures.int_table import IntTable
+
+
+class RouteEngine:
+    """A class which plans the order in which a truck visits the stops of its packages.
+    Packages are grouped by stop once, and the distances between the depot and every stop are
+    copied into a small matrix, so planning never touches the full distance table again.
+
+    Position 0 of the matrix is the depot and the remaining positions are the stops in
+    ascending node order, so ties between equally distant stops go to the lower node.
+
+    The nearest neighbor lists of the distance table are narrowed to the positions of the
+    route once, giving each position a candidate list of the other positions, closest first.
+    Route construction and local search look at the candidates before anything else, so
+    neither sorts or scans the matrix for a nearby stop.
+
+    The driving time of every leg is computed once per travel time function and kept with
+    the engine, so counting late stops and keying the route cache never convert miles to
+    minutes again.
+
+    Attributes
+    ----------
+        nodes : List[int]
+            The node of each position of the matrix, starting with the depot.
+        deliveries : IntTable[List[Package]]
+            The packages delivered at each node, in the order they were loaded.
+        distances : np.ndarray
+            The distances between the positions.
+        deadlines : List[float]
+            The earliest deadline, in seconds, of the packages delivered at each position. The
+            depot has no deadline.
+        neighbors : List[List[int]]
+            The other positions among the nearest neighbors of each position, closest first.
+        timings : Optional[Tuple[Callable[[float], int], np.ndarray]]
+            The last travel time function used and the minutes of each leg under it.
+    """
+
+    nodes: List[int]
+    deliveries: IntTable[List[Package]]
+    distances: np.ndarray
+    deadlines: List[float]
+    neighbors: List[List[int]]
+    timings: Optional[Tuple[Callable[[float], int], np.ndarray]]
+
+    def __init__(self, distance_table: DistanceTable, packages: Iterable[Package]) -> None:
+        self.deliveries = IntTable()
+        for package in packages:
+            if package.node not in self.deliveries:
+                self.deliveries.set(package.node, [])
+            self.deliveries.get(package.node).append(package)
+
+        self.nodes = [distance_table.depot_index] + sorted(self.deliveries.keys())
+        self.distances = distance_table.submatrix(self.nodes)
+        self.deadlines = [inf] + [
+            min(package.deadline.total_seconds for package in self.deliveries.get(node))
+            for node in self.nodes[1:]
+        ]
+
+        positions = IntTable()
+        for position, node in enumerate(self.nodes):
+            positions.set(node, position)
+        self.neighbors = [[positions.get(neighbor) for neighbor in distance_table.neighbors_of(node)
+                           if neighbor != node and neighbor in positions]
+                          for node in self.nodes]
+        self.timings = None
+
+    def travel_minutes(self, travel_time: Callable[[float], int]) -> np.ndarray:
+        """Returns the minutes the truck takes to drive each leg between two positions. The
+        matrix is computed on the first call and reused while the travel time stays the same.
+
+        Parameters
+        ----------
+            travel_time : Callable[[float], int]
+                The minutes the truck takes to drive a number of miles.
+
+        Returns
+        -------
+            np.ndarray
+                The matrix in which entry `[i, j]` is the minutes from position `i` to `j`.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(1) for a known travel time, otherwise O(m^2)
+        """
+        if self.timings is None or self.timings[0] != travel_time:
+            minutes = np.array([travel_time(miles) for miles in self.distances.flat],
+                               dtype=np.int64).reshape(self.distances.shape)
+            self.timings = (travel_time, minutes)
+
+        return self.timings[1]
+
+    def late_stops(self, route: List[int], departure_time: Clock,
+                   travel_time: Callable[[float], int]) -> int:
+        """Counts the stops of a route that are reached after their deadline.
+
+        Parameters
+        ----------
+            route : List[int]
+                The positions visited in order, starting with the depot. Positions past the
+                last stop of the matrix are ignored.
+            departure_time : Clock
+                The time the truck leaves the depot.
+            travel_time : Callable[[float], int]
+                The minutes the truck takes to drive a number of miles.
+
+        Returns
+        -------
+            int
+                The number of late stops.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        minutes = self.travel_minutes(travel_time)
+        late = 0
+        time = departure_time.total_seconds
+        size = len(self.nodes)
+
+        for previous, position in zip(route, route[1:]):
+            if position >= size:
+                break
+            time += minutes.item(previous, position) * 60
+            if time > self.deadlines[position]:
+                late += 1
+
+        return late
+
+    def nearest_neighbor(self) -> List[int]:
+        """Orders the stops by repeatedly visiting the closest unvisited stop.
+
+        Returns
+        -------
+            List[int]
+                The positions of the stops in visiting order, excluding the depot.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m*k) while the candidate lists hold an unvisited stop, at most O(m^2)
+        """
+        visited = [False] * len(self.nodes)
+        visited[0] = True
+
+        order = []
+        current = 0
+        for _ in range(len(self.nodes) - 1):
+            current = self.nearest_unvisited(current, visited)
+            visited[current] = True
+            order.append(current)
+
+        return order
+
+    def nearest_unvisited(self, current: int, visited: List[bool]) -> Optional[int]:
+        """Finds the closest stop that has not been visited. The candidate list of the current
+        position is checked first, closest first, and only if every candidate has been visited
+        are the remaining stops scanned.
+
+        Parameters
+        ----------
+            current : int
+                The current position.
+            visited : List[bool]
+                Whether each position has been visited. The depot counts as visited.
+
+        Returns
+        -------
+            Optional[int]
+                The position of the closest unvisited stop, or `None` if every stop has been
+                visited.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(k) when a candidate is unvisited, otherwise O(k + m)
+        """
+        for neighbor in self.neighbors[current]:
+            if not visited[neighbor]:
+                return neighbor
+
+        row = self.distances[current]
+        return min((position for position in range(1, len(self.nodes)) if not visited[position]),
+                   key=lambda position: (row.item(position), position), default=None)
+
+    def length(self, order: List[int], return_to_depot: bool) -> float:
+        """Determines the distance driven when the stops are visited in the specified order.
+
+        Parameters
+        ----------
+            order : List[int]
+                The positions of the stops in visiting order, excluding the depot.
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            float
+                The distance of the route.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        route = [0] + order + ([0] if return_to_depot else [])
+        return sum(self.distances.item(a, b) for a, b in zip(route, route[1:]))
+
+    def legs(self, order: List[int], return_to_depot: bool
+             ) -> List[Tuple[float, List[Package]]]:
+        """Lists the legs driven when the stops are visited in the specified order.
+
+        Parameters
+        ----------
+            order : List[int]
+                The positions of the stops in visiting order, excluding the depot.
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            List[Tuple[float, List[Package]]]
+                The distance of each leg and the packages delivered at its end. The leg back
+                to the depot delivers no packages.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        legs = []
+        current = 0
+        for position in order:
+            legs.append((self.distances.item(current, position),
+                         self.deliveries.get(self.nodes[position])))
+            current = position
+
+        if return_to_depot:
+            legs.append((self.distances.item(current, 0), []))
+
+        return legs
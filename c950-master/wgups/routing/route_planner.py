@@ -0,0 +1,239 @@
+from typing import Callable, Hashable, List, Optional
+
+from wgups.routing.held_karp import HeldKarp
+from wgups.routing.insertion_builder import InsertionBuilder
+from wgups.routing.local_search import LocalSearch
+from wgups.routing.route_cache import RouteCache
+from wgups.routing.route_engine import RouteEngine
+from wgups.structures.clock import Clock
+
+
+class RoutePlanner:
+    """A class which chooses the order in which a truck visits its stops. Routes with fewer
+    distinct stops than `exact_threshold` are solved exactly by `HeldKarp`. Larger routes are
+    built by the `construction` heuristic and, if `improve` is set, shortened afterwards by a
+    `LocalSearch` within the configured budget. The budget counts accepted moves and priced
+    moves, so plans are reproducible, unless a wall-clock `time_limit` is also set.
+
+    Routes are built either by visiting the nearest stop next or, to keep deadlines, by the
+    time-window-aware cheapest insertion of `InsertionBuilder`. The exact route is the
+    shortest, but it is only used if it has no more late stops than the built route. Otherwise
+    the route is handled as if it were above the threshold.
+
+    Planned routes are remembered in a `RouteCache`, so planning the same stops again costs a
+    single lookup. Planners may share one cache, in which case each planner only finds the
+    routes planned with the same settings. Routes built by visiting the nearest stop next
+    without any further search do not depend on time and are shared across departure times.
+
+    Class Attributes
+    ----------------
+        NEAREST_NEIGHBOR : str
+            Builds routes by visiting the nearest unvisited stop next.
+        INSERTION : str
+            Builds routes by cheapest insertion without making any stop late.
+
+    Attributes
+    ----------
+        construction : str
+            The heuristic used to build routes, either `NEAREST_NEIGHBOR` or `INSERTION`.
+        exact_threshold : int
+            The number of distinct stops below which routes are solved exactly. Each stop
+            doubles the time and memory of the exact solver, so values above 16 are costly.
+        improve : bool
+            Whether routes are shortened with 2-opt and Or-opt moves after being built.
+        max_iterations : int
+            The largest number of moves the local search may accept per route.
+        time_limit : Optional[float]
+            The largest number of seconds the local search may spend per route, or `None`
+            for no wall-clock limit.
+        max_evaluations : int
+            The largest number of candidate moves the local search may price per route.
+        cache : RouteCache
+            The routes already planned.
+    """
+
+    NEAREST_NEIGHBOR = 'nearest_neighbor'
+    INSERTION = 'insertion'
+
+    construction: str
+    exact_threshold: int
+    improve: bool
+    max_iterations: int
+    time_limit: Optional[float]
+    max_evaluations: int
+    cache: RouteCache
+
+    def __init__(self, improve: bool = False, max_iterations: int = 1000,
+                 time_limit: Optional[float] = None, exact_threshold: int = 0,
+                 construction: str = NEAREST_NEIGHBOR,
+                 cache: Optional[RouteCache] = None, max_evaluations: int = 100000) -> None:
+        if construction not in (self.NEAREST_NEIGHBOR, self.INSERTION):
+            raise ValueError(f'Unknown route construction: {construction}')
+
+        self.construction = construction
+        self.exact_threshold = exact_threshold
+        self.improve = improve
+        self.max_iterations = max_iterations
+        self.time_limit = time_limit
+        self.max_evaluations = max_evaluations
+        self.cache = cache or RouteCache()
+
+    def plan(self, engine: RouteEngine, departure_time: Clock,
+             travel_time: Callable[[float], int], return_to_depot: bool) -> List[int]:
+        """Chooses the visiting order of the stops of a route, reusing the cached order if
+        the same stops have been planned before.
+
+        Parameters
+        ----------
+            engine : RouteEngine
+                The stops of the route and the distances between them.
+            departure_time : Clock
+                The time the truck leaves the depot.
+            travel_time : Callable[[float], int]
+                The minutes the truck takes to drive a number of miles.
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            List[int]
+                The positions of the stops in visiting order, excluding the depot.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(m^2) for a cached route, otherwise as `solve`
+        """
+        key = RouteCache.key(engine.nodes[0], engine.nodes[1:],
+                             self.variant(engine, departure_time, travel_time, return_to_depot))
+
+        route = self.cache.get(key)
+        if route is not None:
+            return list(route[0])
+
+        order = self.solve(engine, departure_time, travel_time, return_to_depot)
+        self.cache.set(key, order, engine.length(order, return_to_depot))
+        return order
+
+    def variant(self, engine: RouteEngine, departure_time: Clock,
+                travel_time: Callable[[float], int], return_to_depot: bool) -> Hashable:
+        """Describes everything other than the stops that the planned route depends on.
+        Deadlines, the departure time and the travel time are only included if the route can
+        depend on them.
+
+        Parameters
+        ----------
+            engine : RouteEngine
+                The stops of the route and the distances between them.
+            departure_time : Clock
+                The time the truck leaves the depot.
+            travel_time : Callable[[float], int]
+                The minutes the truck takes to drive a number of miles.
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            Hashable
+                The variant of the cache key.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(m^2) to copy the leg times, which the engine computes once per travel time
+        """
+        settings = (self.construction, self.exact_threshold, self.improve,
+                    self.max_iterations, self.max_evaluations, self.time_limit, return_to_depot)
+        if self.construction == self.NEAREST_NEIGHBOR and not self.improve \
+                and len(engine.nodes) - 1 >= self.exact_threshold:
+            return settings
+
+        # Routes only see the travel time of legs between their own stops, so those minutes
+        # identify the travel time regardless of which truck supplied it. The engine computes
+        # them once, and the planner reuses them for the route itself
+        minutes = engine.travel_minutes(travel_time).tobytes()
+        return settings + (departure_time.total_seconds, tuple(engine.deadlines), minutes)
+
+    def solve(self, engine: RouteEngine, departure_time: Clock,
+              travel_time: Callable[[float], int], return_to_depot: bool) -> List[int]:
+        """Plans the visiting order of the stops of a route without consulting the cache.
+
+        Parameters
+        ----------
+            engine : RouteEngine
+                The stops of the route and the distances between them.
+            departure_time : Clock
+                The time the truck leaves the depot.
+            travel_time : Callable[[float], int]
+                The minutes the truck takes to drive a number of miles.
+            return_to_depot : bool
+                Whether the route ends with a leg back to the depot.
+
+        Returns
+        -------
+            List[int]
+                The positions of the stops in visiting order, excluding the depot.
+
+        Space Complexity
+        ---------------
+            O(m^2)
+
+        Time Complexity
+        ---------------
+            O(2^m*m^2) below the exact threshold, otherwise O(m^2) for nearest neighbor and
+            O(m^3) for insertion, and O(e*m) for e evaluations when improving
+        """
+        if self.construction == self.INSERTION:
+            order = InsertionBuilder(engine, departure_time, travel_time).build(return_to_depot)
+        else:
+            order = engine.nearest_neighbor()
+
+        if len(order) < self.exact_threshold:
+            exact = HeldKarp(engine).solve(
+                return_to_depot, engine.length(order, return_to_depot))
+            if exact is not None and self.late_stops(engine, exact, departure_time, travel_time) \
+                    <= self.late_stops(engine, order, departure_time, travel_time):
+                return exact
+
+        if self.improve:
+            search = LocalSearch(engine, departure_time, travel_time, self.max_iterations,
+                                 self.max_evaluations, self.time_limit)
+            order = search.improve(order, return_to_depot)
+
+        return order
+
+    def late_stops(self, engine: RouteEngine, order: List[int], departure_time: Clock,
+                   travel_time: Callable[[float], int]) -> int:
+        """Counts the stops reached after their deadline when visited in the specified order.
+
+        Parameters
+        ----------
+            engine : RouteEngine
+                The stops of the route and the distances between them.
+            order : List[int]
+                The positions of the stops in visiting order, excluding the depot.
+            departure_time : Clock
+                The time the truck leaves the depot.
+            travel_time : Callable[[float], int]
+                The minutes the truck takes to drive a number of miles.
+
+        Returns
+        -------
+            int
+                The number of late stops.
+
+        Space Complexity
+        ---------------
+            O(m)
+
+        Time Complexity
+        ---------------
+            O(m)
+        """
+        return engine.late_stops([0] + order, departure_time, travel_time)
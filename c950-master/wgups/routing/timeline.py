@@ -0,0 +1,275 @@
+from bisect import bisect_left
+from typing import Iterable, List, Optional, Tuple
+
+from wgups.routing.event_log import Event, EventKind, EventLog
+from wgups.routing.package import Package, PackageStatus
+from wgups.routing.truck import TruckStatus
+from wgups.structures.clock import Clock
+from wgups.structures.int_table import IntTable
+
+# A change made by one event: whether it concerns a truck, the position of the package or
+# truck, and its status before and after the event
+Change = Tuple[bool, int, object, object]
+
+
+class Timeline:
+    """A class which answers what state every package and truck is in at any time of the
+    delivery day. The ordered event log is replayed once, recording the change each event
+    makes, and a copy of the whole state is kept every `interval` events.
+
+    A query bisects the event times to find how many events happened before the query time.
+    The current state is then moved there one change at a time, forwards or backwards, so
+    scrubbing between nearby times only costs the events in between. Distant jumps first
+    restore the nearest copy. The interval is at least the number of packages and trucks,
+    which keeps the copies within the size of the log and means a jump never applies more
+    changes than it would take to copy the state.
+
+    An event only takes effect after its time, matching `Package.status_at`, so a package
+    delivered at 10:00 is still on its truck at exactly 10:00.
+
+    Class Attributes
+    ----------------
+        MIN_INTERVAL : int
+            The fewest events between copies of the state.
+
+    Attributes
+    ----------
+        packages : List[Package]
+            The packages ordered by identifier.
+        truck_ids : List[int]
+            The identifiers of the trucks in ascending order.
+        package_positions : IntTable[int]
+            The position of each package in `packages`.
+        truck_positions : IntTable[int]
+            The position of each truck in `truck_ids`.
+        events : List[Event]
+            The events ordered by time.
+        times : List[int]
+            The time of each event, in seconds.
+        changes : List[Tuple[bool, int, object, object]]
+            The change made by each event.
+        interval : int
+            The number of events between copies of the state.
+        checkpoints : List[Tuple[List[PackageStatus], List[TruckStatus]]]
+            The state after every `interval` events, starting with the initial state.
+        position : int
+            The number of events applied to the current state.
+        package_states : List[PackageStatus]
+            The current status of each package.
+        truck_states : List[TruckStatus]
+            The current status of each truck.
+    """
+
+    MIN_INTERVAL = 64
+
+    packages: List[Package]
+    truck_ids: List[int]
+    package_positions: IntTable[int]
+    truck_positions: IntTable[int]
+    events: List[Event]
+    times: List[int]
+    changes: List[Change]
+    interval: int
+    checkpoints: List[Tuple[List[PackageStatus], List[TruckStatus]]]
+    position: int
+    package_states: List[PackageStatus]
+    truck_states: List[TruckStatus]
+
+    def __init__(self, events: EventLog, packages: Iterable[Package],
+                 truck_ids: Iterable[int]) -> None:
+        self.packages = sorted(packages, key=lambda package: package.id)
+        self.truck_ids = sorted(truck_ids)
+        self.package_positions = IntTable()
+        for position, package in enumerate(self.packages):
+            self.package_positions.set(package.id, position)
+        self.truck_positions = IntTable()
+        for position, truck_id in enumerate(self.truck_ids):
+            self.truck_positions.set(truck_id, position)
+
+        self.events = events.ordered()
+        self.times = [event.time.total_seconds for event in self.events]
+        self.interval = max(self.MIN_INTERVAL, len(self.packages) + len(self.truck_ids))
+        self.replay()
+
+    def replay(self) -> None:
+        """Applies every event in order from the start of the day, recording the change each
+        event makes and copying the state every `interval` events.
+
+        Space Complexity
+        ---------------
+            O(e)
+
+        Time Complexity
+        ---------------
+            O(e)
+        """
+        self.package_states = [PackageStatus.AWAITING_DELIVERY] * len(self.packages)
+        self.truck_states = [TruckStatus.AT_DEPOT] * len(self.truck_ids)
+        self.checkpoints = [(list(self.package_states), list(self.truck_states))]
+        self.changes = []
+
+        for count, event in enumerate(self.events, 1):
+            if event.package_id is not None:
+                states = self.package_states
+                position = self.package_positions.get(event.package_id)
+                after = PackageStatus.ON_TRUCK if event.kind == EventKind.LOAD \
+                    else PackageStatus.DELIVERED
+            else:
+                states = self.truck_states
+                position = self.truck_positions.get(event.truck_id)
+                after = TruckStatus.EN_ROUTE if event.kind == EventKind.DEPART \
+                    else TruckStatus.AT_DEPOT
+
+            self.changes.append((states is self.truck_states, position, states[position], after))
+            states[position] = after
+
+            if count % self.interval == 0:
+                self.checkpoints.append((list(self.package_states), list(self.truck_states)))
+
+        self.position = len(self.events)
+
+    def seek(self, time: Clock) -> None:
+        """Moves the current state to the specified time.
+
+        Parameters
+        ----------
+            time : Clock
+                The time.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(log(e) + d) for d events between the current and specified times, and at most
+            O(log(e) + n) for n packages and trucks
+        """
+        target = bisect_left(self.times, time.total_seconds)
+
+        # Restore the nearest copy if it is closer than the current state
+        if abs(target - self.position) > self.interval:
+            checkpoint = min(round(target / self.interval), len(self.checkpoints) - 1)
+            package_states, truck_states = self.checkpoints[checkpoint]
+            self.package_states = list(package_states)
+            self.truck_states = list(truck_states)
+            self.position = checkpoint * self.interval
+
+        changes = self.changes
+        while self.position < target:
+            is_truck, position, _, after = changes[self.position]
+            (self.truck_states if is_truck else self.package_states)[position] = after
+            self.position += 1
+
+        while self.position > target:
+            self.position -= 1
+            is_truck, position, before, _ = changes[self.position]
+            (self.truck_states if is_truck else self.package_states)[position] = before
+
+    def package_status(self, identifier: int, time: Clock) -> Optional[PackageStatus]:
+        """Returns the status of a package at the specified time.
+
+        Parameters
+        ----------
+            identifier : int
+                The identifier of the package.
+            time : Clock
+                The time.
+
+        Returns
+        -------
+            Optional[PackageStatus]
+                The status of the package, or `None` if the package is not on the timeline.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            As `seek`
+        """
+        position = self.package_positions.get(identifier)
+        if position is None:
+            return None
+
+        self.seek(time)
+        return self.package_states[position]
+
+    def packages_at(self, time: Clock) -> List[Tuple[Package, PackageStatus]]:
+        """Returns the status of every package at the specified time.
+
+        Parameters
+        ----------
+            time : Clock
+                The time.
+
+        Returns
+        -------
+            List[Tuple[Package, PackageStatus]]
+                The (package, status) pairs ordered by package identifier.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n) in addition to `seek`
+        """
+        self.seek(time)
+        return list(zip(self.packages, self.package_states))
+
+    def trucks_at(self, time: Clock) -> List[Tuple[int, TruckStatus]]:
+        """Returns the status of every truck at the specified time.
+
+        Parameters
+        ----------
+            time : Clock
+                The time.
+
+        Returns
+        -------
+            List[Tuple[int, TruckStatus]]
+                The (truck identifier, status) pairs ordered by truck identifier.
+
+        Space Complexity
+        ---------------
+            O(t)
+
+        Time Complexity
+        ---------------
+            O(t) in addition to `seek`
+        """
+        self.seek(time)
+        return list(zip(self.truck_ids, self.truck_states))
+
+    def events_between(self, start: Clock, end: Clock) -> List[Event]:
+        """Returns the events that separate the state at the start time from the state at
+        the end time, which are those from the start time up to but excluding the end time.
+
+        Parameters
+        ----------
+            start : Clock
+                The start time.
+            end : Clock
+                The end time.
+
+        Returns
+        -------
+            List[Event]
+                The events ordered by time.
+
+        Space Complexity
+        ---------------
+            O(k)
+
+        Time Complexity
+        ---------------
+            O(log(e) + k) for k events
+        """
+        return self.events[bisect_left(self.times, start.total_seconds):
+                           bisect_left(self.times, end.total_seconds)]
+
+    def __len__(self) -> int:
+        return len(self.events)
@@ -1,10 +1,28 @@
-from typing import List
+from enum import Enum
+from typing import List, Optional
 
 from wgups.data.distance_table import DistanceTable
+from wgups.routing.event_log import EventKind, EventLog
 from wgups.routing.package import Package
+from wgups.routing.route_engine import RouteEngine
+from wgups.routing.route_planner import RoutePlanner
 from wgups.structures.clock import Clock
 
 
+class TruckStatus(Enum):
+    """A class representing the whereabouts of a truck.
+
+    Attributes
+    ----------
+    AT_DEPOT : int
+        The truck is at the depot.
+    EN_ROUTE : int
+        The truck has left the depot to deliver packages.
+    """
+    AT_DEPOT = 1
+    EN_ROUTE = 2
+
+
 class Truck:
     """A class which represents a truck delivering packages for the WGUPS.
 
@@ -20,6 +38,8 @@ class Truck:
             The earliest time that the truck can leave the hub.
         packages : List[Package]
             The packages that have been loaded onto the truck.
+        planner : RoutePlanner
+            Chooses the order in which the truck visits its stops.
     """
 
     id: int
@@ -27,15 +47,18 @@ class Truck:
     mph: int
     departure_time: Clock
     packages: List[Package]
+    planner: RoutePlanner
 
-    def __init__(self, id: int) -> None:
+    def __init__(self, id: int, planner: Optional[RoutePlanner] = None, capacity: int = 16,
+                 mph: int = 18, departure_time: Optional[Clock] = None) -> None:
         self.id = id
-        self.capacity = 16
-        self.mph = 18
+        self.capacity = capacity
+        self.mph = mph
         # Initialize the truck departure time to the start of the delivery day
-        self.departure_time = Clock(8)
+        self.departure_time = departure_time or Clock(8)
         self.current_time = Clock()
         self.packages: List[Package] = []
+        self.planner = planner or RoutePlanner()
 
     def is_full(self) -> bool:
         """Determines if the truck is full.
@@ -74,13 +97,13 @@ class Truck:
         self.departure_time = time
         self.current_time = self.departure_time if self.departure_time > self.current_time else self.current_time
 
-    def destinations(self) -> List[str]:
-        """Gets the list of destinations that will be visited by the truck.
+    def destinations(self) -> List[int]:
+        """Gets the list of destination nodes that will be visited by the truck.
 
         Returns
         -------
-            List[str]
-                The list of destinations that will be visited by the truck.
+            List[int]
+                The list of destination nodes that will be visited by the truck.
 
         Space Complexity
         ---------------
@@ -90,7 +113,7 @@ class Truck:
         ---------------
             O(n)
         """
-        return [package.street for package in self.packages]
+        return [package.node for package in self.packages]
 
     def can_load(self, n: int) -> bool:
         """Determines if the truck can accept `n` number of packages without
@@ -128,7 +151,7 @@ class Truck:
         ---------------
             O(1)
         """
-        package.pickup(self.departure_time.clone())
+        package.pickup(self.departure_time)
         self.packages.append(package)
 
     def load_packages(self, packages: List[Package]) -> None:
@@ -192,31 +215,8 @@ class Truck:
         """
         return package in self.packages
 
-    def can_deliver(self, package: Package) -> bool:
-        """Determines if the truck can deliver the specified package.
-
-        Parameters
-        ----------
-            package : Package
-                The package to check.
-
-        Returns
-        -------
-            bool
-                Returns `True` if the truck can deliver the package, otherwise returns
-                `False`.
-
-        Space Complexity
-        ---------------
-            O(1)
-
-        Time Complexity
-        ---------------
-            O(1)
-        """
-        return self.id in package.deliverable_by and self.departure_time >= package.arrival_time
-
-    def deliver_packages(self, distance_table: DistanceTable, return_to_depot: bool) -> None:
+    def deliver_packages(self, distance_table: DistanceTable, return_to_depot: bool,
+                         events: Optional[EventLog] = None) -> None:
         """Delivers all packages currently loaded on the truck.
 
         Parameters
@@ -226,6 +226,9 @@ class Truck:
             return_to_depot : bool
                 Whether or not the truck should return to the depot after finishing
                 its deliveries.
+            events : Optional[EventLog]
+                The log to record the loading, departure, deliveries and return of the
+                truck in, if any.
 
         Space Complexity
         ---------------
@@ -233,41 +236,36 @@ class Truck:
 
         Time Complexity
         ---------------
-            O(n^2*log(n))
+            O(n^2)
         """
-        current_location = distance_table.depot_address
-        destinations = self.destinations()
+        engine = RouteEngine(distance_table, self.packages)
+        order = self.planner.plan(engine, self.departure_time, self.travel_time, return_to_depot)
         total_time = self.departure_time
         total_distance = 0
 
-        while self.packages:
-            destinations = sorted(destinations,
-                                  key=lambda x: distance_table.distance(current_location, x))
-            closest = destinations.pop(0)
+        if events is not None:
+            for package in self.packages:
+                events.record(package.pickup_time, EventKind.LOAD, self.id, package.id)
+            events.record(self.departure_time, EventKind.DEPART, self.id)
 
-            distance = distance_table.distance(current_location, closest)
+        for distance, deliveries in engine.legs(order, return_to_depot):
             travel_time = self.travel_time(distance)
-            total_time.add_minutes(travel_time)
-
-            deliveries = [package for package in self.packages
-                          if package.street == closest]
+            total_time = total_time.add_minutes(travel_time)
 
             for package in deliveries:
-                self.packages.remove(package)
-                package.deliver(total_time.clone())
+                package.deliver(total_time)
+                if events is not None:
+                    events.record(total_time, EventKind.DELIVER, self.id, package.id)
 
-            current_location = closest
             total_distance += distance
 
-        if return_to_depot:
-            distance = distance_table.to_depot(current_location)
-            travel_time = self.travel_time(distance)
+        if events is not None and return_to_depot:
+            events.record(total_time, EventKind.RETURN, self.id)
 
-            total_distance += distance
-            total_time.add_minutes(travel_time)
+        self.packages = []
 
-        self.current_time = Clock(self.current_time.hours + total_time.hours,
-                                  self.current_time.minutes + total_time.minutes)
+        # The truck is available again once it has finished its route
+        self.current_time = total_time
         return total_distance
 
     def travel_time(self, miles: int) -> int:
@@ -1,33 +1,143 @@
 from __future__ import annotations
-from typing import Union
+from typing import Any, List, Optional, Union
+
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 60 * SECONDS_PER_MINUTE
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+MINUTES_PER_DAY = SECONDS_PER_DAY // SECONDS_PER_MINUTE
 
 
 class Clock:
-    """A class which represents a time in minutes since the start of the
-    delivery period.
+    """A class which represents a point on the delivery timeline with a resolution of one
+    second. The timeline starts at midnight of day 0 and does not wrap around, so times on
+    later days always compare as later.
+
+    Clocks are immutable, hashable values backed by a single integer epoch, so they can be
+    shared freely and used as keys. Arithmetic returns new clocks. Whole-minute times on
+    day 0 are interned, meaning that creating the same time twice returns the same object.
 
     Attributes
     ----------
-        total_minutes : int
-            The number of total minutes on the clock.
+        total_seconds : int
+            The number of seconds since midnight of day 0.
 
     Properties
     ----------
+        day : int
+            The day of the timeline the clock falls on.
         hours : int
-            The number of hours on the clock.
+            The number of hours on the clock, within its day.
         minutes : int
             The number of minutes on the clock.
+        seconds : int
+            The number of seconds on the clock.
+        total_minutes : int
+            The number of whole minutes since midnight of day 0.
     """
 
-    total_minutes: int
+    __slots__ = ('total_seconds',)
+
+    total_seconds: int
+
+    # Whole-minute clocks on day 0 indexed by minute of the day, created on first use
+    interned: List[Optional[Clock]] = [None] * MINUTES_PER_DAY
+
+    def __new__(cls, hours: int = 0, minutes: int = 0, seconds: int = 0, days: int = 0) -> Clock:
+        return cls.from_seconds(days * SECONDS_PER_DAY + hours * SECONDS_PER_HOUR +
+                                minutes * SECONDS_PER_MINUTE + seconds)
+
+    @classmethod
+    def from_seconds(cls, total_seconds: int) -> Clock:
+        """Creates a clock from a number of seconds since midnight of day 0.
+
+        Parameters
+        ----------
+            total_seconds : int
+                The number of seconds since midnight of day 0.
+
+        Returns
+        -------
+            Clock
+                The clock. Whole-minute clocks are shared.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        minute, second = divmod(total_seconds, SECONDS_PER_MINUTE)
+
+        if second == 0 and 0 <= minute < MINUTES_PER_DAY:
+            clock = cls.interned[minute]
+            if clock is None:
+                clock = object.__new__(cls)
+                object.__setattr__(clock, 'total_seconds', total_seconds)
+                cls.interned[minute] = clock
+            return clock
+
+        clock = object.__new__(cls)
+        object.__setattr__(clock, 'total_seconds', total_seconds)
+        return clock
 
-    def __init__(self, hours: int = 0, minutes: int = 0) -> None:
-        self.total_minutes = 0
-        self.add_minutes(hours * 60 + minutes)
+    @classmethod
+    def from_string(cls, time: str) -> Clock:
+        """Creates a clock from a time in HH:MM or HH:MM:SS format. Hours past 23 fall on
+        later days, so `26:00` is 02:00 on day 1.
+
+        Parameters
+        ----------
+            time : str
+                The time to parse.
+
+        Returns
+        -------
+            Clock
+                The clock.
+
+        Raises
+        ------
+            ValueError
+                The time is not in HH:MM or HH:MM:SS format.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        parts = time.split(':')
+        if len(parts) not in (2, 3):
+            raise ValueError(f'Invalid time format: {time}')
+
+        return cls(*map(int, parts))
+
+    @property
+    def day(self) -> int:
+        """Determines the day of the timeline the clock falls on.
+
+        Returns
+        -------
+            int
+                The day, starting from 0.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.total_seconds // SECONDS_PER_DAY
 
     @property
     def hours(self) -> int:
-        """Determines the number of hours on the clock.
+        """Determines the number of hours on the clock, within its day.
 
         Returns
         -------
@@ -42,7 +152,7 @@ class Clock:
         ---------------
             O(1)
         """
-        return self.total_minutes // 60
+        return self.total_seconds // SECONDS_PER_HOUR % 24
 
     @property
     def minutes(self) -> int:
@@ -61,16 +171,141 @@ class Clock:
         ---------------
             O(1)
         """
-        return self.total_minutes % 60
+        return self.total_seconds // SECONDS_PER_MINUTE % 60
+
+    @property
+    def seconds(self) -> int:
+        """Determines the number of seconds on the clock.
 
-    def add_minutes(self, minutes: int) -> None:
-        """Adds the specified number of minutes to the clock.
+        Returns
+        -------
+            int
+                The number of seconds on the clock.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.total_seconds % SECONDS_PER_MINUTE
+
+    @property
+    def total_minutes(self) -> int:
+        """Determines the number of whole minutes since midnight of day 0.
+
+        Returns
+        -------
+            int
+                The number of whole minutes since midnight of day 0.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.total_seconds // SECONDS_PER_MINUTE
+
+    def time_of_day(self) -> Clock:
+        """Returns the same time of day on day 0.
+
+        Returns
+        -------
+            Clock
+                The time of day.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return Clock.from_seconds(self.total_seconds % SECONDS_PER_DAY)
+
+    def on_day(self, day: int) -> Clock:
+        """Returns the same time of day on the specified day.
+
+        Parameters
+        ----------
+            day : int
+                The day of the timeline.
+
+        Returns
+        -------
+            Clock
+                The clock on the specified day.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return Clock.from_seconds(day * SECONDS_PER_DAY + self.total_seconds % SECONDS_PER_DAY)
+
+    def start_of_day(self) -> Clock:
+        """Returns midnight at the start of the clock's day.
+
+        Returns
+        -------
+            Clock
+                The start of the day.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return Clock.from_seconds(self.day * SECONDS_PER_DAY)
+
+    def add_seconds(self, seconds: int) -> Clock:
+        """Returns a clock the specified number of seconds later.
+
+        Parameters
+        ----------
+            seconds : int
+                The number of seconds to add.
+
+        Returns
+        -------
+            Clock
+                The later clock.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return Clock.from_seconds(self.total_seconds + seconds)
+
+    def add_minutes(self, minutes: int) -> Clock:
+        """Returns a clock the specified number of minutes later.
 
         Parameters
         ----------
             minutes : int
                 The number of minutes to add.
 
+        Returns
+        -------
+            Clock
+                The later clock.
+
         Space Complexity
         ---------------
             O(1)
@@ -79,17 +314,21 @@ class Clock:
         ---------------
             O(1)
         """
-        self.total_minutes += minutes
-        self.total_minutes = self.total_minutes % (60 * 24)
+        return Clock.from_seconds(self.total_seconds + minutes * SECONDS_PER_MINUTE)
 
-    def add_hours(self, hours: int) -> None:
-        """Adds the specified number of hours to the clock.
+    def add_hours(self, hours: int) -> Clock:
+        """Returns a clock the specified number of hours later.
 
         Parameters
         ----------
             hours : int
                 The number of hours to add.
 
+        Returns
+        -------
+            Clock
+                The later clock.
+
         Space Complexity
         ---------------
             O(1)
@@ -98,15 +337,15 @@ class Clock:
         ---------------
             O(1)
         """
-        self.add_minutes(hours * 60)
+        return Clock.from_seconds(self.total_seconds + hours * SECONDS_PER_HOUR)
 
     def clone(self) -> Clock:
-        """Creates a clone of the clock.
+        """Returns the clock itself. Clocks are immutable, so no copy is needed.
 
         Returns
         -------
             Clock
-                The clone of the clock.
+                The clock.
 
         Space Complexity
         ---------------
@@ -116,25 +355,361 @@ class Clock:
         ---------------
             O(1)
         """
-        return Clock(self.hours, self.minutes)
+        return self
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('Clock is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('Clock is immutable')
+
+    def __reduce__(self) -> Any:
+        return (Clock.from_seconds, (self.total_seconds,))
+
+    def __add__(self, span: Span) -> Clock:
+        if not isinstance(span, Span):
+            return NotImplemented
+        return Clock.from_seconds(self.total_seconds + span.total_seconds)
+
+    def __sub__(self, other: Any) -> Any:
+        if isinstance(other, Clock):
+            return Span.from_seconds(self.total_seconds - other.total_seconds)
+        if isinstance(other, Span):
+            return Clock.from_seconds(self.total_seconds - other.total_seconds)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.total_seconds)
 
     def __eq__(self, other: Clock) -> bool:
-        return self.total_minutes == other.total_minutes
+        if not isinstance(other, Clock):
+            return NotImplemented
+        return self.total_seconds == other.total_seconds
 
     def __lt__(self, other: Clock) -> bool:
-        return self.total_minutes < other.total_minutes
+        return self.total_seconds < other.total_seconds
 
     def __gt__(self, other: Clock) -> bool:
-        return self.total_minutes > other.total_minutes
+        return self.total_seconds > other.total_seconds
 
     def __le__(self, other: Clock) -> bool:
-        return self.__eq__(other) or self.__lt__(other)
+        return self.total_seconds <= other.total_seconds
 
     def __ge__(self, other: Clock) -> bool:
-        return self.__eq__(other) or self.__gt__(other)
+        return self.total_seconds >= other.total_seconds
 
     def __repr__(self):
-        return f'{self.hours:02d}:{self.minutes:02d}'
+        time = f'{self.hours:02d}:{self.minutes:02d}'
+        if self.seconds:
+            time += f':{self.seconds:02d}'
+        if self.day:
+            time = f'Day {self.day} {time}'
+        return time
 
     def __str__(self):
         return self.__repr__()
+
+
+class Span:
+    """A class which represents a length of time on the delivery timeline, with a resolution
+    of one second. Spans may be negative and, like clocks, are immutable and hashable.
+
+    Attributes
+    ----------
+        total_seconds : int
+            The length of the span in seconds.
+    """
+
+    __slots__ = ('total_seconds',)
+
+    total_seconds: int
+
+    def __new__(cls, hours: int = 0, minutes: int = 0, seconds: int = 0, days: int = 0) -> Span:
+        return cls.from_seconds(days * SECONDS_PER_DAY + hours * SECONDS_PER_HOUR +
+                                minutes * SECONDS_PER_MINUTE + seconds)
+
+    @classmethod
+    def from_seconds(cls, total_seconds: int) -> Span:
+        """Creates a span from a number of seconds.
+
+        Parameters
+        ----------
+            total_seconds : int
+                The length of the span in seconds.
+
+        Returns
+        -------
+            Span
+                The span.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        span = object.__new__(cls)
+        object.__setattr__(span, 'total_seconds', total_seconds)
+        return span
+
+    @property
+    def total_minutes(self) -> int:
+        """Determines the length of the span in whole minutes.
+
+        Returns
+        -------
+            int
+                The length of the span in whole minutes.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.total_seconds // SECONDS_PER_MINUTE
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('Span is immutable')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError('Span is immutable')
+
+    def __reduce__(self) -> Any:
+        return (Span.from_seconds, (self.total_seconds,))
+
+    def __add__(self, other: Any) -> Any:
+        if isinstance(other, Span):
+            return Span.from_seconds(self.total_seconds + other.total_seconds)
+        if isinstance(other, Clock):
+            return Clock.from_seconds(other.total_seconds + self.total_seconds)
+        return NotImplemented
+
+    def __sub__(self, other: Span) -> Span:
+        if not isinstance(other, Span):
+            return NotImplemented
+        return Span.from_seconds(self.total_seconds - other.total_seconds)
+
+    def __neg__(self) -> Span:
+        return Span.from_seconds(-self.total_seconds)
+
+    def __hash__(self) -> int:
+        return hash(self.total_seconds)
+
+    def __eq__(self, other: Span) -> bool:
+        if not isinstance(other, Span):
+            return NotImplemented
+        return self.total_seconds == other.total_seconds
+
+    def __lt__(self, other: Span) -> bool:
+        return self.total_seconds < other.total_seconds
+
+    def __gt__(self, other: Span) -> bool:
+        return self.total_seconds > other.total_seconds
+
+    def __le__(self, other: Span) -> bool:
+        return self.total_seconds <= other.total_seconds
+
+    def __ge__(self, other: Span) -> bool:
+        return self.total_seconds >= other.total_seconds
+
+    def __repr__(self):
+        sign = '-' if self.total_seconds < 0 else ''
+        days, remainder = divmod(abs(self.total_seconds), SECONDS_PER_DAY)
+        hours, remainder = divmod(remainder, SECONDS_PER_HOUR)
+        minutes, seconds = divmod(remainder, SECONDS_PER_MINUTE)
+        span = f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+        return f'{sign}{days}d {span}' if days else f'{sign}{span}'
+
+    def __str__(self):
+        return self.__repr__()
+
+
+class TimeRange:
+    """A class which represents the half-open interval of the delivery timeline that begins at
+    `start` and ends just before `end`.
+
+    Attributes
+    ----------
+        start : Clock
+            The first time within the range.
+        end : Clock
+            The first time after the range.
+    """
+
+    __slots__ = ('start', 'end')
+
+    start: Clock
+    end: Clock
+
+    def __init__(self, start: Clock, end: Clock) -> None:
+        if end < start:
+            raise ValueError(f'The range end {end} is before its start {start}.')
+
+        object.__setattr__(self, 'start', start)
+        object.__setattr__(self, 'end', end)
+
+    @classmethod
+    def for_day(cls, day: int) -> TimeRange:
+        """Creates a range covering an entire day of the timeline.
+
+        Parameters
+        ----------
+            day : int
+                The day of the timeline.
+
+        Returns
+        -------
+            TimeRange
+                The range from midnight of the day to midnight of the following day.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return cls(Clock(days=day), Clock(days=day + 1))
+
+    def duration(self) -> Span:
+        """Determines the length of the range.
+
+        Returns
+        -------
+            Span
+                The length of the range.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.end - self.start
+
+    def contains(self, time: Clock) -> bool:
+        """Determines if the specified time falls within the range.
+
+        Parameters
+        ----------
+            time : Clock
+                The time to check.
+
+        Returns
+        -------
+            bool
+                Returns `True` if the time is within the range, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.start.total_seconds <= time.total_seconds < self.end.total_seconds
+
+    def overlaps(self, other: TimeRange) -> bool:
+        """Determines if the range shares any time with another range.
+
+        Parameters
+        ----------
+            other : TimeRange
+                The range to check.
+
+        Returns
+        -------
+            bool
+                Returns `True` if the ranges overlap, otherwise returns `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.start < other.end and other.start < self.end
+
+    def intersection(self, other: TimeRange) -> Optional[TimeRange]:
+        """Determines the time shared by the range and another range.
+
+        Parameters
+        ----------
+            other : TimeRange
+                The other range.
+
+        Returns
+        -------
+            Optional[TimeRange]
+                The shared range, or `None` if the ranges do not overlap.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        if not self.overlaps(other):
+            return None
+        return TimeRange(max(self.start, other.start), min(self.end, other.end))
+
+    def split_by_day(self) -> List[TimeRange]:
+        """Splits the range at every midnight it crosses.
+
+        Returns
+        -------
+            List[TimeRange]
+                The portion of the range on each day it covers, in order.
+
+        Space Complexity
+        ---------------
+            O(d)
+
+        Time Complexity
+        ---------------
+            O(d)
+        """
+        ranges = []
+        start = self.start
+
+        while start < self.end:
+            end = min(self.end, Clock(days=start.day + 1))
+            ranges.append(TimeRange(start, end))
+            start = end
+
+        return ranges
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError('TimeRange is immutable')
+
+    def __contains__(self, time: Union[Clock, TimeRange]) -> bool:
+        if isinstance(time, TimeRange):
+            return self.start <= time.start and time.end <= self.end
+        return self.contains(time)
+
+    def __hash__(self) -> int:
+        return hash((self.start, self.end))
+
+    def __eq__(self, other: TimeRange) -> bool:
+        if not isinstance(other, TimeRange):
+            return NotImplemented
+        return self.start == other.start and self.end == other.end
+
+    def __repr__(self) -> str:
+        return f'[{self.start}, {self.end})'
+
+    def __str__(self) -> str:
+        return self.__repr__()
@@ -1,17 +1,59 @@
-from typing import Generic, List, MutableMapping, Optional, Tuple, TypeVar, Union
+from __future__ import annotations
+from array import array
+from math import ceil
+from typing import (Any, Dict, Generic, Iterable, Iterator, List, MutableMapping, Optional,
+                    Sequence, Tuple, TypeVar, Union)
+
+from wgups.structures.table_stats import TableStats
 
 
 class EmptySlot:
-    """A class which serves as a marker of empty slots within the hash table.
+    """A class which serves as a marker of removed entries within the hash table. Markers are
+    compared by identity, so each tag has a single marker, which is also what a pickled
+    marker is restored to.
 
     Attributes
     ----------
+        markers : Dict[str, EmptySlot]
+            The marker of each tag.
         tag : str
-            A tag which marks the empty slot.
+            A tag which marks the removed entry.
     """
 
+    __slots__ = ('tag',)
+
+    markers: Dict[str, EmptySlot] = {}
+
     def __init__(self, tag: str) -> None:
         self.tag = tag
+        EmptySlot.markers[tag] = self
+
+    @classmethod
+    def named(cls, tag: str) -> EmptySlot:
+        """Finds the marker of a tag.
+
+        Parameters
+        ----------
+            tag : str
+                The tag.
+
+        Returns
+        -------
+            EmptySlot
+                The marker.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return cls.markers[tag]
+
+    def __reduce__(self) -> Any:
+        return (EmptySlot.named, (self.tag,))
 
     def __repr__(self) -> str:
         return self.tag
@@ -22,42 +64,294 @@ class EmptySlot:
 
 K = TypeVar('K')
 V = TypeVar('V')
-Table = List[Union[EmptySlot, V]]
+
+# Marks a dense entry whose (key, value) pair has been deleted
+REMOVED = EmptySlot('REMOVED')
+
+
+def index_typecode(capacity: int) -> str:
+    """Determines the smallest signed array typecode able to address `capacity` entries.
+
+    Parameters
+    ----------
+        capacity : int
+            The number of slots in the index array.
+
+    Returns
+    -------
+        str
+            The `array` typecode for the index array.
+
+    Space Complexity
+    ---------------
+        O(1)
+
+    Time Complexity
+    ---------------
+        O(1)
+    """
+    if capacity < 2 ** 7:
+        return 'b'
+    if capacity < 2 ** 15:
+        return 'h'
+    if capacity < 2 ** 31:
+        return 'i'
+    return 'q'
 
 
 class HashSet(Generic[K, V], MutableMapping[K, V]):
     """Implementation of a hash table using linear probing to search for suitable addresses.
 
+    The table uses a compact layout: a small index array of slots is probed linearly, and
+    each occupied slot points into dense parallel arrays of stored hashes, keys and values.
+    Probes compare the cached hash before calling `__eq__` on the key, iteration only walks
+    the dense arrays, and (key, value) pairs are kept in insertion order.
+
+    The table tracks the number of live items, the number of tombstone slots in the index and
+    the number of removed entries in the dense arrays. An insert reuses the first tombstone
+    slot on its probe sequence. The table grows once items and tombstones exceed
+    `MAX_LOAD_FACTOR` of the slots, and it is compacted in place once removed entries exceed
+    `MAX_TOMBSTONE_RATIO` of the slots, which keeps probe sequences short, bounds the dense
+    arrays and makes inserts amortized O(1).
+
     Attributes
     ----------
-        EMPTY_SINCE_START : EmptySlot
-            A marker for hash table slots that have been empty since initialization.
-        EMPTY_AFTER_REMOVAL : EmptySlot
-            A marker for hash table slots that only became empty after removing an item.
+        EMPTY_SINCE_START : int
+            A marker for index slots that have been empty since the last rebuild.
+        EMPTY_AFTER_REMOVAL : int
+            A marker for index slots that only became empty after removing an item.
+        MAX_LOAD_FACTOR : float
+            The fraction of occupied slots (items and tombstones) that triggers a resize.
+        MAX_TOMBSTONE_RATIO : float
+            The fraction of removed dense entries that triggers a compaction.
         capacity : int
-            The capacity of the hash table.
-        table : List[Union[EmptySlot, V]]
-            The internal represenation of the hash table.
+            The capacity of the hash table. Always a power of two.
+        size : int
+            The number of (key, value) pairs stored in the table.
+        tombstones : int
+            The number of index slots marked `EMPTY_AFTER_REMOVAL`.
+        removed : int
+            The number of removed entries still occupying the dense arrays.
+        head : int
+            A position in the dense arrays before which every entry has been removed.
+        indices : array
+            The index array. Each slot holds a position in the dense arrays or an empty marker.
+        entry_hashes : array
+            The dense array of stored key hashes.
+        entry_keys : List[K]
+            The dense array of keys. Removed entries hold `REMOVED`.
+        entry_values : List[V]
+            The dense array of values.
+        resizes : int
+            The number of times the capacity of the table has grown.
+        compactions : int
+            The number of times the table was rebuilt in place to reclaim removed entries.
+        stats : Optional[TableStats]
+            The probe statistics of the table, or `None` if statistics are not being collected.
     """
 
-    EMPTY_SINCE_START: EmptySlot
-    EMPTY_AFTER_REMOVAL: EmptySlot
+    __slots__ = ('capacity', 'size', 'tombstones', 'removed', 'head', 'indices',
+                 'entry_hashes', 'entry_keys', 'entry_values',
+                 'resizes', 'compactions', 'stats')
+
+    EMPTY_SINCE_START = -1
+    EMPTY_AFTER_REMOVAL = -2
+    MAX_LOAD_FACTOR = 0.75
+    MAX_TOMBSTONE_RATIO = 0.25
+
     capacity: int
-    table: Table
+    size: int
+    tombstones: int
+    removed: int
+    head: int
+    indices: array
+    entry_hashes: array
+    entry_keys: List[K]
+    entry_values: List[V]
+    resizes: int
+    compactions: int
+    stats: Optional[TableStats]
+
+    def __init__(self, initial_capacity: int = 10, track_stats: bool = False) -> None:
+        # Set the initial capacity of the hash table to the next power of two
+        self.resize(initial_capacity)
+
+        # Nothing has been inserted or removed yet
+        self.size = 0
+        self.tombstones = 0
+        self.removed = 0
+        self.head = 0
+
+        # Create the index array and the empty dense arrays
+        self.indices = array(index_typecode(self.capacity),
+                             [self.EMPTY_SINCE_START]) * self.capacity
+        self.entry_hashes = array('q')
+        self.entry_keys = []
+        self.entry_values = []
+
+        # Resizes are always counted, probe lengths only if requested
+        self.resizes = 0
+        self.compactions = 0
+        self.stats = TableStats() if track_stats else None
+
+    @classmethod
+    def from_items(cls, items: Union[Iterable[Tuple[K, V]], MutableMapping[K, V]],
+                   expected_size: Optional[int] = None,
+                   track_stats: bool = False) -> HashSet[K, V]:
+        """Builds a table from (key, value) pairs. The table is sized once for the expected
+        number of pairs rather than grown while inserting.
 
-    def __init__(self, initial_capacity: int = 10) -> None:
-        # Create tags for the two types of empty slots
-        self.EMPTY_SINCE_START = EmptySlot('EMPTY_SINCE_START')
-        self.EMPTY_AFTER_REMOVAL = EmptySlot('EMPTY_AFTER_REMOVAL')
+        Parameters
+        ----------
+            items : Union[Iterable[Tuple[K, V]], MutableMapping[K, V]]
+                The (key, value) pairs, or a mapping holding them.
+            expected_size : Optional[int]
+                The number of pairs. Defaults to `len(items)` when available.
+            track_stats : bool
+                Whether the table should collect probe statistics.
 
-        # Set the initial capacity of the hash table
-        self.capacity = initial_capacity
+        Returns
+        -------
+            HashSet[K, V]
+                The populated table.
 
-        # Create the array of slots
-        self.table = [self.EMPTY_SINCE_START] * self.capacity
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        if expected_size is None and hasattr(items, '__len__'):
+            expected_size = len(items)
+
+        table = cls(cls.capacity_for(expected_size or 0), track_stats)
+        table.update(items, expected_size)
+        return table
+
+    @classmethod
+    def from_parallel(cls, keys: Sequence[K], values: Sequence[V],
+                      track_stats: bool = False) -> HashSet[K, V]:
+        """Builds a table from parallel sequences of keys and values, in which `values[i]`
+        is the value for `keys[i]`.
+
+        Parameters
+        ----------
+            keys : Sequence[K]
+                The keys.
+            values : Sequence[V]
+                The values.
+            track_stats : bool
+                Whether the table should collect probe statistics.
+
+        Returns
+        -------
+            HashSet[K, V]
+                The populated table.
+
+        Raises
+        ------
+            ValueError
+                The `keys` and `values` have different lengths.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        if len(keys) != len(values):
+            raise ValueError(
+                f'Expected as many values as keys, got {len(values)} values for {len(keys)} keys.')
+
+        return cls.from_items(zip(keys, values), len(keys), track_stats)
+
+    @classmethod
+    def capacity_for(cls, expected_size: int) -> int:
+        """Determines the capacity at which `expected_size` items fit without a resize.
+
+        Parameters
+        ----------
+            expected_size : int
+                The number of items.
+
+        Returns
+        -------
+            int
+                The capacity.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return ceil((expected_size + 1) / cls.MAX_LOAD_FACTOR)
+
+    def find(self, key: K, key_hash: int, for_insert: bool = False) -> Tuple[int, int]:
+        """Probes the index array for the specified key.
+
+        Parameters
+        ----------
+            key : K
+                The key to find.
+            key_hash : int
+                The hash of the key.
+            for_insert : bool
+                Whether the slot of an absent key should be the first tombstone slot on the
+                probe sequence, if any, so that an insert can reuse it.
+
+        Returns
+        -------
+            Tuple[int, int]
+                The index slot and the dense entry position of the key. The entry position
+                is `EMPTY_SINCE_START` if the key is absent, in which case the slot is the
+                empty slot that ended the probe sequence, or the first tombstone slot before
+                it if `for_insert` is set.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) average, O(n) worst case
+        """
+        indices = self.indices
+        mask = self.capacity - 1
+
+        # Determine the initial slot
+        slot = key_hash & mask
+        free = -1
+
+        # Probing ceases at an `EMPTY_SINCE_START` slot given that this indicates that a
+        # corresponding item for the key does not exist in the table. The load factor
+        # guarantees that such a slot exists
+        while True:
+            position = indices[slot]
+
+            if position == self.EMPTY_SINCE_START:
+                return (free if free >= 0 else slot), position
+
+            if position == self.EMPTY_AFTER_REMOVAL and for_insert and free < 0:
+                free = slot
+
+            # Only compare keys whose cached hashes match
+            if position >= 0 and self.entry_hashes[position] == key_hash:
+                candidate = self.entry_keys[position]
+                if candidate is key or candidate == key:
+                    return slot, position
+
+            # Determine the next slot using linear probing
+            slot = (slot + 1) & mask
 
     def set(self, key: K, value: V) -> bool:
-        """Inserts an item into the table.
+        """Inserts an item into the table. Replaces the value if the key is already present.
 
         Parameters
         ----------
@@ -73,43 +367,65 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
 
         Space Complexity
         ---------------
-            O(n)
+            O(1) amortized
 
         Time Complexity
         ---------------
-            O(n)
+            O(1) amortized
         """
+        key_hash = hash(key)
+        slot, position = self.find(key, key_hash, True)
 
-        # Determine if the table should be rehashed
-        if self.should_rehash():
-            # Double the capacity of the table
-            self.resize(self.capacity * 2)
-            # Rehash the table
-            self.rehash()
+        if position >= 0:
+            # Replace the value of an existing key
+            self.entry_values[position] = value
+            if self.stats is not None:
+                self.stats.set.record(self.probe_length(slot, key_hash))
+            return True
 
-        # Determine the initial slot
-        slot = hash(key) % len(self.table)
+        # Determine if the table should be rehashed before taking up another slot. Reusing a
+        # tombstone does not take up another slot
+        if self.indices[slot] != self.EMPTY_AFTER_REMOVAL and self.should_rehash():
+            self.make_room()
+            slot, _ = self.find(key, key_hash, True)
 
-        # Initialize the number of slots probed to 0
-        slots_probed = 0
+        if self.stats is not None:
+            self.stats.set.record(self.probe_length(slot, key_hash))
 
-        # Continue probing while the number of slots probed is less than the table length
-        while slots_probed < len(self.table):
-            # If the current slot is empty then assign the item to that slot
-            # In this case, it does not matter if the slot is EMPTY_SINCE START
-            # or EMPTY_AFTER_REMOVAL
-            if type(self.table[slot]) is EmptySlot:
-                self.table[slot] = (key, value)
-                return True
+        self.append_entry(slot, key_hash, key, value)
+        return True
 
-            # Determine the next slot using linear probing
-            slot = (slot + 1) % len(self.table)
+    def append_entry(self, slot: int, key_hash: int, key: K, value: V) -> None:
+        """Appends a new (key, value) pair to the dense arrays and points an empty or tombstone
+        index slot at it.
+
+        Parameters
+        ----------
+            slot : int
+                The index slot, as found by `find` for the absent key.
+            key_hash : int
+                The hash of the key.
+            key : K
+                The key.
+            value : V
+                The value.
+
+        Space Complexity
+        ---------------
+            O(1) amortized
 
-            # Increment the number of slots probed
-            slots_probed += 1
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        if self.indices[slot] == self.EMPTY_AFTER_REMOVAL:
+            self.tombstones -= 1
 
-        # Table is full
-        return False
+        self.indices[slot] = len(self.entry_keys)
+        self.entry_hashes.append(key_hash)
+        self.entry_keys.append(key)
+        self.entry_values.append(value)
+        self.size += 1
 
     def get(self, key: K) -> Optional[V]:
         """Searches for an item within the table that matches the specified key.
@@ -130,30 +446,15 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
 
         Time Complexity
         ---------------
-            O(n)
+            O(1) average, O(n) worst case
         """
-        # Determine the initial slot
-        slot = hash(key) % len(self.table)
-
-        # Initialize the number of slots probed to 0
-        slots_probed = 0
-
-        # Continue probing while the number of slots probed is less than the table length
-        # Probing should cease if an `EMPTY_SINCE_START` slot is reached given that
-        # this indicates that a corresponding item for the key does not exist in the table
-        while self.table[slot] is not self.EMPTY_SINCE_START and slots_probed < len(self.table):
-            # Return the matching item, if found
-            if self.table[slot][0] == key:
-                return self.table[slot][1]
-
-            # Determine the next slot using linear probing
-            slot = (slot + 1) % len(self.table)
+        key_hash = hash(key)
+        slot, position = self.find(key, key_hash)
 
-            # Increment the number of slots probed
-            slots_probed += 1
+        if self.stats is not None:
+            self.stats.get.record(self.probe_length(slot, key_hash))
 
-        # No matching item was found
-        return None
+        return self.entry_values[position] if position >= 0 else None
 
     def delete(self, key: K) -> bool:
         """Deletes an (key, value) pair from the table.
@@ -170,35 +471,62 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
 
         Space Complexity
         ---------------
-            O(1)
+            O(1) amortized
 
         Time Complexity
         ---------------
-            O(n)
+            O(1) amortized
         """
-        # Determine the initial slot
-        slot = hash(key) % len(self.table)
+        key_hash = hash(key)
+        slot, position = self.find(key, key_hash)
 
-        # Initialize the number of slots probed to 0
-        slots_probed = 0
+        if self.stats is not None:
+            self.stats.delete.record(self.probe_length(slot, key_hash))
 
-        # Continue probing while the number of slots probed is less than the table length
-        # Probing should cease if an `EMPTY_SINCE_START` slot is reached given that
-        # this indicates that a corresponding item for the key does not exist in the table
-        while self.table[slot] is not self.EMPTY_SINCE_START and slots_probed < len(self.table):
-            # Mark the slot as `EMPTY_AFTER_REMOVAL` if a matching item is found
-            if self.table[slot][0] == key:
-                self.table[slot] = self.EMPTY_AFTER_REMOVAL
-                return True
+        # No matching item was found
+        if position < 0:
+            return False
+
+        # Mark the slot as `EMPTY_AFTER_REMOVAL` and release the dense entry
+        self.indices[slot] = self.EMPTY_AFTER_REMOVAL
+        self.entry_keys[position] = REMOVED
+        self.entry_values[position] = None
+        self.size -= 1
+        self.tombstones += 1
+        self.removed += 1
+
+        # Reclaim the removed entries once they make up too much of the table
+        if self.should_compact():
+            self.compactions += 1
+            self.rehash()
 
-            # Determine the next slot using linear probing
-            slot = (slot + 1) % len(self.table)
+        return True
 
-            # Increment the number of slots probed
-            slots_probed += 1
+    def first(self) -> Optional[Tuple[K, V]]:
+        """Returns the earliest inserted (key, value) pair still in the table. Removed entries
+        at the front of the dense arrays are skipped once and remembered, so repeatedly
+        removing the first pair, as a least recently used cache does, is amortized O(1).
 
-        # No matching item was found
-        return False
+        Returns
+        -------
+            Optional[Tuple[K, V]]
+                The first (key, value) pair, or `None` if the table is empty.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        keys = self.entry_keys
+        head = self.head
+        while head < len(keys) and keys[head] is REMOVED:
+            head += 1
+        self.head = head
+
+        return (keys[head], self.entry_values[head]) if head < len(keys) else None
 
     def keys(self) -> List[K]:
         """Returns a list of all keys present in the table.
@@ -216,7 +544,10 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
         ---------------
             O(n)
         """
-        return [entry[0] for entry in self.__iter__() if entry is not None]
+        if not self.removed:
+            return self.entry_keys[:]
+
+        return [key for key in self.entry_keys if key is not REMOVED]
 
     def values(self) -> List[V]:
         """Returns a list of all values present in the table.
@@ -234,10 +565,126 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
         ---------------
             O(n)
         """
-        return [entry[1] for entry in self.__iter__() if entry is not None]
+        if not self.removed:
+            return self.entry_values[:]
+
+        return [value for key, value in zip(self.entry_keys, self.entry_values)
+                if key is not REMOVED]
+
+    def items(self) -> List[Tuple[K, V]]:
+        """Returns a list of all (key, value) pairs present in the table.
+
+        Returns
+        -------
+            List[Tuple[K, V]]
+                The list of (key, value) pairs present in the table.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return list(self.__iter__())
+
+    def reserve(self, expected_size: int) -> None:
+        """Grows the table so that it can hold `expected_size` items without a resize.
+
+        Parameters
+        ----------
+            expected_size : int
+                The total number of items the table should be able to hold.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        capacity = self.capacity_for(expected_size + self.tombstones)
+
+        if capacity > self.capacity:
+            self.resize(capacity)
+            self.resizes += 1
+            self.rehash()
+
+    def update(self, items: Union[Iterable[Tuple[K, V]], MutableMapping[K, V]],
+               expected_size: Optional[int] = None) -> None:
+        """Inserts several (key, value) pairs into the table. The table is grown once up
+        front, after which pairs are inserted without checking whether to rehash. Pairs beyond
+        the expected number fall back to `set`.
+
+        Parameters
+        ----------
+            items : Union[Iterable[Tuple[K, V]], MutableMapping[K, V]]
+                The (key, value) pairs, or a mapping holding them.
+            expected_size : Optional[int]
+                The number of pairs. Defaults to `len(items)` when available.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        if expected_size is None and hasattr(items, '__len__'):
+            expected_size = len(items)
+
+        # Mappings such as `dict` iterate over their keys, so take their pairs instead
+        if hasattr(items, 'items'):
+            items = items.items()
+
+        if expected_size:
+            self.reserve(self.size + expected_size)
+
+        # The number of new keys that fit before the load factor is exceeded
+        budget = int(self.capacity * self.MAX_LOAD_FACTOR) - self.size - self.tombstones - 1
+        stats = self.stats
+
+        for key, value in items:
+            if budget <= 0:
+                self.set(key, value)
+                continue
+
+            key_hash = hash(key)
+            slot, position = self.find(key, key_hash, True)
+
+            if stats is not None:
+                stats.set.record(self.probe_length(slot, key_hash))
+
+            if position >= 0:
+                self.entry_values[position] = value
+            else:
+                if self.indices[slot] != self.EMPTY_AFTER_REMOVAL:
+                    budget -= 1
+                self.append_entry(slot, key_hash, key, value)
+
+    def load_factor(self) -> float:
+        """Determines the fraction of slots occupied by items or tombstones.
+
+        Returns
+        -------
+            float
+                The load factor of the table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return (self.size + self.tombstones) / self.capacity
 
     def resize(self, capacity: int) -> None:
-        """Resizes the table to the specified capacity.
+        """Resizes the table to the smallest power of two no less than the specified capacity.
 
         Parameters
         ----------
@@ -252,10 +699,11 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
         ---------------
             O(1)
         """
-        self.capacity = capacity
+        self.capacity = 1 << max(0, capacity - 1).bit_length()
 
     def rehash(self) -> None:
-        """Rehashes the entire hash table.
+        """Rebuilds the index array from the cached hashes. Removed entries are discarded from
+        the dense arrays in the process.
 
         Space Complexity
         ---------------
@@ -265,20 +713,52 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
         ---------------
             O(n)
         """
-        # Copy the previous table
-        prev_table = self.table[:]
+        if self.removed:
+            live = [position for position, key in enumerate(self.entry_keys)
+                    if key is not REMOVED]
+            self.entry_hashes = array('q', [self.entry_hashes[i] for i in live])
+            self.entry_keys = [self.entry_keys[i] for i in live]
+            self.entry_values = [self.entry_values[i] for i in live]
+            self.removed = 0
+        self.tombstones = 0
+        self.head = 0
+
+        # Create a new index array and point each slot at its dense entry
+        indices = array(index_typecode(self.capacity),
+                        [self.EMPTY_SINCE_START]) * self.capacity
+        mask = self.capacity - 1
+
+        for position, key_hash in enumerate(self.entry_hashes):
+            slot = key_hash & mask
+            while indices[slot] != self.EMPTY_SINCE_START:
+                slot = (slot + 1) & mask
+            indices[slot] = position
+
+        self.indices = indices
+        self.size = len(self.entry_keys)
+
+    def make_room(self) -> None:
+        """Frees up slots for further inserts. The table is compacted in place if tombstones
+        account for enough of the load, otherwise its capacity is doubled.
 
-        # Create a new array of slots
-        self.table = [self.EMPTY_SINCE_START] * self.capacity
+        Space Complexity
+        ---------------
+            O(n)
 
-        for entry in prev_table:
-            # Ensure we do not try to unpack `EmptySlot`s
-            if isinstance(entry, tuple):
-                self.set(entry[0], entry[1])
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        if self.tombstones <= self.size:
+            self.resize(self.capacity * 2)
+            self.resizes += 1
+        else:
+            self.compactions += 1
+        self.rehash()
 
     def should_rehash(self) -> bool:
-        """Determines if the table should be rehashed. The table should only be rehashed if
-        attempting to add additional (key, value) pairs after the table has reached its capacity.
+        """Determines if the table should be rehashed. The table should be rehashed if adding
+        another (key, value) pair would push the load factor past `MAX_LOAD_FACTOR`.
 
         Returns
         -------
@@ -286,17 +766,166 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
                 `True` if the table should be rehashed, otherwise `False`.
 
         Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.size + self.tombstones + 1 > self.capacity * self.MAX_LOAD_FACTOR
+
+    def should_compact(self) -> bool:
+        """Determines if the table should be compacted to reclaim removed entries. Tombstone
+        slots never outnumber removed entries, so this also bounds the tombstones.
+
+        Returns
+        -------
+            bool
+                `True` if removed entries exceed `MAX_TOMBSTONE_RATIO` of the table, otherwise
+                `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.removed > self.capacity * self.MAX_TOMBSTONE_RATIO
+
+    def probe_length(self, slot: int, key_hash: int) -> int:
+        """Determines how many slots a probe sequence inspected before ending at `slot`.
+
+        Parameters
+        ----------
+            slot : int
+                The slot at which the probe sequence ended.
+            key_hash : int
+                The hash of the probed key.
+
+        Returns
+        -------
+            int
+                The number of slots inspected.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return ((slot - key_hash) & (self.capacity - 1)) + 1
+
+    def enable_stats(self) -> None:
+        """Starts collecting probe statistics. Statistics that are already being collected
+        are kept.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        if self.stats is None:
+            self.stats = TableStats()
+
+    def disable_stats(self) -> None:
+        """Stops collecting probe statistics and discards the statistics collected so far.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.stats = None
+
+    def tombstone_ratio(self) -> float:
+        """Determines the fraction of slots occupied by tombstones.
+
+        Returns
+        -------
+            float
+                The tombstone ratio of the table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return self.tombstones / self.capacity
+
+    def longest_cluster(self) -> int:
+        """Determines the length of the longest run of consecutive occupied slots, including
+        tombstones. Runs wrap around the end of the index array.
+
+        Returns
+        -------
+            int
+                The length of the longest cluster.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
         ---------------
             O(n)
+        """
+        longest = 0
+        current = 0
+        leading = None
+
+        for position in self.indices:
+            if position == self.EMPTY_SINCE_START:
+                if leading is None:
+                    leading = current
+                longest = max(longest, current)
+                current = 0
+            else:
+                current += 1
+
+        # The load factor guarantees at least one empty slot, so the trailing run continues
+        # into the leading run
+        return max(longest, current + (leading or 0))
+
+    def report(self) -> List[str]:
+        """Returns a report of the shape of the table and, if collected, its probe statistics.
+
+        Returns
+        -------
+            List[str]
+                The lines of the report.
+
+        Space Complexity
+        ---------------
+            O(1)
 
         Time Complexity
         ---------------
             O(n)
         """
-        # Calculate how many values have been inserted into the table
-        values = [value for value in self.values()
-                  if not isinstance(value, EmptySlot)]
-        return len(values) >= self.capacity
+        lines = [
+            f'Size={self.size} Capacity={self.capacity} '
+            f'Load Factor={self.load_factor():.2f} '
+            f'Tombstone Ratio={self.tombstone_ratio():.2f} '
+            f'Longest Cluster={self.longest_cluster()} '
+            f'Resizes={self.resizes} Compactions={self.compactions}'
+        ]
+        if self.stats is not None:
+            lines.extend(self.stats.report())
+        return lines
 
     def __getitem__(self, key: K) -> Optional[V]:
         return self.get(key)
@@ -308,20 +937,26 @@ class HashSet(Generic[K, V], MutableMapping[K, V]):
         return self.delete(key)
 
     def __len__(self) -> int:
-        return len(self.table)
+        return self.size
 
     def __contains__(self, key: K) -> bool:
-        return self.get(key) != None
+        key_hash = hash(key)
+        slot, position = self.find(key, key_hash)
 
-    def __iter__(self) -> Tuple[K, V]:
-        for entry in self.table:
-            if isinstance(entry, tuple):
-                yield (entry[0], entry[1])
-            else:
-                yield None
+        if self.stats is not None:
+            self.stats.get.record(self.probe_length(slot, key_hash))
+
+        return position >= 0
+
+    def __iter__(self) -> Iterator[Tuple[K, V]]:
+        if not self.removed:
+            return zip(self.entry_keys, self.entry_values)
+
+        return ((key, value) for key, value in zip(self.entry_keys, self.entry_values)
+                if key is not REMOVED)
 
     def __repr__(self) -> str:
-        return f'HashTable {str(self.table)}'
+        return f'HashTable {str(self.items())}'
 
     def __str__(self) -> str:
         return self.__repr__()
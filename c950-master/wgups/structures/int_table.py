@@ -0,0 +1,313 @@
+from typing import Generic, Iterator, List, MutableMapping, Optional, Tuple, TypeVar, Union
+
+from wgups.structures.hash_set import EmptySlot, HashSet
+
+V = TypeVar('V')
+
+# Marks a direct-addressed slot that does not hold a value
+EMPTY = EmptySlot('EMPTY')
+
+
+class IntTable(Generic[V], MutableMapping[int, V]):
+    """Implementation of a table keyed by integers. Dense, non-negative keys are stored by
+    direct addressing, in which the key is the index of its slot in an array, so lookups
+    need neither hashing nor probing. Keys that would leave the array mostly empty, such as
+    negative or very large identifiers, fall back to a `HashSet`.
+
+    Attributes
+    ----------
+        MIN_DENSITY : float
+            The smallest fraction of occupied slots the direct-addressed array may be grown to.
+        slots : List[Union[EmptySlot, V]]
+            The direct-addressed array. The slot at index `k` holds the value for key `k`.
+        sparse : HashSet[int, V]
+            The fallback table for keys that do not fit in the direct-addressed array.
+        dense_size : int
+            The number of values stored in the direct-addressed array.
+    """
+
+    __slots__ = ('slots', 'sparse', 'dense_size')
+
+    MIN_DENSITY = 0.5
+
+    slots: List[Union[EmptySlot, V]]
+    sparse: HashSet[int, V]
+    dense_size: int
+
+    def __init__(self, initial_capacity: int = 10) -> None:
+        self.slots = [EMPTY] * max(1, initial_capacity)
+        self.sparse = HashSet[int, V]()
+        self.dense_size = 0
+
+    def set(self, key: int, value: V) -> bool:
+        """Inserts an item into the table. Replaces the value if the key is already present.
+
+        Parameters
+        ----------
+            key : int
+                The key of the value to insert.
+            value : V
+                The value to insert.
+
+        Returns
+        -------
+            bool
+                A flag indicating if the (key, value) pair was successfully set.
+
+        Space Complexity
+        ---------------
+            O(1) amortized
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        if key >= len(self.slots) and self.can_address(key):
+            self.grow(key + 1)
+
+        if 0 <= key < len(self.slots):
+            if self.slots[key] is EMPTY:
+                self.dense_size += 1
+            self.slots[key] = value
+            return True
+
+        return self.sparse.set(key, value)
+
+    def get(self, key: int) -> Optional[V]:
+        """Searches for an item within the table that matches the specified key.
+
+        Parameters
+        ----------
+            key : int
+                The key of the value to obtain.
+
+        Returns
+        -------
+            Optional[V]
+                Returns the value if found, otherwise returns `None`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        if 0 <= key < len(self.slots):
+            value = self.slots[key]
+            return None if value is EMPTY else value
+
+        return self.sparse.get(key)
+
+    def delete(self, key: int) -> bool:
+        """Deletes an (key, value) pair from the table.
+
+        Parameters
+        ----------
+            key : int
+                The key of the value to delete.
+
+        Returns
+        -------
+            bool
+                A flag indicating if the (key, value) pair was successfully deleted.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        if 0 <= key < len(self.slots):
+            if self.slots[key] is EMPTY:
+                return False
+            self.slots[key] = EMPTY
+            self.dense_size -= 1
+            return True
+
+        return self.sparse.delete(key)
+
+    def can_address(self, key: int) -> bool:
+        """Determines if the direct-addressed array can be grown to hold the specified key
+        without dropping below `MIN_DENSITY`.
+
+        Parameters
+        ----------
+            key : int
+                The key to check.
+
+        Returns
+        -------
+            bool
+                `True` if the key can be stored by direct addressing, otherwise `False`.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return 0 <= key and (len(self) + 1) >= (key + 1) * self.MIN_DENSITY
+
+    def grow(self, capacity: int) -> None:
+        """Grows the direct-addressed array to at least the specified capacity. Keys in the
+        fallback table that fit in the grown array are moved into it.
+
+        Parameters
+        ----------
+            capacity : int
+                The minimum number of slots.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        capacity = max(capacity, len(self.slots) * 2)
+        self.slots.extend([EMPTY] * (capacity - len(self.slots)))
+
+        for key in [key for key in self.sparse.keys() if 0 <= key < capacity]:
+            self.slots[key] = self.sparse.get(key)
+            self.sparse.delete(key)
+            self.dense_size += 1
+
+    def keys(self) -> List[int]:
+        """Returns a list of all keys present in the table.
+
+        Returns
+        -------
+            List[int]
+                The list of keys present in the table.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return [key for key, _ in self.__iter__()]
+
+    def values(self) -> List[V]:
+        """Returns a list of all values present in the table.
+
+        Returns
+        -------
+            List[V]
+                The list of values present in the table.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return [value for value in self.slots if value is not EMPTY] + self.sparse.values()
+
+    def items(self) -> List[Tuple[int, V]]:
+        """Returns a list of all (key, value) pairs present in the table.
+
+        Returns
+        -------
+            List[Tuple[int, V]]
+                The list of (key, value) pairs present in the table.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return list(self.__iter__())
+
+    def enable_stats(self) -> None:
+        """Starts collecting probe statistics for the fallback table. Direct-addressed lookups
+        never probe, so they are not recorded.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.sparse.enable_stats()
+
+    def disable_stats(self) -> None:
+        """Stops collecting probe statistics for the fallback table.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        self.sparse.disable_stats()
+
+    def report(self) -> List[str]:
+        """Returns a report of the shape of the direct-addressed array and the fallback table.
+
+        Returns
+        -------
+            List[str]
+                The lines of the report.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return [
+            f'Size={len(self)} Dense Slots={len(self.slots)} Dense Size={self.dense_size} '
+            f'Density={self.dense_size / len(self.slots):.2f}'
+        ] + [f'Sparse {line}' for line in self.sparse.report()]
+
+    def __getitem__(self, key: int) -> Optional[V]:
+        return self.get(key)
+
+    def __setitem__(self, key: int, value: V) -> bool:
+        return self.set(key, value)
+
+    def __delitem__(self, key: int) -> bool:
+        return self.delete(key)
+
+    def __len__(self) -> int:
+        return self.dense_size + len(self.sparse)
+
+    def __contains__(self, key: int) -> bool:
+        if 0 <= key < len(self.slots):
+            return self.slots[key] is not EMPTY
+
+        return key in self.sparse
+
+    def __iter__(self) -> Iterator[Tuple[int, V]]:
+        for key, value in enumerate(self.slots):
+            if value is not EMPTY:
+                yield (key, value)
+
+        yield from self.sparse
+
+    def __repr__(self) -> str:
+        return f'IntTable {str(self.items())}'
+
+    def __str__(self) -> str:
+        return self.__repr__()
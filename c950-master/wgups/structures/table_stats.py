@@ -0,0 +1,156 @@
+from __future__ import annotations
+from typing import List
+
+
+class ProbeHistogram:
+    """A class which counts how many slots were probed by each operation on a hash table.
+
+    Attributes
+    ----------
+        counts : List[int]
+            The number of operations by probe length. `counts[n]` holds the number of
+            operations that probed `n` slots.
+    """
+
+    __slots__ = ('counts',)
+
+    counts: List[int]
+
+    def __init__(self) -> None:
+        self.counts = [0]
+
+    def record(self, probes: int) -> None:
+        """Records a single operation.
+
+        Parameters
+        ----------
+            probes : int
+                The number of slots probed by the operation.
+
+        Space Complexity
+        ---------------
+            O(1) amortized
+
+        Time Complexity
+        ---------------
+            O(1) amortized
+        """
+        if probes >= len(self.counts):
+            self.counts.extend([0] * (probes + 1 - len(self.counts)))
+        self.counts[probes] += 1
+
+    def total(self) -> int:
+        """Determines the number of recorded operations.
+
+        Returns
+        -------
+            int
+                The number of recorded operations.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return sum(self.counts)
+
+    def mean(self) -> float:
+        """Determines the mean probe length of the recorded operations.
+
+        Returns
+        -------
+            float
+                The mean probe length, or `0.0` if nothing has been recorded.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        total = self.total()
+        if not total:
+            return 0.0
+        return sum(probes * count for probes, count in enumerate(self.counts)) / total
+
+    def longest(self) -> int:
+        """Determines the longest recorded probe length.
+
+        Returns
+        -------
+            int
+                The longest probe length, or `0` if nothing has been recorded.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        for probes in range(len(self.counts) - 1, -1, -1):
+            if self.counts[probes]:
+                return probes
+        return 0
+
+    def __repr__(self) -> str:
+        buckets = ' '.join(f'{probes}:{count}' for probes, count in enumerate(self.counts)
+                           if count)
+        return f'n={self.total()} mean={self.mean():.2f} max={self.longest()} [{buckets}]'
+
+    def __str__(self) -> str:
+        return self.__repr__()
+
+
+class TableStats:
+    """A class which collects probe statistics for a hash table. Recording an operation only
+    increments a counter, so statistics can be left enabled in production.
+
+    Attributes
+    ----------
+        get : ProbeHistogram
+            The probe lengths of lookups, including membership tests.
+        set : ProbeHistogram
+            The probe lengths of inserts and updates.
+        delete : ProbeHistogram
+            The probe lengths of deletions.
+    """
+
+    __slots__ = ('get', 'set', 'delete')
+
+    get: ProbeHistogram
+    set: ProbeHistogram
+    delete: ProbeHistogram
+
+    def __init__(self) -> None:
+        self.get = ProbeHistogram()
+        self.set = ProbeHistogram()
+        self.delete = ProbeHistogram()
+
+    def report(self) -> List[str]:
+        """Returns a report of the probe histograms.
+
+        Returns
+        -------
+            List[str]
+                One line per histogram.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        return [
+            f'Get Probes: {self.get}',
+            f'Set Probes: {self.set}',
+            f'Delete Probes: {self.delete}',
+        ]
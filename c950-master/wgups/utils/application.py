@@ -1,7 +1,7 @@
 from re import match
+from typing import Any, List, Tuple
 
 from wgups.data.data_loader import DataLoader
-from wgups.data.distance_table import DistanceTable
 from wgups.data.package_table import PackageTable
 from wgups.routing.depot import Depot
 from wgups.structures.clock import Clock
@@ -35,13 +35,17 @@ class Application:
         # Initially set the `running` flag to False
         self.running = False
 
+        # Count the probes made while loading, which is when the loader cache does its work
+        DataLoader.cache.enable_stats()
+
         # Load in external data
-        distance_table = DistanceTable(DataLoader.get_distances())
+        distance_table = DataLoader.get_distances()
         package_table = PackageTable(DataLoader.get_packages())
         prompt_table = DataLoader.get_prompts()
 
         # Create the depot
-        self.depot = Depot(distance_table, package_table)
+        self.depot = Depot(distance_table, package_table,
+                           constraints=DataLoader.get_constraints())
         # Deliver the packages
         self.depot.deliver_packages()
 
@@ -53,6 +57,10 @@ class Application:
         self.register_commands()
         self.register_prompts(prompt_table)
 
+        # Collect probe statistics for the remaining tables, which were built while loading
+        for _, table in self.tables():
+            table.enable_stats()
+
     def register_commands(self) -> None:
         """Registers all available application commands.
 
@@ -67,6 +75,7 @@ class Application:
         self.commander.register('distance', self.route_distance)
         self.commander.register('package', self.package_report)
         self.commander.register('all', self.packages_report)
+        self.commander.register('stats', self.tables_report)
         self.commander.register('clear', self.prompter.clear)
         self.commander.register('exit', self.stop)
 
@@ -102,24 +111,25 @@ class Application:
     def packages_report(self) -> None:
         """Prints a report of the status of all packages at a specific time.
 
-        Time Complexity
+        Space Complexity
         ---------------
             O(n)
 
         Time Complexity
         ---------------
-            O(n*log(n))
+            O(n)
         """
         time = self.prompter.prompt('time')
         if match(r'^\d{2}:\d{2}:\d{2}$', time) is None:
             print('\nInvalid time format\n')
             return
 
-        (hours, minutes, seconds) = map(int, time.split(':'))
-        packages = sorted(self.depot.package_table.all(), key=lambda p: p.id)
+        clock = Clock.from_string(time)
 
-        reports = [package.delivery_report(Clock(hours, minutes))
-                   for package in packages]
+        # The timeline keeps the packages ordered by identifier and moves its state from the
+        # previous query, so scrubbing through the day only replays the events in between
+        reports = [package.delivery_report(clock, status)
+                   for package, status in self.depot.timeline.packages_at(clock)]
         col_width = max(len(item)
                         for report in reports for item in report) + 2  # Padding
 
@@ -147,7 +157,8 @@ class Application:
             print('\nInvalid package identifier\n')
             return
 
-        if package_id not in self.depot.package_table.packages:
+        package = self.depot.package_table.get(package_id)
+        if package is None:
             print('\nInvalid package identifier\n')
             return
 
@@ -156,13 +167,58 @@ class Application:
             print('\nInvalid time format\n')
             return
 
-        (hours, minutes, seconds) = map(int, time.split(':'))
-        package = self.depot.package_table.get(package_id)
+        clock = Clock.from_string(time)
+        status = self.depot.timeline.package_status(package_id, clock)
 
         print('\nWGUPS Individual Package Report\n')
         print(f'Package: {package_id}')
         print(f'Time: {time}')
-        print(package.inline_report(Clock(hours, minutes)))
+        print(package.inline_report(clock, status))
+        print('\n')
+
+    def tables(self) -> List[Tuple[str, Any]]:
+        """Returns every hash table held by the application alongside its name.
+
+        Returns
+        -------
+            List[Tuple[str, Any]]
+                The (name, table) pairs.
+
+        Space Complexity
+        ---------------
+            O(1)
+
+        Time Complexity
+        ---------------
+            O(1)
+        """
+        return [
+            ('DataLoader.cache', DataLoader.cache),
+            ('DistanceTable.indices', self.depot.distance_table.indices),
+            ('PackageTable.packages', self.depot.package_table.packages),
+            ('Depot.trucks', self.depot.trucks),
+            ('RoutePlanner.cache', self.depot.planner.cache),
+            ('Commander.commands', self.commander.commands),
+            ('Prompter.prompts', self.prompter.prompts),
+        ]
+
+    def tables_report(self) -> None:
+        """Prints the load, clustering and probe statistics of every hash table held by the
+        application.
+
+        Space Complexity
+        ---------------
+            O(n)
+
+        Time Complexity
+        ---------------
+            O(n)
+        """
+        print('\nWGUPS Hash Table Report\n')
+        for name, table in self.tables():
+            print(name)
+            for line in table.report():
+                print(f'\t{line}')
         print('\n')
 
     def prompt(self) -> None: